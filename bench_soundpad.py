@@ -0,0 +1,163 @@
+"""Benchmarks SoundpadClient and the MIDI -> play path against the fake Soundpad server.
+
+Runs on any OS, no real Soundpad needed:
+    python bench_soundpad.py --sounds 20000 --latency 0.5 --count 2000
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+# Ensure src in path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from src.soundpad.fake_server import FakeSoundpadServer
+from src.soundpad.socket_transport import SocketRemoteControl, SocketChannel
+from src.soundpad.client import SoundpadClient
+from src.soundpad.async_client import AsyncSoundpadClient
+from src.soundpad.worker import SoundpadCommandWorker
+
+
+def report(name, samples_ms, total_s=None):
+    samples_ms = sorted(samples_ms)
+    if not samples_ms:
+        print(f"{name:<28} no samples")
+        return
+    n = len(samples_ms)
+    p50 = samples_ms[n // 2]
+    p99 = samples_ms[min(n - 1, int(n * 0.99))]
+    line = f"{name:<28} n={n:<6} avg={sum(samples_ms) / n:7.3f} ms  p50={p50:7.3f} ms  p99={p99:7.3f} ms  max={samples_ms[-1]:7.3f} ms"
+    if total_s:
+        line += f"  ({n / total_s:,.0f}/s)"
+    print(line)
+
+
+def bench_sync_client(port, count, sound_count):
+    client = SoundpadClient(remote=SocketRemoteControl(port))
+    if not client.connect():
+        print("Could not connect to fake server.")
+        return None
+
+    samples = []
+    start = time.perf_counter()
+    for i in range(count):
+        t0 = time.perf_counter()
+        client.play_sound(i % sound_count + 1)
+        samples.append((time.perf_counter() - t0) * 1000)
+    report("SoundpadClient.play_sound", samples, time.perf_counter() - start)
+
+    t0 = time.perf_counter()
+    sounds = client.get_sound_list()
+    report(f"get_sound_list ({len(sounds)})", [(time.perf_counter() - t0) * 1000])
+    return client
+
+
+def bench_worker(client, count, sound_count):
+    worker = SoundpadCommandWorker(client)
+    worker.start()
+    start = time.perf_counter()
+    futures = [worker.submit("play_sound", i % sound_count + 1) for i in range(count)]
+    for f in futures:
+        if not f.cancelled():
+            try:
+                f.result()
+            except Exception:
+                pass
+    elapsed = time.perf_counter() - start
+    stats = worker.get_stats()
+    play = stats['commands'].get('play_sound', {})
+    print(f"{'worker burst':<28} sent={count} executed={play.get('count', 0)} in {elapsed * 1000:.1f} ms  "
+          f"avg={play.get('avg_ms', 0):.3f} ms  max_depth={stats['max_queue_depth']}  "
+          f"coalesced={stats['coalesced']} stale={stats['stale_dropped']}")
+    return worker
+
+
+def bench_midi_path(worker, count, sound_count):
+    """MidiManager callback -> NoteDispatchTable -> worker, as App.on_midi_message does it."""
+    from src.midi.manager import MidiManager
+    from src.midi.dispatch import NoteDispatchTable, ACTION_SOUND
+    from src.config.settings import ConfigManager
+
+    config_file = os.path.join(tempfile.mkdtemp(), "config.json")
+    config_manager = ConfigManager(config_file)
+    for note in range(128):
+        config_manager.config["mappings"][str(note)] = {"sound_index": note % sound_count + 1, "sound_title": f"Sound {note}"}
+    config_manager.save_config()
+    table = NoteDispatchTable(config_manager)
+
+    samples = []
+
+    def on_midi(note, velocity, is_note_on):
+        entry = table.lookup(note)
+        if entry is not None and entry[0] == ACTION_SOUND and is_note_on:
+            t0 = time.perf_counter()
+            future = worker.submit("play_sound", entry[1]['sound_index'])
+            future.add_done_callback(lambda f, t0=t0: samples.append((time.perf_counter() - t0) * 1000))
+
+    midi = MidiManager()
+    midi.set_callback(on_midi)
+    midi.listening = True
+
+    start = time.perf_counter()
+    for i in range(count):
+        midi._midi_callback(SimpleNamespace(type='note_on', note=i % 128, velocity=100))
+        # Paced like a fast performer, not a flood
+        time.sleep(0.001)
+    time.sleep(0.2)
+    report("MIDI -> play (worker)", samples, time.perf_counter() - start)
+
+
+def bench_async(port, count, sound_count, in_flight):
+    async def _run():
+        client = AsyncSoundpadClient(lambda: SocketChannel.open(port), max_in_flight=in_flight)
+        if not await client.connect():
+            print("Async client could not connect.")
+            return
+        samples = []
+
+        async def _one(index):
+            t0 = time.perf_counter()
+            await client.play_sound(index)
+            samples.append((time.perf_counter() - t0) * 1000)
+
+        start = time.perf_counter()
+        await asyncio.gather(*[_one(i % sound_count + 1) for i in range(count)])
+        report(f"async play (in_flight={in_flight})", samples, time.perf_counter() - start)
+        await client.close()
+
+    asyncio.run(_run())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sounds", type=int, default=1000, help="sound list size")
+    parser.add_argument("--latency", type=float, default=0.0, help="fake response latency, ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random latency, ms")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="probability of R-500 answers")
+    parser.add_argument("--count", type=int, default=1000, help="commands per benchmark")
+    parser.add_argument("--in-flight", type=int, default=8, help="async pipelining depth")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, stream=sys.stdout)
+
+    with FakeSoundpadServer(sound_count=args.sounds, latency_ms=args.latency, jitter_ms=args.jitter,
+                            fail_rate=args.fail_rate, seed=1) as server:
+        print(f"Fake Soundpad on port {server.port}: {args.sounds} sounds, latency {args.latency} ms\n")
+        client = bench_sync_client(server.port, args.count, args.sounds)
+        if client is None:
+            return
+        worker = bench_worker(client, args.count, args.sounds)
+        try:
+            bench_midi_path(worker, args.count, args.sounds)
+        except ImportError as e:
+            print(f"Skipping MIDI path benchmark: {e}")
+        worker.stop()
+        bench_async(server.port, args.count, args.sounds, args.in_flight)
+
+
+if __name__ == "__main__":
+    main()
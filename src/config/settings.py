@@ -28,7 +28,8 @@ class ConfigManager:
         self.config_file = config_file
         self.logger = logging.getLogger(__name__)
         
-        default_soundpad_folder = os.path.join(os.getenv('APPDATA'), "Leppsoft")
+        appdata = os.getenv('APPDATA')
+        default_soundpad_folder = os.path.join(appdata, "Leppsoft") if appdata else ""
         # Check if actually exists, if not leave empty
         if not os.path.exists(default_soundpad_folder):
              default_soundpad_folder = ""
@@ -43,6 +44,7 @@ class ConfigManager:
             "global_hotkeys": {}, # Format: "action_name": note_number (int)
             "custom_macros": {} # Format: "note_number_string": "keyboard_shortcut"
         }
+        self._change_listeners = [] # Callbacks fired after every load/save
         self.load_config()
 
     def load_config(self):
@@ -70,6 +72,7 @@ class ConfigManager:
                 self.logger.error(f"Error loading config: {e}")
         else:
             self.logger.info("No config file found, using defaults.")
+        self._notify_change()
 
     def save_config(self):
         """Saves current configuration to JSON file."""
@@ -79,6 +82,23 @@ class ConfigManager:
             self.logger.info("Configuration saved.")
         except Exception as e:
             self.logger.error(f"Error saving config: {e}")
+        # The in-memory config changed even if the write failed
+        self._notify_change()
+
+    def add_change_listener(self, callback):
+        """Registers a callback() invoked whenever the configuration changes."""
+        self._change_listeners.append(callback)
+
+    def remove_change_listener(self, callback):
+        if callback in self._change_listeners:
+            self._change_listeners.remove(callback)
+
+    def _notify_change(self):
+        for callback in list(self._change_listeners):
+            try:
+                callback()
+            except Exception as e:
+                self.logger.error(f"Error in config change listener: {e}")
 
     def get_midi_device(self):
         return self.config.get("midi_device", "")
@@ -4,16 +4,25 @@ import logging
 import threading
 import tkinter as tk
 import subprocess
-import time
 import os
 import sys
 import keyboard
 from src.soundpad.client import SoundpadClient
+from src.soundpad.worker import SoundpadCommandWorker
+from src.soundpad.sync import SoundListSync
+from src.soundpad.sound_index import SoundIndex
+from src.soundpad.supervisor import ConnectionSupervisor, STATE_CONNECTED, STATE_DISCONNECTED
+from src.soundpad.status import PlaybackStatusTracker
+from soundpad_control.remote_control import PlayStatus
 from src.midi.manager import MidiManager
+from src.midi.dispatch import NoteDispatchTable, ACTION_HOTKEY, ACTION_MACRO, ACTION_SOUND
 from src.config.settings import ConfigManager
 from src.gui.visual_keyboard import VisualKeyboard
+from src.gui.keyboard_model import KeyboardModel, mappings_by_octave
 from src.gui.settings_window import SettingsWindow
 from src.gui.library_frame import LibraryFrame
+from src.gui.ui_pump import UiPump
+from src.gui.timer_wheel import TimerWheel
 
 ctk.set_appearance_mode("System")
 ctk.set_default_color_theme("blue")
@@ -34,16 +43,36 @@ class App(ctk.CTk):
         super().__init__()
         
         self.MAX_PIANO_HEIGHT = 533 # Ограничение высоты пианино при растягивании окна
-        self.visual_keyboards = [] # Список всех активных клавиатур для сихнронизации
+        # Состояние клавиш (подписи, цвета, нажатия, октава), общее для всех клавиатур
+        self.keyboard_model = KeyboardModel(start_octave=4)
 
         # --- Managers ---
         self.logger = logging.getLogger(__name__)
         self.config_manager = ConfigManager()
         self.soundpad_client = SoundpadClient()
+        # All Soundpad traffic goes through one worker thread that keeps the pipe open
+        self.soundpad_worker = SoundpadCommandWorker(self.soundpad_client)
+        self.soundpad_worker.start()
+        # Heartbeats, reconnects with backoff, drops/holds commands while Soundpad is down
+        self.soundpad_supervisor = ConnectionSupervisor(self.soundpad_worker)
+        self.soundpad_supervisor.add_listener(self._on_soundpad_state)
+        self.soundpad_supervisor.start()
+        # Cached play state for play/pause decisions and the "now playing" label
+        self.playback_status = PlaybackStatusTracker(self.soundpad_worker)
+        self.playback_status.add_listener(self._on_playback_status)
+        self.playback_status.start()
         self.midi_manager = MidiManager()
+        self.dispatch_table = NoteDispatchTable(self.config_manager) # Rebuilt on every config change
         self.available_sounds = [] # List of dicts {index, title}
+        self.sound_sync = SoundListSync() # Diffs consecutive API sound lists
+        self.sound_index = SoundIndex() # Title/index/url/path lookups, shared with the library
         self.assigning_note = None # Tracks the note waiting for a sound
 
+        # Note events, highlights and key labels from any thread, painted once per frame
+        self.ui_pump = UiPump(self, self.keyboard_model, on_note=self._on_note_ui)
+        # When flashed keys go dark again, on one Tk timer
+        self.release_wheel = TimerWheel(self, on_expire=self._release_keys)
+
         # --- Window Config ---
         self.title("MidiToPad")
         self.geometry("1200x400") # Wider for keyboard
@@ -104,6 +133,11 @@ class App(ctk.CTk):
         self.settings_btn = ctk.CTkButton(self.sidebar_frame, text="Settings", command=self.open_settings)
         self.settings_btn.grid(row=8, column=0, padx=20, pady=10, sticky="s")
 
+        # Now Playing (fed by the playback status cache, no extra pipe traffic)
+        self.now_playing_label = ctk.CTkLabel(self.sidebar_frame, text="■ Stopped", text_color="gray",
+                                              wraplength=160, justify="left")
+        self.now_playing_label.grid(row=11, column=0, padx=20, pady=(0, 10), sticky="sw")
+
         # --- Main Area (Right) ---
         self.main_frame = ctk.CTkFrame(self)
         self.main_frame.grid(row=0, column=1, sticky="nsew", padx=20, pady=20)
@@ -125,11 +159,11 @@ class App(ctk.CTk):
 
         # Init with 2 octaves, starting at C4
         # Высота пианино настраивается параметром MAX_PIANO_HEIGHT
-        self.keyboard = VisualKeyboard(self.kbd_frame, start_octave=4, num_octaves=2, height=self.MAX_PIANO_HEIGHT, max_height_limit=self.MAX_PIANO_HEIGHT)
+        self.keyboard = VisualKeyboard(self.kbd_frame, num_octaves=2, height=self.MAX_PIANO_HEIGHT, max_height_limit=self.MAX_PIANO_HEIGHT,
+                                       model=self.keyboard_model)
         self.keyboard.grid(row=0, column=1, sticky="nsew") # sticky="nsew" чтобы всё растягивалось равномерно
         self.keyboard.on_key_context = self.show_context_menu
         self.keyboard.on_key_click = self.on_key_click
-        self.visual_keyboards.append(self.keyboard)
         
         # Shift Right Button
         self.shift_right_btn = ctk.CTkButton(self.kbd_frame, text="▶", width=30,
@@ -142,6 +176,7 @@ class App(ctk.CTk):
                                     on_play_sound=self.on_library_play_sound,
                                     on_bind_playing=self.on_library_bind_playing_request,
                                     on_select_soundpad=self.on_library_select_soundpad,
+                                    sound_index=self.sound_index,
                                     on_api_sync_request=self.sync_library_from_api)
         self.library.grid(row=2, column=0, sticky="nsew")
 
@@ -181,50 +216,99 @@ class App(ctk.CTk):
 
     def connect_soundpad(self):
         def _connect():
-            connected = self.soundpad_client.connect()
+            connected = self.soundpad_worker.call("connect")
             
-            # Auto-start logic
-            if not connected and self.config_manager.get_auto_start_soundpad():
-                if self.config_manager.get_soundpad_via_steam():
-                    self.logger.info("Attempting to auto-start Soundpad via Steam (steam://rungameid/629520)")
-                    try:
-                        os.startfile("steam://rungameid/629520")
-                        time.sleep(5)
-                        connected = self.soundpad_client.connect()
-                    except Exception as e:
-                        self.logger.error(f"Failed to auto-start Soundpad via Steam: {e}")
+            if connected:
+                if self.soundpad_supervisor.state == STATE_CONNECTED:
+                    self._load_sound_list()
                 else:
-                    exe_path = self.config_manager.get_soundpad_exe_path()
-                    if exe_path and os.path.exists(exe_path):
-                        self.logger.info(f"Attempting to auto-start Soundpad from: {exe_path}")
-                        try:
-                            # os.startfile is more reliable for starting Windows GUI apps than subprocess.Popen
-                            os.startfile(exe_path)
-                            # Wait a bit longer for it to spin up API
-                            time.sleep(5)
-                            connected = self.soundpad_client.connect()
-                        except Exception as e:
-                            self.logger.error(f"Failed to auto-start Soundpad: {e}")
+                    # Listener loads the sound list on the state change
+                    self.soundpad_supervisor.mark_connected()
+                return
 
-            if connected:
-                self.available_sounds = self.soundpad_client.get_sound_list()
-                
-                def _update_ui():
-                    count = len(self.available_sounds)
-                    if count > 0:
-                        self.status_label.configure(text=f"Soundpad: Connected ({count} sounds)", text_color="green")
-                        self.logger.info(f"Loaded {count} sounds from Soundpad.")
-                    else:
-                        self.status_label.configure(text="Soundpad: Connected (0 sounds!)", text_color="orange")
-                        self.logger.warning("Soundpad connected but returned 0 sounds. Check Soundpad configuration or restart it.")
-                self.after(0, _update_ui)
-            else:
-                def _update_ui_fail():
-                    self.status_label.configure(text="Soundpad: Disconnected", text_color="red")
-                self.after(0, _update_ui_fail)
+            # Auto-start logic
+            if self.config_manager.get_auto_start_soundpad():
+                self._auto_start_soundpad()
+
+            def _update_ui_fail():
+                self.status_label.configure(text="Soundpad: Disconnected (retrying...)", text_color="red")
+            self.after(0, _update_ui_fail)
+            # The supervisor keeps retrying with backoff until Soundpad's API is up
+            self.soundpad_supervisor.request_reconnect()
         
         threading.Thread(target=_connect, daemon=True).start()
 
+    def _auto_start_soundpad(self):
+        if self.config_manager.get_soundpad_via_steam():
+            self.logger.info("Attempting to auto-start Soundpad via Steam (steam://rungameid/629520)")
+            try:
+                os.startfile("steam://rungameid/629520")
+            except Exception as e:
+                self.logger.error(f"Failed to auto-start Soundpad via Steam: {e}")
+        else:
+            exe_path = self.config_manager.get_soundpad_exe_path()
+            if exe_path and os.path.exists(exe_path):
+                self.logger.info(f"Attempting to auto-start Soundpad from: {exe_path}")
+                try:
+                    # os.startfile is more reliable for starting Windows GUI apps than subprocess.Popen
+                    os.startfile(exe_path)
+                except Exception as e:
+                    self.logger.error(f"Failed to auto-start Soundpad: {e}")
+
+    def _on_soundpad_state(self, state, old_state):
+        """ConnectionSupervisor listener (supervisor thread)."""
+        if state == STATE_CONNECTED:
+            self._load_sound_list()
+        elif state == STATE_DISCONNECTED and old_state == STATE_CONNECTED:
+            self.after(0, lambda: self.status_label.configure(text="Soundpad: Connection lost (reconnecting...)", text_color="red"))
+
+    def _on_playback_status(self, status, playing_index):
+        """PlaybackStatusTracker listener (background thread)."""
+        if status == PlayStatus.STOPPED:
+            text, color = "■ Stopped", "gray"
+        else:
+            title = self._get_api_sound_title(playing_index) if playing_index is not None else None
+            icon = "⏸" if status == PlayStatus.PAUSED else "▶"
+            text = f"{icon} {title}" if title else f"{icon} Playing"
+            color = "orange" if status == PlayStatus.PAUSED else "green"
+        self.after(0, lambda: self.now_playing_label.configure(text=text, text_color=color))
+
+    def _get_api_sound_title(self, index):
+        sound = self._find_api_sound_by_index(index)
+        return sound['title'] if sound else None
+
+    def _find_api_sound_by_index(self, index):
+        return self.sound_index.find_api_sound_by_index(index)
+
+    def _load_sound_list(self):
+        """Fetches the API sound list after (re)connecting. Runs in a background thread."""
+        sounds = self.soundpad_worker.call("get_sound_list")
+        if sounds:
+            self._apply_sound_list(sounds)
+        else:
+            self.available_sounds = []
+            self.sound_index.set_api_sounds([])
+            self.sound_sync.reset() # The next list is compared with this empty one
+        
+        def _update_ui():
+            count = len(self.available_sounds)
+            if count > 0:
+                self.status_label.configure(text=f"Soundpad: Connected ({count} sounds)", text_color="green")
+                self.logger.info(f"Loaded {count} sounds from Soundpad.")
+            else:
+                self.status_label.configure(text="Soundpad: Connected (0 sounds!)", text_color="orange")
+                self.logger.warning("Soundpad connected but returned 0 sounds. Check Soundpad configuration or restart it.")
+        self.after(0, _update_ui)
+
+    def _apply_sound_list(self, sounds):
+        """Stores a freshly fetched API sound list and pushes only the delta to the library."""
+        delta = self.sound_sync.update(sounds)
+        self.sound_index.set_api_sounds(sounds, delta)
+        self.available_sounds = sounds
+        if hasattr(self, 'library'):
+            self.after(0, lambda: self.library.apply_api_delta(delta, sounds))
+        return delta
+
     def change_midi_device(self, new_device):
         if new_device and new_device not in ["No Devices Found", "No Device"]:
             self.midi_manager.open_port(new_device)
@@ -265,127 +349,136 @@ class App(ctk.CTk):
                     break
             return
 
-        # 2. Check if the note is a global hotkey for Soundpad
-        global_hotkeys = self.config_manager.get_global_hotkeys()
-        for action, hotkey_note in global_hotkeys.items():
-            if note == hotkey_note:
-                if not is_note_on:
-                    return # Ignore release for global hotkeys
-                if action == "play_pause":
-                    threading.Thread(target=self.soundpad_client.play_pause_selected, daemon=True).start()
-                elif action == "next_category":
-                    threading.Thread(target=self.soundpad_client.select_next_category, daemon=True).start()
-                elif action == "prev_category":
-                    threading.Thread(target=self.soundpad_client.select_previous_category, daemon=True).start()
-                elif action == "stop":
-                    threading.Thread(target=self.soundpad_client.stop_playback, daemon=True).start()
-                elif action == "toggle_hold":
-                    self.after(0, lambda: self.hold_to_play_var.set(not self.hold_to_play_var.get()))
-                
-                # Visual feedback for global hotkeys on the keyboard
-                def _flash_hotkey():
-                    # Only flash if it's an integer note (piano key)
-                    if isinstance(note, int):
-                        for kb in self.visual_keyboards:
-                            kb.highlight_key(note, on=True)
-                        self.after(200, lambda: [kb.highlight_key(note, on=False) for kb in self.visual_keyboards])
-                self.after(0, _flash_hotkey)
-                    
-                return # Skip playing assigned piano sounds
-
-        # 2.5 Check if the note is a custom keyboard macro
-        custom_macros = self.config_manager.get_custom_macros()
-        for note_str, shortcut in custom_macros.items():
-            if str(note) == note_str:
-                if not is_note_on:
-                    return # Ignore release
-                
-                # Execute the shortcut
-                try:
-                    threading.Thread(target=lambda s=shortcut: keyboard.send(s), daemon=True).start()
-                except Exception as e:
-                    logging.error(f"Failed to execute macro '{shortcut}': {e}")
-                
-                # Visual feedback
-                def _flash_macro():
-                    if isinstance(note, int):
-                        for kb in self.visual_keyboards:
-                            kb.highlight_key(note, on=True)
-                        self.after(200, lambda: [kb.highlight_key(note, on=False) for kb in self.visual_keyboards])
-                self.after(0, _flash_macro)
-                
-                return # Skip playing assigned piano sounds
-
-        # 3. Stop if non-integer note (like CC events) reaches here and isn't a hotkey
-        if not isinstance(note, int):
-            return
+        # 2. Resolve the note through the precompiled dispatch table (O(1))
+        entry = self.dispatch_table.lookup(note)
+        kind, payload = entry if entry is not None else (None, None)
 
-        # Update UI in main thread (Standard Note Processing)
-        def _ui_update():
+        # 2.1 Global hotkey for Soundpad
+        if kind == ACTION_HOTKEY:
             if not is_note_on:
-                # Turn off highlight
-                for kb in self.visual_keyboards:
-                    kb.highlight_key(note, on=False)
-                # Stop playback if it was mapped and hold-to-play is active
-                mapping = self.config_manager.get_mapping(note)
-                if mapping:
-                    threading.Thread(target=self.soundpad_client.stop_playback, daemon=True).start()
-                return
-
-            # --- Note ON Logic ---
+                return # Ignore release for global hotkeys
+            action = payload
+            if action == "play_pause":
+                self.playback_status.play_pause()
+            elif action == "next_category":
+                self.soundpad_worker.submit("select_next_category")
+            elif action == "prev_category":
+                self.soundpad_worker.submit("select_previous_category")
+            elif action == "stop":
+                self.soundpad_worker.submit("stop_playback")
+            elif action == "toggle_hold":
+                self.after(0, lambda: self.hold_to_play_var.set(not self.hold_to_play_var.get()))
             
-            # 1. Quick Bind in Edit Mode
-            if hasattr(self, 'library') and self.library.is_edit_mode:
-                if self.library.selected_sound:
-                    sound = self.library.selected_sound
-                    sound_idx = sound.get('api_index') or sound.get('index')
-                    if sound_idx:
-                        self.config_manager.set_mapping(note, int(sound_idx), sound['title'])
-                        self.refresh_mappings()
-                        
-                        # Flash green feedback
-                        for kb in self.visual_keyboards:
-                            kb.highlight_key(note, on=True)
-                        self.after(300, lambda: [kb.highlight_key(note, on=False) for kb in self.visual_keyboards])
-                        self.logger.info(f"Quick bound Note {note} to {sound['title']}")
-                        return # Stop processing, we just bound it
-
-            # --- Standard playback and Auto-shift logic ---
-            note_octave = note // 12
-            start = self.keyboard.start_octave
+            # Visual feedback for global hotkeys on the keyboard
+            # Only flash if it's an integer note (piano key)
+            if isinstance(note, int):
+                self._flash_key(note)
+                
+            return # Skip playing assigned piano sounds
+
+        # 2.5 Custom keyboard macro
+        if kind == ACTION_MACRO:
+            if not is_note_on:
+                return # Ignore release
+            shortcut = payload
             
-            should_refresh = False
+            # Execute the shortcut
+            try:
+                threading.Thread(target=lambda s=shortcut: keyboard.send(s), daemon=True).start()
+            except Exception as e:
+                logging.error(f"Failed to execute macro '{shortcut}': {e}")
             
-            if note_octave < start:
-                # Key is to the left. Move start to this octave.
-                for kb in self.visual_keyboards: kb.set_start_octave(note_octave)
-                should_refresh = True
-            elif note_octave > start + 1:
-                # Key is to the right (beyond 2nd visible octave). 
-                # Move start so this octave is the second one (i.e. start = note_oct - 1)
-                for kb in self.visual_keyboards: kb.set_start_octave(note_octave - 1)
-                should_refresh = True
+            # Visual feedback
+            if isinstance(note, int):
+                self._flash_key(note)
             
-            if should_refresh:
-                self.refresh_mappings()
+            return # Skip playing assigned piano sounds
 
-            # Highlight key
-            for kb in self.visual_keyboards:
-                kb.highlight_key(note, on=True)
-                
-            # Schedule turn off ONLY if Hold to Play is OFF
-            if not self.hold_to_play_var.get():
-                self.after(200, lambda: [kb.highlight_key(note, on=False) for kb in self.visual_keyboards])
+        # 3. Stop if non-integer note (like CC events) reaches here and isn't a hotkey
+        if not isinstance(note, int):
+            return
+
+        # Fire the mapped sound right from the MIDI thread, so a busy Tk loop
+        # (library refresh, popout redraw, dialogs) can't delay the audio.
+        # (except a note-on that quick binds the selected library sound instead)
+        if kind == ACTION_SOUND and not (is_note_on and self._quick_bind_sound() is not None):
+            self._trigger_mapped_sound(note, payload, is_note_on)
+
+        # Everything visual goes to the UI as a separate, mergeable notification
+        self.ui_pump.post_note(note, is_note_on)
+
+    def _quick_bind_sound(self):
+        """The library sound a note-on binds in edit mode (selected and has an index), else None."""
+        library = getattr(self, 'library', None)
+        if not (library and library.is_edit_mode and library.selected_sound):
+            return None
+        sound = library.selected_sound
+        return sound if (sound.api_index or sound.index) else None
+
+    def _trigger_mapped_sound(self, note, mapping, is_note_on):
+        """Queues the Soundpad command for a resolved note mapping straight from the calling thread."""
+        if not is_note_on:
+            # Stop playback if it was mapped and hold-to-play is active
+            self.soundpad_worker.submit("stop_playback")
+            return
+
+        sound_index = mapping['sound_index']
+        self.logger.info(f"Playing sound index {sound_index} for note {note}")
+        self.soundpad_worker.submit("play_sound", sound_index)
+
+    def _flash_key(self, note, duration_ms=200):
+        """Highlights a key on all keyboards for a moment (longer if flashed again). Safe from any thread."""
+        self.ui_pump.highlight(note, True)
+        self.release_wheel.schedule(note, duration_ms)
+
+    def _set_key_highlight(self, note, on):
+        """Highlights a key until told otherwise, dropping any pending flash release."""
+        self.release_wheel.cancel(note)
+        self.ui_pump.highlight(note, on)
+
+    def _release_keys(self, notes):
+        for note in notes:
+            self.ui_pump.highlight(note, False)
+
+    def _on_note_ui(self, note, pressed, is_down):
+        """UiPump callback: the merged note events of one frame for a note (Tk thread)."""
+        if pressed:
+            self._on_note_on_ui(note)
+        if not is_down:
+            # Turn off highlight
+            self._set_key_highlight(note, False)
+
+    def _on_note_on_ui(self, note):
+        """UI side of a note-on: quick bind, octave auto-shift and highlight."""
+        # 1. Quick Bind in Edit Mode
+        sound = self._quick_bind_sound()
+        if sound is not None:
+            self.config_manager.set_mapping(note, int(sound.api_index or sound.index), sound.title)
+            self.refresh_mappings()
             
-            # Check mapping and play
-            mapping = self.config_manager.get_mapping(note)
-            if mapping:
-                sound_index = mapping['sound_index']
-                self.logger.info(f"Playing sound index {sound_index} for note {note}")
-                # Run in separate thread to not block UI if play_sound blocks (it shouldn't)
-                threading.Thread(target=self.soundpad_client.play_sound, args=(sound_index,), daemon=True).start()
+            # Flash green feedback
+            self._flash_key(note, 300)
+            self.logger.info(f"Quick bound Note {note} to {sound.title}")
+            return # Stop processing, we just bound it
+
+        # --- Auto-shift logic ---
+        note_octave = note // 12
+        start = self.keyboard_model.start_octave
         
-        self.after(0, _ui_update)
+        # Keyboards redraw from the model, labels included
+        if note_octave < start:
+            # Key is to the left. Move start to this octave.
+            self.keyboard_model.set_start_octave(note_octave)
+        elif note_octave > start + 1:
+            # Key is to the right (beyond 2nd visible octave). 
+            # Move start so this octave is the second one (i.e. start = note_oct - 1)
+            self.keyboard_model.set_start_octave(note_octave - 1)
+
+        # Highlight key, turned off later ONLY if Hold to Play is OFF
+        if self.hold_to_play_var.get():
+            self._set_key_highlight(note, True)
+        else:
+            self._flash_key(note)
 
     def open_popout_piano(self):
         """Creates a standalone, always-on-top window with a copy of the piano."""
@@ -402,9 +495,9 @@ class App(ctk.CTk):
                                  command=lambda: self.shift_all_octaves(-1))
         left_btn.pack(side="left", fill="y", padx=(0, 5))
         
-        # Piano
-        new_kb = VisualKeyboard(kbd_frame, start_octave=self.keyboard.start_octave, 
-                                num_octaves=2, height=200, max_height_limit=1000)
+        # Piano, drawn from the shared model (mappings, highlights and octave included)
+        new_kb = VisualKeyboard(kbd_frame, num_octaves=2, height=200, max_height_limit=1000,
+                                model=self.keyboard_model)
         new_kb.pack(side="left", fill="both", expand=True)
         new_kb.on_key_context = self.show_context_menu
         new_kb.on_key_click = self.on_key_click
@@ -414,24 +507,17 @@ class App(ctk.CTk):
                                   command=lambda: self.shift_all_octaves(1))
         right_btn.pack(side="right", fill="y", padx=(5, 0))
         
-        self.visual_keyboards.append(new_kb)
-        
-        # Refresh its mappings right away
-        self.refresh_mappings()
-        
         # Cleanup when closed
         def on_close():
-            self.visual_keyboards.remove(new_kb)
+            new_kb.detach()
             popout.destroy()
             
         popout.protocol("WM_DELETE_WINDOW", on_close)
 
     def shift_all_octaves(self, delta):
-        """Helper to shift all open keyboards at once."""
-        new_start = self.keyboard.start_octave + delta
-        # VisualKeyboard clamps internally, but we want all synced
-        for kb in self.visual_keyboards:
-            kb.set_start_octave(new_start)
+        """Helper to shift all open keyboards at once (they share the model)."""
+        # KeyboardModel clamps the octave
+        self.keyboard_model.set_start_octave(self.keyboard_model.start_octave + delta)
 
     def open_settings(self):
         SettingsWindow(self, self.config_manager, on_close_callback=self.library.refresh)
@@ -443,67 +529,52 @@ class App(ctk.CTk):
             self.assigning_note = None # Reset
             
             # Need to find matching API sound index
-            api_sound = self._find_sound_in_api(sound['title'])
+            api_sound = self._find_sound_in_api(sound)
             if api_sound:
                 self.assign_sound(note, api_sound)
-                self.status_label.configure(text=f"Assigned '{sound['title']}' to {note}", text_color="green")
+                self.status_label.configure(text=f"Assigned '{sound.title}' to {note}", text_color="green")
             else:
                 self.status_label.configure(text="Error: Sound not synced with Soundpad list", text_color="red")
             
             # Remove highlight hint
-            for kb in self.visual_keyboards:
-                kb.highlight_key(note, on=False)
+            self._set_key_highlight(note, False)
             return
 
-        self.logger.info(f"Selected sound from library: {sound['title']}")
-        self.status_label.configure(text=f"Selected: {sound['title']}", text_color="blue")
+        self.logger.info(f"Selected sound from library: {sound.title}")
+        self.status_label.configure(text=f"Selected: {sound.title}", text_color="blue")
         self.current_selected_sound = sound
 
-    def _find_sound_in_api(self, target_title):
-        """Helper to match a library sound title to the loaded api sounds."""
-        lib_title = target_title.strip().lower()
-        for api_sound in getattr(self, 'available_sounds', []):
-            if api_sound['title'].strip().lower() == lib_title:
-                return api_sound
-        return None
+    def _find_sound_in_api(self, sound):
+        """Helper to match a library SoundRecord to the loaded api sounds by title."""
+        return self.sound_index.find_api_sound(sound.title)
 
     def on_library_play_sound(self, sound_index):
         """Plays sound directly from library."""
         self.logger.info(f"Double-click playing sound index: {sound_index}")
-        threading.Thread(target=self.soundpad_client.play_sound, args=(sound_index,), daemon=True).start()
+        self.soundpad_worker.submit("play_sound", sound_index)
 
     def on_library_bind_playing_request(self, sound):
         """Called when user right-clicks a sound and wants to bind it to a key."""
         self.assigning_sound_from_library = sound
-        self.status_label.configure(text=f"Waiting: Click any key above to bind '{sound['title']}'", text_color="orange")
+        self.status_label.configure(text=f"Waiting: Click any key above to bind '{sound.title}'", text_color="orange")
 
     def on_library_select_soundpad(self, sound_index):
         """Called when user wants to select a sound in the Soundpad UI."""
         # Need to implement select_sound in client. Assume we just play it if we can't select?
         # Let's add select_sound to client if absent, or just try.
         if hasattr(self.soundpad_client, 'select_sound'):
-            threading.Thread(target=self.soundpad_client.select_sound, args=(sound_index,), daemon=True).start()
+            self.soundpad_worker.submit("select_sound", sound_index)
         else:
             self.logger.warning("select_sound not implemented in soundpad client")
 
     def refresh_mappings(self):
-        """Updates keyboard labels based on config."""
-        # Clear all first (optional, but good if keys moved)
-        # Actually VisualKeyboard doesn't have clear_all_labels, but we can redraw or just overwrite.
-        
-        mappings = self.config_manager.config["mappings"]
-        for note_str, data in mappings.items():
-            note = int(note_str)
-            # Label: Use custom if exists, else title
-            label = data.get('custom_label') or data.get('sound_title')
-            # Color: Use custom if exists
-            color = data.get('custom_color')
-            
-            for kb in self.visual_keyboards:
-                kb.set_key_label(note, label)
-                kb.set_key_color(note, color)
-        # Redraw to ensure everything is applied if needed, though set_key methods do it
-        # self.keyboard.draw_keyboard()
+        """Updates keyboard labels based on config.
+
+        The mappings are grouped per octave once here and applied with the next UI pump
+        frame; the keyboards only repaint the visible keys that changed, and an octave
+        shift needs no refresh at all.
+        """
+        self.ui_pump.set_mappings(mappings_by_octave(self.config_manager.config["mappings"]))
 
     def show_context_menu(self, note, event):
         """Shows context menu for assigning sounds."""
@@ -540,27 +611,24 @@ class App(ctk.CTk):
         self.assigning_note = note
         self.status_label.configure(text=f"Waiting: Select a sound for Note {note} in the list below", text_color="orange")
         # Visual hint on the key
-        for kb in self.visual_keyboards:
-            kb.highlight_key(note, on=True)
+        self._set_key_highlight(note, True)
 
     def play_mapped_sound(self, note):
         mapping = self.config_manager.get_mapping(note)
         if mapping:
             sound_index = mapping['sound_index']
-            threading.Thread(target=self.soundpad_client.play_sound, args=(sound_index,), daemon=True).start()
-            for kb in self.visual_keyboards:
-                kb.highlight_key(note, on=True)
-            self.after(200, lambda: [kb.highlight_key(note, on=False) for kb in self.visual_keyboards])
+            self.soundpad_worker.submit("play_sound", sound_index)
+            self._flash_key(note)
 
     def on_key_click(self, note):
         # 1. Check if we are binding a sound from the library (Right-click "Bind" in Library)
         if getattr(self, 'assigning_sound_from_library', None) is not None:
             sound = self.assigning_sound_from_library
             # Match API index
-            api_sound = self._find_sound_in_api(sound['title'])
+            api_sound = self._find_sound_in_api(sound)
             if api_sound:
                 self.assign_sound(note, api_sound)
-                self.status_label.configure(text=f"Assigned '{sound['title']}' to {note}", text_color="green")
+                self.status_label.configure(text=f"Assigned '{sound.title}' to {note}", text_color="green")
             else:
                 self.status_label.configure(text="Error: Sound not synced with Soundpad list", text_color="red")
             
@@ -574,28 +642,18 @@ class App(ctk.CTk):
             if hasattr(self, 'current_selected_sound') and self.current_selected_sound:
                 sound = self.current_selected_sound
                 # Match by title or index
-                matched = False
-                self.logger.info(f"Trying to match library sound '{sound['title']}' against {len(self.available_sounds)} API sounds.")
-                
-                # Check api_index directly if available
-                if 'api_index' in sound:
-                    for api_sound in getattr(self, 'available_sounds', []):
-                        if api_sound.get('index') == sound['api_index']:
-                            self.assign_sound(note, api_sound)
-                            matched = True
-                            break
+                self.logger.info(f"Trying to match library sound '{sound.title}' against {len(self.available_sounds)} API sounds.")
                 
-                # Fallback to title match
-                if not matched:
-                    lib_title = sound['title'].strip().lower()
-                    for api_sound in getattr(self, 'available_sounds', []):
-                        if api_sound['title'].strip().lower() == lib_title:
-                            self.assign_sound(note, api_sound)
-                            matched = True
-                            break
+                # Check api_index directly if available, fallback to title match
+                api_sound = None
+                if sound.api_index:
+                    api_sound = self._find_api_sound_by_index(sound.api_index)
+                if api_sound is None:
+                    api_sound = self._find_sound_in_api(sound)
                 
-                if matched:
-                    self.status_label.configure(text=f"Assigned {sound['title']} to {note}", text_color="green")
+                if api_sound:
+                    self.assign_sound(note, api_sound)
+                    self.status_label.configure(text=f"Assigned {sound.title} to {note}", text_color="green")
                 else:
                     msg = "Sound not found in active Soundpad list!"
                     if len(self.available_sounds) == 0:
@@ -617,9 +675,7 @@ class App(ctk.CTk):
 
     def unassign_sound(self, note):
         self.config_manager.remove_mapping(note)
-        for kb in self.visual_keyboards:
-            kb.set_key_label(note, "")
-            kb.set_key_color(note, None) # Reset color too? Or keep?
+        self.refresh_mappings() # Clears its label and color too
         # Probably reset color if map removed? Or allow coloring empty keys? 
         # User said "customize key", likely implies mapped key or any key.
         # If we allow coloring any key, we must store it in config even if no sound.
@@ -685,16 +741,16 @@ class App(ctk.CTk):
             for widget in scroll.winfo_children():
                 widget.destroy()
             
-            query = search_var.get().lower()
-            count = 0
-            for sound in self.available_sounds:
-                if query in sound['title'].lower():
-                    btn = ctk.CTkButton(scroll, text=sound['title'], anchor="w",
-                                        command=lambda s=sound: [self.assign_sound(note, s), dialog.destroy()])
-                    btn.pack(fill="x", pady=2)
-                    count += 1
-                    if count > 50: # Limit display for performance
-                        break
+            query = search_var.get().strip()
+            # Limit display for performance
+            if query:
+                matches = self.sound_index.search_api(query, limit=51)
+            else:
+                matches = self.available_sounds[:51]
+            for sound in matches:
+                btn = ctk.CTkButton(scroll, text=sound['title'], anchor="w",
+                                    command=lambda s=sound: [self.assign_sound(note, s), dialog.destroy()])
+                btn.pack(fill="x", pady=2)
 
         entry.bind("<KeyRelease>", lambda e: filter_sounds())
         
@@ -713,15 +769,17 @@ class App(ctk.CTk):
         
         def _sync():
             if not self.soundpad_client.connected:
-                self.soundpad_client.connect()
+                self.soundpad_worker.call("connect")
                 
             if self.soundpad_client.connected:
-                sounds = self.soundpad_client.get_sound_list()
+                sounds = self.soundpad_worker.call("get_sound_list")
                 if sounds:
-                    self.available_sounds = sounds
-                    self.after(0, lambda: self.library.load_api_sounds(sounds))
+                    delta = self._apply_sound_list(sounds)
                     if hasattr(self, 'status_label'):
-                        self.after(0, lambda: self.status_label.configure(text=f"API Sync: Loaded {len(sounds)} sounds", text_color="green"))
+                        text = f"API Sync: Loaded {len(sounds)} sounds"
+                        if not delta.initial and not delta.is_empty():
+                            text += f" (+{len(delta.added)} / -{len(delta.removed)})"
+                        self.after(0, lambda: self.status_label.configure(text=text, text_color="green"))
                 else:
                     if hasattr(self, 'status_label'):
                         self.after(0, lambda: self.status_label.configure(text="API Sync: 0 sounds found", text_color="red"))
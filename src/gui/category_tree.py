@@ -0,0 +1,131 @@
+import customtkinter as ctk
+from src.gui.virtual_list import VirtualList, ROW_COLOR, HOVER_COLOR
+
+INDENT = 15 # px per tree level
+
+TEXT_COLOR = ("gray10", "gray90")
+SELECTED_TEXT_COLOR = "#3498db"
+
+
+class CategoryTree(VirtualList):
+    """Virtualized category tree (see VirtualList).
+
+    items is the flat list of (category, level) of the categories currently visible,
+    i.e. all top level ones and the children of expanded ones, in display order.
+    Expanding or collapsing a category splices its visible subtree in or out of that
+    list; only pool rows whose content changed are redrawn, so a selection change
+    touches the previously and newly selected rows only.
+    """
+
+    def __init__(self, master, expanded, on_select=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.expanded = expanded # category path -> bool, shared with the owner
+        self.on_select = on_select # Callback(category)
+        self.categories = []
+        self.selected_path = None
+        # Created once, every row uses one of these
+        self.font_normal = ctk.CTkFont(weight="normal")
+        self.font_bold = ctk.CTkFont(weight="bold")
+
+    def set_categories(self, categories, keep_position=True):
+        self.categories = categories
+        self.set_items(self._visible(categories, 0), keep_position)
+
+    def append_categories(self, categories):
+        """Adds top level categories at the end (e.g. while the library is parsed)."""
+        self.categories = self.categories + list(categories)
+        self.items.extend(self._visible(categories, 0))
+        self._redraw()
+
+    def _visible(self, categories, level):
+        """(category, level) of categories and their expanded descendants, in display order."""
+        rows = []
+        pending = [(cat, level) for cat in reversed(categories)]
+        while pending:
+            cat, lvl = pending.pop()
+            rows.append((cat, lvl))
+            if cat['subcategories'] and self.expanded.get(cat['path'], False):
+                pending.extend((sub, lvl + 1) for sub in reversed(cat['subcategories']))
+        return rows
+
+    def position(self, path):
+        """Index of the visible row showing path, or None."""
+        for pos, (cat, _) in enumerate(self.items):
+            if cat['path'] == path:
+                return pos
+        return None
+
+    def toggle(self, path):
+        self.expanded[path] = not self.expanded.get(path, False)
+        pos = self.position(path)
+        if pos is None:
+            return
+        cat, level = self.items[pos]
+        # Drop the rows shown below it (its old visible subtree), then add the new one
+        end = pos + 1
+        while end < len(self.items) and self.items[end][1] > level:
+            end += 1
+        self.items[pos + 1:end] = self._visible(cat['subcategories'], level + 1) if self.expanded[path] else []
+        self._redraw()
+
+    def select(self, path):
+        self.selected_path = path
+        pos = self.position(path)
+        if pos is not None:
+            self.see(pos)
+        self._redraw()
+
+    def _create_row(self, slot):
+        frame = ctk.CTkFrame(self.body, fg_color=ROW_COLOR, corner_radius=6)
+        # Toggle arrow (empty for categories without children, keeps the names aligned)
+        toggle = ctk.CTkLabel(frame, text="", width=20, text_color="gray")
+        toggle.pack(side="left")
+        name = ctk.CTkLabel(frame, text="", anchor="w", padx=5, font=self.font_normal)
+        name.pack(side="left", fill="both", expand=True, pady=1)
+
+        toggle.bind("<Button-1>", lambda e: self._on_toggle(slot))
+        for widget in (frame, name):
+            widget.bind("<Button-1>", lambda e: self._on_select(slot))
+        for widget in (frame, toggle, name):
+            self._bind_row_widget(widget, slot)
+        return frame, toggle, name
+
+    def _row_state(self, pos, slot):
+        if pos >= len(self.items):
+            return None
+        cat, level = self.items[pos]
+        if cat['subcategories']:
+            arrow = "▼" if self.expanded.get(cat['path'], False) else "▶"
+        else:
+            arrow = ""
+        return cat['name'], level, arrow, cat['path'] == self.selected_path, slot == self.hovered
+
+    def _draw_row(self, slot, state):
+        frame, toggle, name = self.pool[slot]
+        if state is None:
+            toggle.configure(text="")
+            name.configure(text="")
+            frame.configure(fg_color=ROW_COLOR)
+            return
+        text, level, arrow, selected, hovered = state
+        toggle.configure(text=arrow)
+        toggle.pack_configure(padx=(level * INDENT, 0))
+        if selected:
+            name.configure(text=text, text_color=SELECTED_TEXT_COLOR, font=self.font_bold)
+        else:
+            name.configure(text=text, text_color=TEXT_COLOR, font=self.font_normal)
+        frame.configure(fg_color=HOVER_COLOR if hovered else ROW_COLOR)
+
+    def _on_toggle(self, slot):
+        item = self._item_at(slot)
+        if item is None:
+            return
+        if item[0]['subcategories']:
+            self.toggle(item[0]['path'])
+        else:
+            self._on_select(slot)
+
+    def _on_select(self, slot):
+        item = self._item_at(slot)
+        if item is not None and self.on_select:
+            self.on_select(item[0])
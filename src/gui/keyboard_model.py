@@ -0,0 +1,136 @@
+import logging
+
+MIN_OCTAVE = 0
+MAX_OCTAVE = 8
+
+_NO_MAPPING = ("", None)
+
+
+def mappings_by_octave(mappings):
+    """config["mappings"] -> {octave: {note: (label, color)}}, what each piano key shows."""
+    octaves = {}
+    for note_str, data in mappings.items():
+        if not str(note_str).isdigit():
+            continue # CC_x and other named ids have no key
+        note = int(note_str)
+        # Label: Use custom if exists, else title
+        label = data.get('custom_label') or data.get('sound_title') or ""
+        octaves.setdefault(note // 12, {})[note] = (label, data.get('custom_color'))
+    return octaves
+
+
+class KeyboardModel:
+    """Key labels, colors, pressed keys and start octave, shared by every VisualKeyboard.
+
+    Updates are compared with the current state here, once, and listeners only get
+    what actually changed: listener(changes) where changes may hold 'labels'
+    {note: text}, 'colors' {note: color or None}, 'pressed' {note: bool} and
+    'start_octave'. Each keyboard then repaints just those keys (if it shows them), so
+    another popout adds canvas work only. Tk thread only.
+
+    Labels and colors are kept per octave (see mappings_by_octave): set_mappings() only
+    reports changes inside the visible octaves, and an octave shift is just lookups
+    for the keys that come into view.
+    """
+
+    def __init__(self, start_octave=4, visible_octaves=2):
+        self.logger = logging.getLogger(__name__)
+        self.octaves = {}   # octave -> {note: (label, custom color)}
+        self.pressed = set()
+        self.start_octave = start_octave
+        self.visible_octaves = visible_octaves # Widest keyboard, see VisualKeyboard
+        self._listeners = []
+
+    def add_listener(self, callback):
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _mapping(self, note):
+        return self.octaves.get(note // 12, {}).get(note, _NO_MAPPING)
+
+    def _set_mapping(self, note, label, color):
+        self.octaves.setdefault(note // 12, {})[note] = (label, color)
+
+    def label(self, note):
+        return self._mapping(note)[0]
+
+    def color(self, note):
+        return self._mapping(note)[1]
+
+    def visible_notes(self):
+        return range(self.start_octave * 12, (self.start_octave + self.visible_octaves) * 12)
+
+    def set_mappings(self, octaves):
+        """Replaces all labels and colors with octaves from mappings_by_octave()."""
+        old, self.octaves = self.octaves, octaves
+        labels, colors = {}, {}
+        for note in self.visible_notes():
+            old_label, old_color = old.get(note // 12, {}).get(note, _NO_MAPPING)
+            label, color = self._mapping(note)
+            if label != old_label:
+                labels[note] = label
+            if color != old_color:
+                colors[note] = color
+        changes = {}
+        if labels:
+            changes['labels'] = labels
+        if colors:
+            changes['colors'] = colors
+        if changes:
+            self._notify(changes)
+
+    def is_pressed(self, note):
+        return note in self.pressed
+
+    def update(self, labels=None, colors=None, pressed=None):
+        """Applies {note: value} changes; listeners hear about the ones that differ."""
+        changes = {}
+        if labels:
+            changed = {}
+            for note, text in labels.items():
+                text = text or ""
+                label, color = self._mapping(note)
+                if label != text:
+                    self._set_mapping(note, text, color)
+                    changed[note] = text
+            if changed:
+                changes['labels'] = changed
+        if colors:
+            changed = {}
+            for note, color in colors.items():
+                label, old_color = self._mapping(note)
+                if old_color != color:
+                    self._set_mapping(note, label, color)
+                    changed[note] = color
+            if changed:
+                changes['colors'] = changed
+        if pressed:
+            changed = {}
+            for note, on in pressed.items():
+                if (note in self.pressed) != bool(on):
+                    if on:
+                        self.pressed.add(note)
+                    else:
+                        self.pressed.discard(note)
+                    changed[note] = bool(on)
+            if changed:
+                changes['pressed'] = changed
+        if changes:
+            self._notify(changes)
+
+    def set_start_octave(self, octave):
+        """Listeners re-read the keys they show (nothing is copied here)."""
+        octave = max(MIN_OCTAVE, min(MAX_OCTAVE, octave))
+        if octave != self.start_octave:
+            self.start_octave = octave
+            self._notify({'start_octave': octave})
+
+    def _notify(self, changes):
+        for callback in list(self._listeners):
+            try:
+                callback(changes)
+            except Exception as e:
+                self.logger.error(f"Error in keyboard listener: {e}")
@@ -1,23 +1,66 @@
 
 import customtkinter as ctk
+import logging
 import os
+import threading
 import glob
-from src.soundpad.parser import SoundpadParser
+from src.soundpad.parser import SoundpadParser, SoundRecord, category_sounds, make_category, walk_categories
+from src.soundpad.library_cache import LibraryCache, CACHE_FILE_NAME
+from src.soundpad.library_watch import SoundlistWatcher, diff_library
+from src.soundpad.search import SearchWorker
+from src.soundpad.sound_index import SoundIndex
+from src.soundpad.sync import normalize_title
+from src.gui.category_tree import CategoryTree
+from src.gui.sound_list import SoundList
+
+API_CATEGORY_NAME = "🆕 Новые"
+API_CATEGORY_PATH = "api_sync"
+SEARCH_RESULT_LIMIT = 1001 # One more than the rows shown, for the "too many results" hint
+SEARCH_DEBOUNCE_MS = 150 # Search once typing pauses this long
+
+
+class _CategoryRows:
+    """(sound, path) rows of a category for the SoundList, without copying its sounds."""
+    __slots__ = ("records", "sounds", "path")
+
+    def __init__(self, category):
+        self.records = category['records']
+        self.sounds = category['sounds']
+        self.path = category['path']
+
+    def __len__(self):
+        return len(self.sounds)
+
+    def __getitem__(self, i):
+        return self.records[self.sounds[i]], self.path
+
 
 class LibraryFrame(ctk.CTkFrame):
-    def __init__(self, master, config_manager, on_sound_selected=None, on_play_sound=None, on_bind_playing=None, on_select_soundpad=None, on_api_sync_request=None, **kwargs):
+    def __init__(self, master, config_manager, on_sound_selected=None, on_play_sound=None, on_bind_playing=None, on_select_soundpad=None, on_api_sync_request=None, sound_index=None, **kwargs):
         super().__init__(master, **kwargs)
         
         self.config_manager = config_manager
+        self.logger = logging.getLogger(__name__)
         self.on_sound_selected = on_sound_selected # Callback(sound_data)
         self.on_play_sound = on_play_sound # Callback(sound_index)
         self.on_bind_playing = on_bind_playing # Callback(sound_data)
         self.on_select_soundpad = on_select_soundpad # Callback(sound_index)
         self.on_api_sync_request = on_api_sync_request # Callback() -> triggers App to fetch from API
         self.parser = SoundpadParser()
+        self.sound_index = sound_index or SoundIndex() # Shared with the App
+        # Parsed library cache lives next to config.json
+        cache_dir = os.path.dirname(os.path.abspath(config_manager.config_file))
+        self.library_cache = LibraryCache(os.path.join(cache_dir, CACHE_FILE_NAME))
+        # Re-parses in the background when Soundpad rewrites the file
+        self.watcher = SoundlistWatcher(self._on_library_file_changed)
+        self._library_key = None # LibraryCache.file_key of what is shown
+        self.searcher = SearchWorker("LibrarySearch")
+        self._search_after = None # Pending debounced search (after id)
+        self._list_generation = 0 # Bumped on every sound list change, stale results are dropped
         
         self.is_edit_mode = False
         self.selected_sound = None
+        self.expanded_categories = {} # category path -> bool
         
         # Layout: Left column (Categories), Right column (Sounds)
         self.grid_columnconfigure(0, weight=1) # Categories
@@ -35,9 +78,9 @@ class LibraryFrame(ctk.CTkFrame):
         ctk.CTkButton(self.cat_header, text="↻", width=30, command=self.refresh, 
                       fg_color="gray", hover_color="gray40").pack(side="right", padx=5)
 
-        # List
-        self.cat_frame = ctk.CTkScrollableFrame(self)
-        self.cat_frame.grid(row=1, column=0, sticky="nsew", padx=(0, 5), pady=0)
+        # List (rows for the visible categories only, see CategoryTree)
+        self.category_tree = CategoryTree(self, self.expanded_categories, on_select=self.select_category)
+        self.category_tree.grid(row=1, column=0, sticky="nsew", padx=(0, 5), pady=0)
         
         # --- Sounds ---
         # Header with Edit Toggle
@@ -55,16 +98,23 @@ class LibraryFrame(ctk.CTkFrame):
 
         # Search Bar
         self.search_var = ctk.StringVar()
-        self.search_var.trace_add("write", lambda *args: self.refresh_sounds())
+        self.search_var.trace_add("write", lambda *args: self._on_search_changed())
         self.search_entry = ctk.CTkEntry(self.sound_header, placeholder_text="Search...", textvariable=self.search_var, width=150)
         self.search_entry.pack(side="left", padx=5)
 
-        # List
-        self.sound_frame = ctk.CTkScrollableFrame(self)
-        self.sound_frame.grid(row=1, column=1, sticky="nsew", padx=(5, 0), pady=0)
+        # List (a fixed pool of rows, see SoundList)
+        self.sound_list = SoundList(self, on_click=self.on_click_sound, on_double_click=self.play_sound,
+                                    on_context=self.show_sound_context_menu)
+        self.sound_list.grid(row=1, column=1, sticky="nsew", padx=(5, 0), pady=0)
         
-        self.categories_data = [] # List of {name, sounds}
-        self.selected_category_index = -1
+        self.categories_data = [] # List of {name, path, sounds, records, subcategories}, see SoundpadParser
+        self._loading = False # True while _load_worker runs
+        self._load_generation = 0
+
+        # API sync state, reset on every re-parse
+        self._api_category = None # the "Новые" category dict, if shown
+        self._api_synced = False
+        self._api_sounds_list = [] # last full API list, to re-filter when the .spl changes
         
         self.refresh()
 
@@ -76,268 +126,352 @@ class LibraryFrame(ctk.CTkFrame):
             self.edit_btn.configure(text="✎ Edit Mode: OFF", fg_color="gray", hover_color="gray40")
 
     def refresh(self):
-        """Scans folder and reloads data."""
+        """Scans folder and reloads data. The file is loaded in the background (see _load_worker)."""
         # Clear UI
-        for w in self.cat_frame.winfo_children(): w.destroy()
-        for w in self.sound_frame.winfo_children(): w.destroy()
+        self.sound_list.clear()
+        self._cancel_sound_list()
+
+        self._api_category = None
+        self._api_synced = False
+        self._api_sounds_list = []
+        self._library_key = None
+        self._load_generation += 1 # Results of an older load are ignored
+        self._loading = False
+        self.categories_data = []
+        self._index_library(self.sound_index.build_library([]))
+        self.category_tree.set_categories([], keep_position=False)
         
         folder = self.config_manager.get_soundpad_data_folder()
         if not folder or not os.path.exists(folder):
-            ctk.CTkLabel(self.cat_frame, text="No folder selected.\nGo to Settings.").pack(pady=20)
+            self.watcher.watch(None)
+            self.category_tree.set_message("No folder selected.\nGo to Settings.")
             return
 
+        # Top level categories are appended here as they are parsed
+        self._loading = True
+        self.sound_list.set_message("Loading library...")
+        threading.Thread(target=self._load_worker, args=(folder, self._load_generation),
+                         name="LibraryLoader", daemon=True).start()
+
+    @staticmethod
+    def _find_library_file(folder):
         # Scan for XMLs and SPLs
         # Priority: soundlist.spl > soundlist.xml > others
         # We should only load ONE valid database file to avoid duplicates, 
         # unless the user has split configs (unlikely for Soundpad).
         
-        target_file = None
         priority_files = ["soundlist.spl", "soundlist.xml"]
         
         for pf in priority_files:
             full_path = os.path.join(folder, pf)
             if os.path.exists(full_path):
-                 target_file = full_path
-                 break
+                 return full_path
         
         # If not found standard files, look for any .spl or .xml and pick first?
         # Or maybe the user *wants* to see everything? 
         # User said "repeated folders", implying we loaded multiple files with same content.
         # Let's stick to single source of truth.
         
-        if not target_file:
-            spls = glob.glob(os.path.join(folder, "**/*.spl"), recursive=True)
-            if spls:
-                target_file = spls[0]
-            else:
-                xmls = glob.glob(os.path.join(folder, "**/*.xml"), recursive=True)
-                if xmls:
-                    target_file = xmls[0]
-        
-        if target_file:
-             self.categories_data = self.parser.parse_file(target_file)
-        else:
-             self.categories_data = []
-        
+        spls = glob.glob(os.path.join(folder, "**/*.spl"), recursive=True)
+        if spls:
+            return spls[0]
+        xmls = glob.glob(os.path.join(folder, "**/*.xml"), recursive=True)
+        if xmls:
+            return xmls[0]
+        return None
+
+    def _load_worker(self, folder, generation):
+        """Finds and loads the library file. Runs in a background thread."""
+        target_file = self._find_library_file(folder)
+        key = None
+        categories = []
+        try:
+            if target_file:
+                key = self.library_cache.file_key(target_file) # Taken before parsing, a later edit must miss
+                on_category = lambda cat: self.after(0, lambda: self._add_loaded_category(generation, cat))
+                categories = self._load_library(target_file, key, on_category)
+            tables = self.sound_index.build_library(categories)
+        except Exception as e:
+            self.logger.error(f"Error loading library from {target_file}: {e}")
+            categories, tables = [], self.sound_index.build_library([])
+        self.after(0, lambda: self._finish_load(generation, target_file, key, categories, tables))
+
+    def _add_loaded_category(self, generation, category):
+        """Shows a top level category while the rest of the file is still being parsed."""
+        if generation != self._load_generation or not self._loading:
+            return
+        self.categories_data.append(category)
+        self.category_tree.append_categories([category])
+
+    def _finish_load(self, generation, target_file, key, categories, tables):
+        if generation != self._load_generation:
+            return
+        streamed = self.categories_data
+        self._loading = False
+        self._library_key = key
+        self.categories_data = categories
+        self._index_library(tables)
+        self.watcher.watch(target_file, key)
+        self.sound_list.clear()
+
         # Populate Categories
-        if not self.categories_data:
-             ctk.CTkLabel(self.cat_frame, text="No sounds found.").pack(pady=20)
+        if not categories:
+             self.category_tree.set_message("No sounds found.")
              return
 
-        # Keep track of expanded state: category path -> bool
-        if not hasattr(self, 'expanded_categories'):
-            self.expanded_categories = {}
-
-        self._render_category_tree(self.categories_data, self.cat_frame, level=0)
+        if [id(c) for c in streamed] != [id(c) for c in categories]:
+            # Loaded from the cache (nothing streamed), show it all at once
+            self.category_tree.set_categories(categories, keep_position=False)
 
-        # Select first by default if nothing selected (using a flat index or just picking the first category)
-        # We need a flat list of categories to maintain existing selection logic
-        if self.categories_data and getattr(self, "selected_category_index", -1) < 0:
-            self.select_category(0, self.categories_data[0])
+        # Keep the category that was selected (or clicked while loading), else the first one
+        selected = getattr(self, 'selected_category_data', None)
+        self._select_path(selected['path'] if selected else None)
 
         # After local load, trigger API sync to grab any "new" sounds not in the .spl
         if self.on_api_sync_request:
             self.on_api_sync_request()
 
+    def _select_path(self, path):
+        """Selects the shown category with this path, or the first one."""
+        pos = self.category_tree.position(path)
+        if pos is None and self.category_tree.items:
+            pos = 0
+        if pos is not None:
+            self.select_category(self.category_tree.items[pos][0])
+
+    def _load_library(self, target_file, key, on_category=None):
+        """Parsed categories of target_file, from the cache when the file is unchanged."""
+        categories = self.library_cache.load(key)
+        if categories is None:
+            categories = self.parser.parse_file(target_file, on_category)
+            self.library_cache.store(key, categories)
+        return categories
+
+    def _on_library_file_changed(self, path, key):
+        """SoundlistWatcher callback (watcher thread): loads the new file off the Tk thread."""
+        categories = self._load_library(path, key)
+        tables = self.sound_index.build_library(categories)
+        self.after(0, lambda: self._apply_library_update(categories, key, tables))
+
+    def _apply_library_update(self, categories, key, tables):
+        """Swaps in a re-parsed library, redrawing only what changed."""
+        if self._loading or key == self._library_key or not categories:
+            return
+        self._library_key = key
+        old = [cat for cat in self.categories_data if cat.get('path') != API_CATEGORY_PATH]
+        changed, same_shape = diff_library(old, categories)
+        if not changed and same_shape:
+            return
+        self.logger.info(f"Library changed on disk, updating {len(changed)} categories")
+
+        if same_shape:
+            # Keep the rendered tree (and the dicts its buttons hold), swap the content in place
+            for cur, new in zip(walk_categories(old), walk_categories(categories)):
+                cur['records'] = new['records']
+                cur['sounds'] = new['sounds']
+            self._index_library(tables, old)
+            redraw = False
+        else:
+            self.categories_data = ([self._api_category] if self._api_category else []) + categories
+            self._index_library(tables)
+            redraw = True
+
+        if self._api_synced:
+            # Sounds now saved in the .spl leave "Новые", and the other way round
+            spl_titles = self._get_spl_titles()
+            sounds = [self._format_api_sound(s) for s in self._api_sounds_list
+                      if normalize_title(s.get('title', 'Unknown')) not in spl_titles]
+            current = self._api_category['records'] if self._api_category else []
+            if [(s.title, s.api_index) for s in sounds] != [(s.title, s.api_index) for s in current]:
+                redraw = self._replace_api_sounds(sounds) or redraw
+
+        selected = getattr(self, 'selected_category_data', None)
+        if redraw:
+            self.category_tree.set_categories(self.categories_data)
+        if not same_shape:
+            # Re-select the same category in the new tree
+            self._select_path(selected['path'] if selected else None)
+        elif selected is not None and (selected['path'] in changed or self.search_var.get().strip()):
+            self.refresh_sounds()
+
+    def _index_library(self, tables, categories=None):
+        """Swaps in the library side of the sound index (tables built from the .spl categories)."""
+        self.sound_index.apply_library(tables, categories)
+        if self._api_category is not None:
+            self.sound_index.set_category(self._api_category)
+
+    def _get_spl_titles(self):
+        """Normalized titles of all sounds from the .spl (supports `in`)."""
+        return self.sound_index.titles
+
+    @staticmethod
+    def _format_api_sound(s):
+        return SoundRecord(s.get('title', 'Unknown'), api_index=s.get('index', s.get('api_index', 0)),
+                           index=s.get('index', '')) # index kept for backward compatibility
+
     def load_api_sounds(self, api_sounds_list):
         """Injects a flat list of sounds from the Soundpad API into the category tree."""
         if not api_sounds_list:
             return
+        self._api_sounds_list = api_sounds_list
+        if self._loading:
+            return # Needs the .spl titles, the sync requested after loading redoes this
 
         # 1. Collect all existing sound titles (case-insensitive) to avoid duplicates
-        existing_titles = set()
-        def _collect(categories):
-            for c in categories:
-                # Ignore the "Новые" category itself if it exists during re-render
-                if c.get('name') == "🆕 Новые":
-                    continue
-                for s in c.get('sounds', []):
-                    existing_titles.add(s.get('title', '').strip().lower())
-                _collect(c.get('subcategories', []))
-        
-        _collect(getattr(self, 'categories_data', []))
+        existing_titles = self._get_spl_titles()
 
         # 2. Add only sounds that aren't in the loaded SPL
         formatted_sounds = []
         for s in api_sounds_list:
-            title = s.get('title', 'Unknown')
-            if title.strip().lower() not in existing_titles:
-                formatted_sounds.append({
-                    'title': title,
-                    'api_index': s.get('index', s.get('api_index', 0)),
-                    'index': s.get('index', '') # Keep for backward compatibility
-                })
+            if normalize_title(s.get('title', 'Unknown')) not in existing_titles:
+                formatted_sounds.append(self._format_api_sound(s))
 
+        self._set_api_sounds(formatted_sounds)
+        self._api_synced = True
+
+        # Redraw UI
+        self.category_tree.set_categories(self.categories_data)
+
+    def _set_api_sounds(self, formatted_sounds):
         # Remove existing API category if it exists to replace it
-        self.categories_data = [cat for cat in getattr(self, 'categories_data', []) if cat.get('name') != "🆕 Новые"]
+        self.categories_data = [cat for cat in self.categories_data if cat.get('path') != API_CATEGORY_PATH]
+        self._api_category = None
+        self.sound_index.remove_category(API_CATEGORY_PATH)
 
         # Only create the category if there are actually any NEW sounds
         if formatted_sounds:
-            api_category = {
-                'name': "🆕 Новые",
-                'path': "api_sync",
-                'sounds': formatted_sounds,
-                'subcategories': []
-            }
+            self._api_category = make_category(API_CATEGORY_NAME, API_CATEGORY_PATH, formatted_sounds)
             
             # Put it at the top
-            self.categories_data.insert(0, api_category)
+            self.categories_data.insert(0, self._api_category)
+            self.sound_index.set_category(self._api_category)
             
             if not hasattr(self, 'expanded_categories'):
                 self.expanded_categories = {}
-            self.expanded_categories["api_sync"] = True
+            self.expanded_categories[API_CATEGORY_PATH] = True
 
-        # Redraw UI
-        for w in self.cat_frame.winfo_children(): w.destroy()
-        self._render_category_tree(self.categories_data, self.cat_frame, level=0)
-
-    def _render_category_tree(self, categories_list, parent_frame, level=0):
-        # We need to flatten the list to assign correct indices for the existing `select_category`
-        # However, to avoid rewriting entire selection logic right now, we can pass the actual category dict
-        # and store it instead of just an index.
-        # Let's map categories to a flat list for index compatibility
-        if level == 0:
-            self.flat_categories = []
-            if not hasattr(self, 'category_buttons'):
-                self.category_buttons = {}
-            else:
-                self.category_buttons.clear()
-
-        indent = level * 15
-        
-        for cat in categories_list:
-            current_index = len(self.flat_categories)
-            self.flat_categories.append(cat)
-            
-            # Container for row
-            row_frame = ctk.CTkFrame(parent_frame, fg_color="transparent")
-            row_frame.pack(fill="x", pady=1, padx=(indent, 0))
-            
-            has_children = len(cat.get('subcategories', [])) > 0
-            
-            # Toggle Button (if has children)
-            if has_children:
-                is_expanded = self.expanded_categories.get(cat['path'], False)
-                toggle_text = "▼" if is_expanded else "▶"
-                toggle_btn = ctk.CTkButton(row_frame, text=toggle_text, width=20, height=20,
-                                           fg_color="transparent", text_color="gray", hover_color="gray30",
-                                           command=lambda c=cat: self.toggle_category(c['path']))
-                toggle_btn.pack(side="left")
-            else:
-                # Spacer to align text with folders that have toggle buttons
-                ctk.CTkFrame(row_frame, width=20, height=20, fg_color="transparent").pack(side="left")
-
-            # Main Category Button
-            btn = ctk.CTkButton(row_frame, text=cat['name'], anchor="w",
-                                command=lambda idx=current_index, c=cat: self.select_category(idx, c),
-                                fg_color="transparent", text_color=("gray10", "gray90"), hover_color="gray80")
-            btn.pack(side="left", fill="x", expand=True)
-            self.category_buttons[current_index] = btn
-
-            # Recurse if expanded
-            if has_children and self.expanded_categories.get(cat['path'], False):
-                self._render_category_tree(cat['subcategories'], parent_frame, level + 1)
+    def apply_api_delta(self, delta, api_sounds_list):
+        """Applies only what changed in the Soundpad API list since the last sync (see SoundListSync)."""
+        if not self._api_synced or delta.initial:
+            # First sync after a (re)parse needs the whole list
+            self.load_api_sounds(api_sounds_list)
+            return
+        if delta.is_empty():
+            return
+        self._api_sounds_list = api_sounds_list
+
+        spl_titles = self._get_spl_titles()
+        had_category = self._api_category is not None
+        sounds = list(self._api_category['records']) if had_category else []
+
+        # Sounds that moved or vanished, keyed by (title, old index)
+        moved = {(normalize_title(old['title']), old['index']): new for old, new in delta.moved}
+        removed = {(normalize_title(s['title']), s['index']) for s in delta.removed}
+
+        if moved or removed:
+            updated = []
+            for entry in sounds:
+                key = (normalize_title(entry.title), entry.api_index)
+                if key in removed:
+                    continue
+                new = moved.get(key)
+                updated.append(self._format_api_sound(new) if new else entry)
+            sounds = updated
+
+        for s in delta.added:
+            if normalize_title(s['title']) not in spl_titles:
+                sounds.append(self._format_api_sound(s))
+
+        if self._replace_api_sounds(sounds):
+            self.category_tree.set_categories(self.categories_data)
+
+    def _replace_api_sounds(self, sounds):
+        """Swaps the "Новые" sounds. Returns True if the category tree needs a redraw."""
+        had_category = self._api_category is not None
+        if had_category and sounds:
+            # Same tree shape, just swap the category content
+            self._api_category['records'] = sounds
+            self._api_category['sounds'] = range(len(sounds))
+            if getattr(self, 'selected_category_data', None) is self._api_category:
+                self.refresh_sounds()
+            return False
+
+        self._set_api_sounds(sounds)
+        return had_category or bool(sounds)
 
     def toggle_category(self, path):
-        self.expanded_categories[path] = not self.expanded_categories.get(path, False)
-        
-        # Redraw categories
-        for w in self.cat_frame.winfo_children(): w.destroy()
-        self._render_category_tree(self.categories_data, self.cat_frame, level=0)
+        self.category_tree.toggle(path)
 
-    def select_category(self, index, category_dict=None):
-        self.selected_category_index = index
+    def select_category(self, category_dict):
         self.selected_category_data = category_dict
-        
-        # Highlight logic
-        if hasattr(self, 'category_buttons'):
-            for idx, btn in self.category_buttons.items():
-                if btn.winfo_exists():
-                    if idx == index:
-                        # Highlight active category
-                        btn.configure(text_color="#3498db", font=ctk.CTkFont(weight="bold"))
-                    else:
-                        # Reset inactive categories
-                        btn.configure(text_color=("gray10", "gray90"), font=ctk.CTkFont(weight="normal"))
-
+        # Highlight logic (redraws the old and new selected rows only)
+        self.category_tree.select(category_dict['path'])
         self.refresh_sounds()
-        
+
+    def _on_search_changed(self):
+        """Search box trace: drops the search in flight and searches once typing pauses."""
+        self._cancel_sound_list()
+        self._search_after = self.after(SEARCH_DEBOUNCE_MS, self.refresh_sounds)
+
+    def _cancel_sound_list(self):
+        """Stops whatever is about to change the sound list (pending or running search)."""
+        if self._search_after is not None:
+            self.after_cancel(self._search_after)
+            self._search_after = None
+        self.searcher.cancel()
+        self._list_generation += 1
+
     def refresh_sounds(self):
-        # Populate Sounds
-        for w in self.sound_frame.winfo_children(): w.destroy()
-        
+        """Shows the selected category, or the search results across the library.
+
+        A search runs on the searcher thread; the rows already shown stay until its
+        results arrive.
+        """
+        self._cancel_sound_list()
+        generation = self._list_generation
+        if self._loading:
+            return # Shown once the library has loaded (see _finish_load)
+
         if not self.categories_data or getattr(self, 'selected_category_data', None) is None:
+            self.sound_list.clear()
             return
 
         query = self.search_var.get().strip().lower()
+        if not query:
+            # Show only selected category, all of it
+            self.sound_list.set_items(_CategoryRows(self.selected_category_data))
+            return
 
-        sounds_to_show = []
-        if query:
-            # Search across ALL categories recursively
-            def _find_sounds(cat_list):
-                for cat in cat_list:
-                    for sound in cat['sounds']:
-                        if query in sound['title'].lower():
-                            sounds_to_show.append(sound)
-                    if 'subcategories' in cat:
-                        _find_sounds(cat['subcategories'])
-            
-            _find_sounds(self.categories_data)
+        api_category = self._api_category
+
+        def search(cancelled):
+            rows = [] # (sound, path of the category it was found in)
+            # "Новые" is not in the search index (it changes with every API sync), and is small
+            if api_category is not None:
+                rows = [(sound, API_CATEGORY_PATH) for sound in category_sounds(api_category)
+                        if query in sound.title.lower()]
+            # Search across ALL categories, ranked
+            return rows + self.sound_index.search_library(query, limit=SEARCH_RESULT_LIMIT, cancelled=cancelled)
+
+        self.searcher.submit(search, lambda rows: self.after(0, lambda: self._show_sound_rows(generation, rows)))
+
+    def _show_sound_rows(self, generation, rows):
+        """Shows search results, unless the list changed meanwhile (see _list_generation)."""
+        if generation != self._list_generation:
+            return
+        if len(rows) >= SEARCH_RESULT_LIMIT:
+            self.sound_list.set_items(rows[:SEARCH_RESULT_LIMIT - 1], footer="... too many results, keep typing ...")
         else:
-            # Show only selected category
-            sounds_to_show = self.selected_category_data['sounds']
-
-        # Limit to 100 results to prevent UI lag on empty query or large search
-        for i, sound in enumerate(sounds_to_show):
-            if i >= 200:
-                ctk.CTkLabel(self.sound_frame, text="... too many results, keep typing ...").pack(pady=5)
-                break
-
-            # Create a Frame for each item to handle events better
-            item_frame = ctk.CTkFrame(self.sound_frame, fg_color="transparent")
-            item_frame.pack(fill="x", pady=1)
-            
-            # Label for text
-            lbl = ctk.CTkLabel(item_frame, text=sound['title'], anchor="w", padx=5)
-            lbl.pack(fill="both", expand=True)
-            
-            # Bind events to both Frame and Label
-            # Single click to select
-            item_frame.bind("<Button-1>", lambda e, s=sound, f=item_frame: self.on_click_sound(s, f))
-            lbl.bind("<Button-1>", lambda e, s=sound, f=item_frame: self.on_click_sound(s, f))
-            
-            # Double click to play
-            item_frame.bind("<Double-1>", lambda e, s=sound: self.play_sound(s))
-            lbl.bind("<Double-1>", lambda e, s=sound: self.play_sound(s))
-            
-            # Hover effects (manual since not a button)
-            def on_enter(e, f=item_frame): f.configure(fg_color=("gray85", "gray25"))
-            def on_leave(e, f=item_frame): 
-                # Keep request color if selected? For now just revert.
-                if self.selected_sound_frame != f:
-                    f.configure(fg_color="transparent")
-                else:
-                    f.configure(fg_color=("gray75", "gray20")) # Selected color
-
-            item_frame.bind("<Enter>", on_enter)
-            item_frame.bind("<Leave>", on_leave)
-            lbl.bind("<Enter>", on_enter)
-            lbl.bind("<Leave>", on_leave)
-            
-            # Context Menu (Right Click)
-            item_frame.bind("<Button-3>", lambda e, s=sound: self.show_sound_context_menu(e, s))
-            lbl.bind("<Button-3>", lambda e, s=sound: self.show_sound_context_menu(e, s))
-    
-    selected_sound_frame = None
+            self.sound_list.set_items(rows)
 
-    def show_sound_context_menu(self, event, sound):
+    def show_sound_context_menu(self, event, sound, category_path=None):
         import tkinter as tk
         import subprocess
         
         menu = tk.Menu(self, tearoff=0, bg="#2b2b2b", fg="white", 
                        activebackground="#1f538d", activeforeground="white", 
                        relief="flat", borderwidth=0)
-        menu.add_command(label=f"Sound: {sound['title']}", state="disabled")
+        menu.add_command(label=f"Sound: {sound.title}", state="disabled")
         menu.add_separator()
         
         # 0) Play
@@ -350,7 +484,7 @@ class LibraryFrame(ctk.CTkFrame):
         
         # 2) Open in explorer
         menu.add_command(label="📂 Открыть в проводнике",
-                         command=lambda: self.open_in_explorer(sound.get('url')))
+                         command=lambda: self.open_in_explorer(sound.url))
                          
         # 3) Open in Soundpad
         menu.add_command(label="🎵 Выбрать в Soundpad",
@@ -358,7 +492,7 @@ class LibraryFrame(ctk.CTkFrame):
                          
         # 4) Show in Folder (Navigate Library Frame)
         menu.add_command(label="🔍 Показать в папке (здесь)",
-                         command=lambda: self.navigate_to_category(sound.get('category_path')))
+                         command=lambda: self.navigate_to_category(category_path))
                          
         try:
             menu.tk_popup(event.x_root, event.y_root)
@@ -382,12 +516,12 @@ class LibraryFrame(ctk.CTkFrame):
         # However, for now, we rely on App registering a callback.
         # Let's add a `on_select_soundpad` callback. For now, try to get index and emit event.
         if hasattr(self, 'on_select_soundpad') and self.on_select_soundpad:
-            idx = sound.get('api_index') or sound.get('index')
+            idx = sound.api_index or sound.index
             if idx:
                 self.on_select_soundpad(int(idx))
 
     def navigate_to_category(self, target_path):
-        if not target_path: return
+        if not target_path or self.sound_index.find_category(target_path) is None: return
         
         # 1. Expand all parent categories to make it visible
         parts = target_path.split(" / ")
@@ -397,25 +531,18 @@ class LibraryFrame(ctk.CTkFrame):
             self.expanded_categories[current] = True
             
         # 2. Redraw to apply expansions
-        for w in self.cat_frame.winfo_children(): w.destroy()
-        self._render_category_tree(self.categories_data, self.cat_frame, level=0)
+        self.category_tree.set_categories(self.categories_data)
         
-        # 3. Find index and select
-        for idx, cat in enumerate(self.flat_categories):
-            if cat['path'] == target_path:
-                self.select_category(idx, cat)
-                # Clear search to show the category
-                self.search_var.set("")
-                break
-
-    def on_click_sound(self, sound, frame):
+        # 3. Find the row and select
+        pos = self.category_tree.position(target_path)
+        if pos is not None:
+            # Clear search to show the category
+            self.search_var.set("")
+            self.select_category(self.category_tree.items[pos][0])
+
+    def on_click_sound(self, sound):
         # Update visual selection
-        if self.selected_sound_frame:
-            self.selected_sound_frame.configure(fg_color="transparent")
-        
-        self.selected_sound_frame = frame
-        frame.configure(fg_color=("gray75", "gray20"))
-        
+        self.sound_list.select(sound)
         self.select_sound(sound)
 
     def select_sound(self, sound):
@@ -426,6 +553,6 @@ class LibraryFrame(ctk.CTkFrame):
     def play_sound(self, sound):
         if self.on_play_sound:
             # Check if 'api_index' exists (added by parser), else try 'index'
-            idx = sound.get('api_index') or sound.get('index')
+            idx = sound.api_index or sound.index
             if idx:
                 self.on_play_sound(int(idx))
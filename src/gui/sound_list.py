@@ -0,0 +1,69 @@
+import customtkinter as ctk
+from src.gui.virtual_list import VirtualList, ROW_COLOR, HOVER_COLOR, SELECTED_COLOR
+
+
+class SoundList(VirtualList):
+    """Virtualized list of (sound, category path) rows (see VirtualList).
+
+    Showing 10 or 10 000 sounds costs the same; rows can be any sequence (see
+    LibraryFrame._CategoryRows).
+    """
+
+    def __init__(self, master, on_click=None, on_double_click=None, on_context=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.on_click = on_click # Callback(sound)
+        self.on_double_click = on_double_click # Callback(sound)
+        self.on_context = on_context # Callback(event, sound, category_path)
+        self.footer = None # Extra last row, e.g. "too many results"
+        self.selected = None # Selected sound (highlighted wherever it is shown)
+
+    def set_items(self, items, footer=None):
+        """Shows items from the top."""
+        self.footer = footer
+        super().set_items(items)
+
+    def select(self, sound):
+        self.selected = sound
+        self._redraw()
+
+    def _row_count(self):
+        return len(self.items) + (1 if self.footer else 0)
+
+    def _create_row(self, slot):
+        frame = ctk.CTkFrame(self.body, fg_color=ROW_COLOR, corner_radius=6)
+        label = ctk.CTkLabel(frame, text="", anchor="w", padx=5)
+        label.pack(fill="both", expand=True, pady=1)
+        for widget in (frame, label):
+            # Single click to select, double click to play
+            widget.bind("<Button-1>", lambda e: self._on_row_event(slot, self.on_click))
+            widget.bind("<Double-1>", lambda e: self._on_row_event(slot, self.on_double_click))
+            # Context Menu (Right Click)
+            widget.bind("<Button-3>", lambda e: self._on_row_context(e, slot))
+            self._bind_row_widget(widget, slot)
+        return frame, label
+
+    def _row_state(self, pos, slot):
+        if pos < len(self.items):
+            sound = self.items[pos][0]
+            if sound is self.selected:
+                return sound.title, SELECTED_COLOR
+            return sound.title, HOVER_COLOR if slot == self.hovered else ROW_COLOR
+        if pos == len(self.items) and self.footer:
+            return self.footer, ROW_COLOR
+        return "", ROW_COLOR
+
+    def _draw_row(self, slot, state):
+        frame, label = self.pool[slot]
+        text, color = state
+        label.configure(text=text)
+        frame.configure(fg_color=color)
+
+    def _on_row_event(self, slot, callback):
+        item = self._item_at(slot)
+        if item is not None and callback:
+            callback(item[0])
+
+    def _on_row_context(self, event, slot):
+        item = self._item_at(slot)
+        if item is not None and self.on_context:
+            self.on_context(event, item[0], item[1])
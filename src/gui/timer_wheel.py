@@ -0,0 +1,89 @@
+import logging
+import threading
+import time
+
+TICK_MS = 16 # Deadline resolution, one UI frame
+WHEEL_SIZE = 64 # Slots; longer delays go round the wheel more than once
+
+
+class TimerWheel:
+    """Per-key deadlines (e.g. when a flashed key goes dark again) on one Tk timer.
+
+    schedule(key, delay_ms) sets the key's deadline, a retrigger pushes it back instead
+    of adding another callback. Keys sit in the wheel slot of their deadline tick; the
+    wheel advances with a single after() callback while anything is pending (none when
+    idle), and on_expire(keys) gets every key due in a tick as one batch. Safe to call
+    from any thread: after() is only called once the lock is released, since from another
+    thread Tkinter waits for the Tk thread, which may be waiting for the lock itself.
+    """
+
+    def __init__(self, widget, on_expire, tick_ms=TICK_MS, size=WHEEL_SIZE):
+        self.logger = logging.getLogger(__name__)
+        self.widget = widget # Any Tk widget, for after()
+        self.on_expire = on_expire
+        self.tick_ms = tick_ms
+        self.size = size
+        self._lock = threading.Lock()
+        self._slots = [set() for _ in range(size)]
+        self._deadlines = {} # key -> deadline tick
+        self._origin = time.monotonic()
+        self._done = self._now() # Last tick processed
+        self._running = False
+
+    def _now(self):
+        return int((time.monotonic() - self._origin) * 1000 // self.tick_ms)
+
+    def schedule(self, key, delay_ms):
+        """Fires key after delay_ms, or later if it is already due later."""
+        with self._lock:
+            deadline = self._now() + max(1, -(-delay_ms // self.tick_ms))
+            if self._deadlines.get(key, -1) >= deadline:
+                return
+            self._deadlines[key] = deadline
+            self._slots[deadline % self.size].add(key)
+            start = not self._running
+            if start:
+                self._running = True
+                self._done = self._now()
+        if start:
+            self.widget.after(self.tick_ms, self._on_tick)
+
+    def cancel(self, key):
+        with self._lock:
+            self._deadlines.pop(key, None)
+
+    def _on_tick(self):
+        expired = []
+        with self._lock:
+            now = self._now()
+            if now - self._done >= self.size:
+                # Tk was blocked for a whole turn, check every deadline once
+                expired = [key for key, deadline in self._deadlines.items() if deadline <= now]
+                for key in expired:
+                    del self._deadlines[key]
+                for slot in self._slots:
+                    slot.clear()
+                for key, deadline in self._deadlines.items():
+                    self._slots[deadline % self.size].add(key)
+            else:
+                for tick in range(self._done + 1, now + 1):
+                    slot = self._slots[tick % self.size]
+                    for key in list(slot):
+                        deadline = self._deadlines.get(key)
+                        if deadline == tick:
+                            expired.append(key)
+                            del self._deadlines[key]
+                        elif deadline is not None and deadline > tick and deadline % self.size == tick % self.size:
+                            continue # Due on a later turn
+                        slot.discard(key) # Fired, cancelled or moved to another slot
+            self._done = now
+            self._running = bool(self._deadlines)
+            running = self._running
+        if running:
+            self.widget.after(self.tick_ms, self._on_tick)
+
+        if expired:
+            try:
+                self.on_expire(expired)
+            except Exception as e:
+                self.logger.error(f"Error releasing {len(expired)} timers: {e}")
@@ -0,0 +1,107 @@
+import logging
+import threading
+import time
+
+FRAME_MS = 16 # ~60 Hz
+
+
+class UiPump:
+    """Coalesces keyboard updates and applies them at most once per frame.
+
+    Any thread can post note events, highlights and new key mappings (labels and colors,
+    see mappings_by_octave). They are merged per key (only the latest state of a key,
+    and the latest mappings, are kept) and drained on the Tk thread by a
+    single callback per frame into the shared KeyboardModel, so a fast chord or
+    glissando costs one model update per frame instead of one Tk callback and repaint
+    per note per keyboard. A highlight turned on and off again within one frame (a quick
+    tap in hold-to-play mode) is still shown for that frame and turned off in the next.
+
+    on_note(note, pressed, is_down) is called first in a frame for every note with
+    pending events: pressed if a note-on arrived since the last frame, is_down for the
+    latest state. Updates it posts are applied in the same frame.
+
+    after() is never called with the lock held: from another thread Tkinter hands it to
+    the Tk thread and waits, and the Tk thread may be waiting for the lock in a flush.
+    """
+
+    def __init__(self, widget, model, on_note=None):
+        self.logger = logging.getLogger(__name__)
+        self.widget = widget # Any Tk widget, for after()
+        self.model = model # KeyboardModel the keyboards render
+        self.on_note = on_note
+        self._lock = threading.Lock()
+        self._notes = {}      # note -> (pressed, is_down)
+        self._highlights = {} # note -> on
+        self._releases = set() # notes to turn off in the frame after the next one
+        self._mappings = None # Latest octaves for KeyboardModel.set_mappings, if any
+        self._scheduled = False
+        self._last_flush = 0.0
+
+    def post_note(self, note, is_note_on):
+        with self._lock:
+            pressed, _ = self._notes.get(note, (False, False))
+            self._notes[note] = (pressed or is_note_on, is_note_on)
+            delay = self._schedule()
+        self._start(delay)
+
+    def highlight(self, note, on=True):
+        with self._lock:
+            if not on and self._highlights.get(note):
+                self._releases.add(note) # Lit since the last frame, keep it for one
+            else:
+                self._releases.discard(note)
+                self._highlights[note] = on
+            delay = self._schedule()
+        self._start(delay)
+
+    def set_mappings(self, octaves):
+        """Replaces all key labels and colors in the next frame (see KeyboardModel.set_mappings)."""
+        with self._lock:
+            self._mappings = octaves
+            delay = self._schedule()
+        self._start(delay)
+
+    def _schedule(self):
+        """Claims the next flush, returns its delay in ms or None if one is pending. Needs _lock.
+
+        Right away if the last flush is a frame old. The caller passes the delay to
+        _start() once it has released the lock.
+        """
+        if self._scheduled:
+            return None
+        self._scheduled = True
+        wait = FRAME_MS - (time.monotonic() - self._last_flush) * 1000
+        return max(0, int(wait))
+
+    def _start(self, delay):
+        if delay is not None:
+            self.widget.after(delay, self._flush)
+
+    def _flush(self):
+        """Applies everything pending (Tk thread). Posts arriving meanwhile wait for the next frame."""
+        with self._lock:
+            notes, self._notes = self._notes, {}
+        if self.on_note:
+            for note, (pressed, is_down) in notes.items():
+                try:
+                    self.on_note(note, pressed, is_down)
+                except Exception as e:
+                    self.logger.error(f"Error handling note {note}: {e}")
+
+        with self._lock:
+            mappings, self._mappings = self._mappings, None
+            highlights, self._highlights = self._highlights, {}
+            releases, self._releases = self._releases, set()
+            self._last_flush = time.monotonic()
+        if mappings is not None:
+            self.model.set_mappings(mappings)
+        self.model.update(pressed=highlights)
+
+        with self._lock:
+            for note in releases:
+                self._highlights.setdefault(note, False) # Unless it was posted again meanwhile
+            self._scheduled = False
+            delay = None
+            if self._notes or self._mappings is not None or self._highlights:
+                delay = self._schedule()
+        self._start(delay)
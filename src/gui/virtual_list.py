@@ -0,0 +1,153 @@
+import customtkinter as ctk
+
+ROW_HEIGHT = 30 # px, every row has the same height
+WHEEL_ROWS = 3 # rows scrolled per mouse wheel notch
+
+ROW_COLOR = "transparent"
+HOVER_COLOR = ("gray85", "gray25")
+SELECTED_COLOR = ("gray75", "gray20")
+
+
+class VirtualList(ctk.CTkFrame):
+    """Scrollable list drawn with a fixed pool of row widgets.
+
+    Only the rows that fit the viewport exist as widgets: the pool is sized on resize
+    and scrolling rebinds its rows to other items, so the cost of a list does not
+    depend on its length. items can be any sequence, only the visible ones are read.
+
+    Subclasses build a pool row in _create_row(slot) and draw it in
+    _draw_row(slot, state), where state is whatever _row_state(pos, slot) returns for
+    the item shown there. A row is only redrawn when its state changed.
+    """
+
+    def __init__(self, master, **kwargs):
+        super().__init__(master, **kwargs)
+        self.items = []
+        self.top = 0 # Item shown in the first row
+        self.hovered = None # Pool slot under the mouse
+        self.pool = [] # Row widgets per slot, as returned by _create_row (frame first)
+        self._visible_rows = 0
+        self._shown = [] # State last drawn per slot
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+        self.body = ctk.CTkFrame(self, fg_color="transparent")
+        self.body.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.message_label = ctk.CTkLabel(self.body, text="")
+
+        self.body.bind("<Configure>", self._on_resize)
+        self._bind_wheel(self.body)
+
+    # --- Data ---
+
+    def set_items(self, items, keep_position=False):
+        """Shows items, from the top unless keep_position."""
+        self.items = items
+        self.message_label.place_forget()
+        self._scroll_to(self.top if keep_position else 0)
+
+    def set_message(self, text):
+        """Shows text instead of any rows."""
+        self.set_items([])
+        self.message_label.configure(text=text)
+        self.message_label.place(relx=0.5, y=20, anchor="n")
+
+    def clear(self):
+        self.set_items([])
+
+    def see(self, pos):
+        """Scrolls so that item pos is visible."""
+        if pos < self.top:
+            self._scroll_to(pos)
+        elif pos >= self.top + self._visible_rows - 1:
+            self._scroll_to(pos - self._visible_rows + 2)
+
+    def _row_count(self):
+        return len(self.items)
+
+    def _item_at(self, slot):
+        pos = self.top + slot
+        return self.items[pos] if pos < len(self.items) else None
+
+    # --- Drawing ---
+
+    def _create_row(self, slot):
+        raise NotImplementedError
+
+    def _row_state(self, pos, slot):
+        raise NotImplementedError
+
+    def _draw_row(self, slot, state):
+        raise NotImplementedError
+
+    def _on_resize(self, event):
+        visible = event.height // ROW_HEIGHT + 1
+        if visible == self._visible_rows:
+            return
+        self._visible_rows = visible
+        while len(self.pool) < visible:
+            self.pool.append(self._create_row(len(self.pool)))
+            self._shown.append(None)
+        for slot, row in enumerate(self.pool):
+            if slot < visible:
+                row[0].place(x=0, y=slot * ROW_HEIGHT, relwidth=1, height=ROW_HEIGHT)
+            else:
+                row[0].place_forget()
+        self._scroll_to(self.top)
+
+    def _redraw(self):
+        """Rebinds the visible pool rows to the items from self.top."""
+        for slot in range(min(self._visible_rows, len(self.pool))):
+            state = self._row_state(self.top + slot, slot)
+            if self._shown[slot] != state:
+                self._shown[slot] = state
+                self._draw_row(slot, state)
+
+        total = self._row_count()
+        if total <= self._visible_rows - 1:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(self.top / total, min(1, (self.top + self._visible_rows - 1) / total))
+
+    # --- Scrolling ---
+
+    def _scroll_to(self, top):
+        last = max(0, self._row_count() - (self._visible_rows - 1)) # Last full row at the bottom
+        self.top = max(0, min(int(top), last))
+        self._redraw()
+
+    def _on_scrollbar(self, *args):
+        if not args:
+            return
+        if args[0] == "moveto":
+            self._scroll_to(float(args[1]) * self._row_count())
+        elif args[0] == "scroll":
+            step = max(1, self._visible_rows - 1) if len(args) > 2 and args[2] == "pages" else 1
+            self._scroll_to(self.top + int(float(args[1])) * step)
+
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self._on_wheel) # Windows, macOS
+        widget.bind("<Button-4>", lambda e: self._scroll_to(self.top - WHEEL_ROWS)) # X11
+        widget.bind("<Button-5>", lambda e: self._scroll_to(self.top + WHEEL_ROWS))
+
+    def _on_wheel(self, event):
+        # Windows reports multiples of 120 per notch, macOS small deltas
+        if not event.delta:
+            return
+        notches = event.delta // 120 if abs(event.delta) >= 120 else (1 if event.delta > 0 else -1)
+        self._scroll_to(self.top - notches * WHEEL_ROWS)
+
+    # --- Row events ---
+
+    def _bind_row_widget(self, widget, slot):
+        """Hover tracking and wheel scrolling for a widget of pool row slot."""
+        # Hover effects (manual since not a button)
+        widget.bind("<Enter>", lambda e: self._set_hovered(slot))
+        widget.bind("<Leave>", lambda e: self._set_hovered(None) if self.hovered == slot else None)
+        self._bind_wheel(widget)
+
+    def _set_hovered(self, slot):
+        self.hovered = slot
+        self._redraw()
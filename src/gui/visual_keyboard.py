@@ -1,12 +1,89 @@
 
 import customtkinter as ctk
 import tkinter as tk
+import math
+from functools import lru_cache
+from src.gui.keyboard_model import KeyboardModel
+
+HIGHLIGHT_COLOR = "#3498db"
+RESIZE_DEBOUNCE_MS = 40 # Relayout once the window edge stops moving for this long
+
+WHITE_NOTES = [0, 2, 4, 5, 7, 9, 11] # Indices in octave
+# Black keys mapping: 1->C#, 3->D#, etc.
+BLACK_NOTES = {1: 0, 3: 1, 6: 3, 8: 4, 10: 5} # Note index -> offset from previous white key
+
+
+def _rounded_bottom_points(x1, y1, x2, y2, radius):
+    """Polygon points of a rectangle with rounded bottom corners."""
+    points = []
+    
+    # Top-left corner (sharp)
+    points.extend([x1, y1])
+    # Top-right corner (sharp)
+    points.extend([x2, y1])
+    
+    # Bottom-right corner (rounded)
+    # We draw an arc from 0 to pi/2 (right to bottom)
+    cx = x2 - radius
+    cy = y2 - radius
+    for i in range(11):
+        angle = i * (math.pi / 2) / 10
+        points.extend([cx + radius * math.cos(angle), cy + radius * math.sin(angle)])
+        
+    # Bottom-left corner (rounded)
+    # We draw an arc from pi/2 to pi (bottom to left)
+    cx = x1 + radius
+    cy = y2 - radius
+    for i in range(11):
+        angle = math.pi / 2 + i * (math.pi / 2) / 10
+        points.extend([cx + radius * math.cos(angle), cy + radius * math.sin(angle)])
+        
+    # Back to top-left happens automatically when polygon closes
+    return points
+
+
+@lru_cache(maxsize=32)
+def key_geometry(width, height, num_octaves):
+    """Layout of num_octaves octaves on a width x height canvas, shared by all keyboards.
+
+    Tuple of (note offset from the first C, 'white'/'black', polygon points,
+    label (x, y, wrap width), octave label (x, y) or None), whites first so the
+    blacks are drawn on top.
+    """
+    white_key_width = width / (num_octaves * 7)
+    black_key_width = white_key_width * 0.6 # Standard: Black is usually ~60% of white width
+    black_key_height = height * 0.6 # Black keys are 60% of vertical space
+
+    whites, blacks = [], []
+    x = 0
+    for oct_idx in range(num_octaves):
+        for i in range(7): # 7 white keys
+            offset = oct_idx * 12 + WHITE_NOTES[i]
+            whites.append((
+                offset, 'white',
+                tuple(_rounded_bottom_points(x, 0, x + white_key_width, height, radius=6)),
+                (x + white_key_width / 2, height - 20, white_key_width - 4),
+                (x + white_key_width / 2, 15) if i == 0 else None, # Octave label at TOP of C
+            ))
+            # Black key is AFTER this white key
+            if WHITE_NOTES[i] + 1 in BLACK_NOTES:
+                bx = x + white_key_width - (black_key_width / 2)
+                blacks.append((
+                    offset + 1, 'black',
+                    tuple(_rounded_bottom_points(bx, 0, bx + black_key_width, black_key_height, radius=4)),
+                    (bx + black_key_width / 2, black_key_height - 40, black_key_width - 4),
+                    None,
+                ))
+            x += white_key_width
+    return tuple(whites + blacks)
 
 class VisualKeyboard(ctk.CTkFrame):
-    def __init__(self, master, start_octave=3, num_octaves=2, max_height_limit=533, **kwargs):
+    def __init__(self, master, start_octave=3, num_octaves=2, max_height_limit=533, model=None, **kwargs):
         super().__init__(master, corner_radius=0, fg_color="transparent", **kwargs)
         
-        self.start_octave = start_octave
+        # Labels, colors, pressed keys and start octave, shared with the other keyboards
+        self.model = model or KeyboardModel(start_octave, num_octaves)
+        self.model.visible_octaves = max(self.model.visible_octaves, num_octaves)
         self.num_octaves = num_octaves
         self.max_height_limit = max_height_limit
         
@@ -19,6 +96,13 @@ class VisualKeyboard(ctk.CTkFrame):
         
         self.canvas = ctk.CTkCanvas(self, height=self.white_key_height, bg="gray20", highlightthickness=0)
         self.canvas.pack(fill="both", expand=True)
+        self._drawn_size = None # (width, height) the canvas items are laid out for
+        self._key_items = [] # (rect, label, octave label or None) in key_geometry order
+        self._note_items = {} # note -> its (rect, label, octave label) from _key_items
+        self._item_notes = {} # canvas item -> note, for clicks
+        self._key_types = {}  # rect -> 'white'/'black'
+        self._shown = {}      # rect -> (fill, label text, text color) as drawn
+        self._resize_after = None
 
         # Bind resize
         self.bind("<Configure>", self.on_resize)
@@ -27,11 +111,8 @@ class VisualKeyboard(ctk.CTkFrame):
         self.on_key_click = None # Function(note)
         self.on_key_context = None # Function(note, event)
         
-        # Persistent state for notes (survives redraw/resize)
-        # note_number -> {'label': str, 'color': hex/None}
-        self.note_data = {} 
-        
         self.draw_keyboard()
+        self.model.add_listener(self._on_model_change)
 
         # Bindings
         self.canvas.bind("<Button-1>", self._on_click)
@@ -55,54 +136,50 @@ class VisualKeyboard(ctk.CTkFrame):
         return "black" # Default
         
     def on_resize(self, event):
-        self.draw_keyboard()
+        # Dragging the window edge fires this continuously, relayout once it settles
+        if self._resize_after is not None:
+            self.after_cancel(self._resize_after)
+        self._resize_after = self.after(RESIZE_DEBOUNCE_MS, self._apply_resize)
 
-    def set_start_octave(self, octave):
-        """Sets the starting octave and redraws."""
-        if octave < 0: octave = 0
-        if octave > 8: octave = 8 # Max limit
-        
-        if self.start_octave != octave:
-            self.start_octave = octave
+    def _apply_resize(self):
+        self._resize_after = None
+        size = self._canvas_size()
+        if size == self._drawn_size:
+            return
+        if self._key_items:
+            self._layout(size) # Move the existing items
+        else:
             self.draw_keyboard()
 
+    @property
+    def start_octave(self):
+        return self.model.start_octave
+
+    def set_start_octave(self, octave):
+        """Sets the starting octave (of every keyboard sharing the model), redraws."""
+        self.model.set_start_octave(octave)
+
+    def detach(self):
+        """Stops following the model, before the keyboard is destroyed."""
+        self.model.remove_listener(self._on_model_change)
+
+    def _on_model_change(self, changes):
+        if 'start_octave' in changes:
+            if self._key_items:
+                self._retarget()
+            else:
+                self.draw_keyboard()
+            return
+        notes = set(changes.get('labels', ())) | set(changes.get('colors', ())) | set(changes.get('pressed', ()))
+        for note in notes:
+            if note in self._note_items:
+                self._paint_key(note)
+
     def shift_octave(self, delta):
         self.set_start_octave(self.start_octave + delta)
 
-    def _create_rounded_bottom_rect(self, x1, y1, x2, y2, radius, **kwargs):
-        """Draws a rectangle with rounded bottom corners using a polygon."""
-        import math
-        points = []
-        
-        # Top-left corner (sharp)
-        points.extend([x1, y1])
-        # Top-right corner (sharp)
-        points.extend([x2, y1])
-        
-        # Bottom-right corner (rounded)
-        # We draw an arc from 0 to pi/2 (right to bottom)
-        cx = x2 - radius
-        cy = y2 - radius
-        for i in range(11):
-            angle = i * (math.pi / 2) / 10
-            points.extend([cx + radius * math.cos(angle), cy + radius * math.sin(angle)])
-            
-        # Bottom-left corner (rounded)
-        # We draw an arc from pi/2 to pi (bottom to left)
-        cx = x1 + radius
-        cy = y2 - radius
-        for i in range(11):
-            angle = math.pi / 2 + i * (math.pi / 2) / 10
-            points.extend([cx + radius * math.cos(angle), cy + radius * math.sin(angle)])
-            
-        # Back to top-left happens automatically when polygon closes
-        return self.canvas.create_polygon(points, smooth=False, **kwargs)
-
-    def draw_keyboard(self):
-        self.canvas.delete("all")
-        self.keys = {}
-        self.key_rects = {}
-        
+    def _canvas_size(self):
+        """(width, height) to lay the keys out for, from the current widget size."""
         # Calculate dynamic width
         current_width = self.winfo_width()
         current_height = self.winfo_height()
@@ -110,176 +187,141 @@ class VisualKeyboard(ctk.CTkFrame):
         # Limit height so it doesn't stretch indefinitely
         if current_height > self.max_height_limit:
             current_height = self.max_height_limit
-            
-        if current_width > 1:
-            self.white_key_width = current_width / self.total_white_keys
-            
-        if current_height > 1:
-            # Update canvas internal height so it doesn't clip
-            self.canvas.configure(height=current_height)
-            self.white_key_height = current_height
-            self.black_key_height = current_height * 0.6 # Black keys are 60% of vertical space
         
-        # Recalculate black key width proportional to white?
-        # Standard: Black is usually ~60% of white width
+        width = current_width if current_width > 1 else self.white_key_width * self.total_white_keys
+        height = current_height if current_height > 1 else self.white_key_height
+        return width, height
+
+    def _set_size(self, size):
+        width, height = size
+        if height != self.white_key_height:
+            # Update canvas internal height so it doesn't clip
+            self.canvas.configure(height=height)
+        self.white_key_width = width / self.total_white_keys
+        self.white_key_height = height
         self.black_key_width = self.white_key_width * 0.6
+        self.black_key_height = height * 0.6
+        self._drawn_size = size
 
-        # White keys
-        white_notes = [0, 2, 4, 5, 7, 9, 11] # Indices in octave
-        # Black keys mapping: 1->C#, 3->D#, etc.
-        black_notes = {1: 0, 3: 1, 6: 3, 8: 4, 10: 5} # Note index -> offset from previous white key
+    def draw_keyboard(self):
+        """Recreates all canvas items (first draw, or nothing drawn yet)."""
+        self.canvas.delete("all")
+        self.keys = {}
+        self._key_items = []
+        self._note_items = {}
+        self._item_notes = {}
+        self._key_types = {}
+        self._shown = {}
         
-        # Draw Whites first
-        x = 0
-        for oct_idx in range(self.num_octaves):
-            current_oct = self.start_octave + oct_idx
-            base_note = current_oct * 12
+        size = self._canvas_size()
+        self._set_size(size)
+        base_note = self.start_octave * 12
+        
+        for offset, key_type, points, (lx, ly, lwidth), oct_label in key_geometry(*size, self.num_octaves):
+            midi_note = base_note + offset
+            # Get persistent data
+            fill, label_text, text_color = look = self._key_look(midi_note, key_type)
             
-            for i in range(7): # 7 white keys
-                # Determine midi note
-                note_offset = white_notes[i]
-                midi_note = base_note + note_offset
-                
-                rect = self._create_rounded_bottom_rect(
-                    x, 0, x + self.white_key_width, self.white_key_height, radius=6,
-                    fill="white", outline="black", tags=("key", f"key_{midi_note}")
-                )
-                self.keys[midi_note] = rect
-                
-                # Get persistent data
-                data = self.note_data.get(midi_note, {})
-                default_color = data.get('color') or "white"
-                label_text = data.get('label', "")
-                
-                self.key_rects[rect] = {'note': midi_note, 'type': 'white', 'default_color': default_color}
-                self.canvas.itemconfig(rect, fill=default_color)
-                
-                # Determine text color
-                text_color = self._get_contrasting_text_color(default_color)
-                
-                # Add Label placeholder
-                # If C key (i==0), show Octave label at TOP
-                if i == 0:
-                    self.canvas.create_text(
-                        x + self.white_key_width/2, 15, # Top position
-                        text=f"C{current_oct}", tags=("oct_label", f"oct_label_{midi_note}"), 
-                        font=("Arial", 12, "bold"), fill=text_color
-                    )
-                
-                # Sound Assignment Label (Bottom)
-                self.canvas.create_text(
-                    x + self.white_key_width/2, self.white_key_height - 20,
-                    text=label_text, tags=("label", f"label_{midi_note}"), 
-                    font=("Arial", 11), fill=text_color, width=self.white_key_width - 4, justify="center"
+            rect = self.canvas.create_polygon(points, smooth=False, fill=fill, outline="black", tags=("key",))
+            
+            oct_item = None
+            if oct_label:
+                oct_item = self.canvas.create_text(
+                    *oct_label,
+                    text=f"C{midi_note // 12}", tags=("oct_label",), 
+                    font=("Arial", 12, "bold"), fill=text_color
                 )
-                
-                x += self.white_key_width
-        
-        # Draw Blacks on top
-        x = 0
-        for oct_idx in range(self.num_octaves):
-            current_oct = self.start_octave + oct_idx
-            base_note = current_oct * 12
             
-            for i in range(7):
-                current_white_note = white_notes[i]
-                black_note_offset = current_white_note + 1
-                
-                if black_note_offset in black_notes:
-                    # bx = x + self.white_key_width - (self.black_key_width / 2) 
-                    # Use current dynamic width. x is start of NEXT white key loop? 
-                    # Wait, loop logic above: x increments at end of loop.
-                    # Inside loop, 'x' is start of THIS white key.
-                    # Black key is AFTER this white key.
-                    # So pos = x + white_width - black_width/2
-                    
-                    bx = x + self.white_key_width - (self.black_key_width / 2)
-                    midi_note = base_note + black_note_offset
-                    
-                    rect = self._create_rounded_bottom_rect(
-                        bx, 0, bx + self.black_key_width, self.black_key_height, radius=4,
-                        fill="black", outline="black", tags=("key", f"key_{midi_note}")
-                    )
-                    self.keys[midi_note] = rect
-                    
-                    data = self.note_data.get(midi_note, {})
-                    default_color = data.get('color') or "black"
-                    label_text = data.get('label', "")
-                    
-                    text_color = self._get_contrasting_text_color(default_color)
-                    
-                    self.key_rects[rect] = {'note': midi_note, 'type': 'black', 'default_color': default_color}
-                    self.canvas.itemconfig(rect, fill=default_color)
-                    
-                    self.canvas.create_text(
-                        bx + self.black_key_width/2, self.black_key_height - 40,
-                        text=label_text, tags=("label", f"label_{midi_note}"), 
-                        fill=text_color, font=("Arial", 11), width=self.black_key_width - 4, justify="center"
-                    )
-                
-                x += self.white_key_width
+            # Sound Assignment Label (Bottom)
+            label = self.canvas.create_text(
+                lx, ly,
+                text=label_text, tags=("label",), 
+                font=("Arial", 11), fill=text_color, width=lwidth, justify="center"
+            )
+            items = (rect, label, oct_item)
+            self._key_items.append(items)
+            self._key_types[rect] = key_type
+            self._shown[rect] = look
+            self._bind_note(midi_note, items)
+
+    def _bind_note(self, note, items):
+        self.keys[note] = items[0]
+        self._note_items[note] = items
+        for item in items:
+            if item is not None:
+                self._item_notes[item] = note
+
+    def _retarget(self):
+        """Points the existing key items at the notes of the new start octave.
+
+        Only keys that look different there (label, color, pressed) are reconfigured,
+        plus the octave names.
+        """
+        self.keys = {}
+        self._note_items = {}
+        self._item_notes = {}
+        base_note = self.start_octave * 12
+        for items, (offset, *_) in zip(self._key_items, key_geometry(*self._drawn_size, self.num_octaves)):
+            note = base_note + offset
+            self._bind_note(note, items)
+            if items[2] is not None:
+                self.canvas.itemconfig(items[2], text=f"C{note // 12}")
+            self._paint_key(note)
+
+    def _layout(self, size):
+        """Moves and scales the existing canvas items to size."""
+        self._set_size(size)
+        geometry = key_geometry(*size, self.num_octaves)
+        for (rect, label, oct_item), (_, _, points, (lx, ly, lwidth), oct_label) in zip(self._key_items, geometry):
+            self.canvas.coords(rect, *points)
+            self.canvas.coords(label, lx, ly)
+            self.canvas.itemconfig(label, width=lwidth)
+            if oct_item is not None:
+                self.canvas.coords(oct_item, *oct_label)
+
+    def _key_look(self, note, key_type):
+        """(fill, label text, text color) of a key, from the model."""
+        # If there is no custom color, black/white based on type
+        default_color = self.model.color(note) or key_type
+        # If pressed, use highlight color (blue)
+        fill = HIGHLIGHT_COLOR if self.model.is_pressed(note) else default_color
+        # Label color for contrast
+        return fill, self.model.label(note), self._get_contrasting_text_color(default_color)
+
+    def _paint_key(self, note):
+        """Reconfigures whatever changed in how a shown key looks."""
+        rect, label, oct_item = self._note_items[note]
+        look = self._key_look(note, self._key_types[rect])
+        shown = self._shown[rect]
+        if look == shown:
+            return
+        fill, text, text_color = look
+        if fill != shown[0]:
+            self.canvas.itemconfig(rect, fill=fill)
+        if text != shown[1]:
+            self.canvas.itemconfig(label, text=text)
+        if text_color != shown[2]:
+            self.canvas.itemconfig(label, fill=text_color)
+            if oct_item is not None:
+                self.canvas.itemconfig(oct_item, fill=text_color)
+        self._shown[rect] = look
 
     def set_key_color(self, note, color):
         """Sets the permanent color of a key (overrides default white/black)."""
-        # Store in persistent data
-        if note not in self.note_data: self.note_data[note] = {}
-        self.note_data[note]['color'] = color
-        
-        if note in self.keys:
-            rect = self.keys[note]
-            # If color is None, revert to black/white based on type
-            if color is None:
-                color = "white" if self.key_rects[rect]['type'] == 'white' else "black"
-            
-            self.key_rects[rect]['default_color'] = color
-            self.canvas.itemconfig(rect, fill=color)
-            
-            # Update label color for contrast
-            text_color = self._get_contrasting_text_color(color)
-            self.canvas.itemconfig(f"label_{note}", fill=text_color)
-            self.canvas.itemconfig(f"oct_label_{note}", fill=text_color)
+        self.model.update(colors={note: color})
 
     def set_key_label(self, note, text):
         """Sets the permanent label of a key."""
-        if note not in self.note_data: self.note_data[note] = {}
-        self.note_data[note]['label'] = text
-        
-        if note in self.keys:
-            self.canvas.itemconfig(f"label_{note}", text=text)
+        self.model.update(labels={note: text})
 
     def highlight_key(self, note, on=True):
-        if note in self.keys:
-            rect = self.keys[note]
-            info = self.key_rects[rect]
-            # If on, use highlight color (blue). If off, use stored default_color (which might be custom)
-            color = "#3498db" if on else info['default_color']
-            self.canvas.itemconfig(rect, fill=color)
-            self.update_idletasks()
+        self.model.update(pressed={note: on}) # Every keyboard showing it repaints it now (use UiPump to batch)
 
     def _get_note_from_event(self, event):
         item = self.canvas.find_closest(event.x, event.y)
         if not item: return None
-        item_id = item[0]
-        
-        # Try direct lookup first (if clicked on rect)
-        if item_id in self.key_rects:
-             return self.key_rects[item_id]['note']
-             
-        # Try parsing tags (if clicked on label)
-        tags = self.canvas.gettags(item_id)
-        for tag in tags:
-            # Tag format: key_60, label_60, oct_label_60
-            if "_" in tag:
-                try:
-                    # Split from right to handle potential underscores in prefix? 
-                    # Prefixes are fixed: key, label, oct_label.
-                    # Just split by last underscore
-                    start, note_str = tag.rsplit("_", 1)
-                    if start in ["key", "label", "oct_label"]:
-                        return int(note_str)
-                except ValueError:
-                    pass
-        return None
+        # Key rect or one of its labels
+        return self._item_notes.get(item[0])
 
     def _on_click(self, event):
         note = self._get_note_from_event(event)
@@ -0,0 +1,73 @@
+import logging
+
+# Kinds of actions a MIDI id can be bound to
+ACTION_HOTKEY = "hotkey" # payload: action name ("play_pause", "stop", ...)
+ACTION_MACRO = "macro"   # payload: keyboard shortcut string
+ACTION_SOUND = "sound"   # payload: mapping dict from config["mappings"]
+
+NOTE_COUNT = 128
+
+
+class NoteDispatchTable:
+    """Precompiled MIDI id -> action lookup built from ConfigManager.
+
+    Piano notes (ints 0-127) resolve through a flat 128-slot list, and the string ids
+    produced by MidiManager (CC_x, SYS_x, MMC_x) through a dict, so every incoming event
+    is resolved in O(1) without walking the config or converting notes to strings.
+    The table rebuilds itself whenever the configuration is loaded or saved.
+    """
+
+    def __init__(self, config_manager):
+        self.logger = logging.getLogger(__name__)
+        self.config_manager = config_manager
+        self.notes = [None] * NOTE_COUNT
+        self.named = {}
+        self.rebuild()
+        config_manager.add_change_listener(self.rebuild)
+
+    @staticmethod
+    def _normalize_id(midi_id):
+        """Config keys are strings ("60", "CC_7"), hotkeys may be ints. Map both to the MidiManager form."""
+        if isinstance(midi_id, str) and midi_id.isdigit():
+            return int(midi_id)
+        return midi_id
+
+    def rebuild(self):
+        """Recompiles the table from the current configuration."""
+        notes = [None] * NOTE_COUNT
+        named = {}
+
+        def _put(midi_id, entry):
+            midi_id = self._normalize_id(midi_id)
+            if isinstance(midi_id, int):
+                if 0 <= midi_id < NOTE_COUNT and notes[midi_id] is None:
+                    notes[midi_id] = entry
+            elif midi_id not in named:
+                named[midi_id] = entry
+
+        # Registration order defines precedence: hotkeys, then macros, then sounds
+        for action, midi_id in self.config_manager.get_global_hotkeys().items():
+            _put(midi_id, (ACTION_HOTKEY, action))
+
+        for midi_id, shortcut in self.config_manager.get_custom_macros().items():
+            _put(midi_id, (ACTION_MACRO, shortcut))
+
+        for midi_id, mapping in self.config_manager.config.get("mappings", {}).items():
+            # Label/color-only keys use sound_index -1 and have nothing to play
+            sound_index = mapping.get('sound_index')
+            if sound_index is None or sound_index < 0:
+                continue
+            _put(midi_id, (ACTION_SOUND, mapping))
+
+        # Swap in one go so the MIDI thread never sees a half-built table
+        self.notes = notes
+        self.named = named
+        self.logger.debug(f"Dispatch table rebuilt ({sum(e is not None for e in notes)} notes, {len(named)} named ids)")
+
+    def lookup(self, midi_id):
+        """Returns (action_kind, payload) for a MIDI id, or None if it is unbound."""
+        if type(midi_id) is int:
+            if 0 <= midi_id < NOTE_COUNT:
+                return self.notes[midi_id]
+            return None
+        return self.named.get(midi_id)
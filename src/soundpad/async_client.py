@@ -0,0 +1,283 @@
+import asyncio
+import collections
+import logging
+import re
+import xml.etree.ElementTree as ET
+from soundpad_control.remote_control import PlayStatus
+from src.soundpad.client import parse_sound_list
+
+PIPE_NAME = "sp_remote_control"
+
+STATUS_MAPPING = {
+    "PAUSED": PlayStatus.PAUSED,
+    "STOPPED": PlayStatus.STOPPED,
+    "PLAYING": PlayStatus.PLAYING,
+    "SEEKING": PlayStatus.SEEKING,
+}
+
+_XML_ROOT_RE = re.compile(rb"\s*(?:<\?xml[^>]*\?>\s*)?<([A-Za-z_][\w.-]*)")
+
+
+def _message_complete(data):
+    """Soundpad answers every request with one pipe message. Short answers fit in a single
+    read, XML answers (sound list, categories) can span several reads, so we wait for
+    their root element to close."""
+    match = _XML_ROOT_RE.match(data)
+    if not match:
+        return True
+    tail = data.rstrip()
+    tag = match.group(1)
+    if tail.endswith(b"</" + tag + b">"):
+        return True
+    # Self-closing root, e.g. <Soundlist/>
+    return tail.endswith(b"/>") and data.count(b"<") - data.count(b"<?") == 1
+
+
+class _PipeProtocol(asyncio.Protocol):
+    def __init__(self):
+        self.messages = asyncio.Queue()
+        self.transport = None
+        self._buffer = bytearray()
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        self._buffer += data
+        if _message_complete(self._buffer):
+            self.messages.put_nowait(bytes(self._buffer))
+            self._buffer.clear()
+
+    def connection_lost(self, exc):
+        self.messages.put_nowait(None)
+
+
+class PipeChannel:
+    """Message channel over Soundpad's named pipe (Windows proactor event loop only).
+
+    asyncio reads the pipe as a byte stream, so two short replies can arrive in one
+    read ("R-200R-200") and can't be told apart: requests are not pipelined on it.
+    """
+
+    framed = False # Replies are not delimited, one request in flight at a time
+
+    def __init__(self, transport, protocol):
+        self._transport = transport
+        self._protocol = protocol
+
+    @classmethod
+    async def open(cls, pipe_name=PIPE_NAME):
+        loop = asyncio.get_running_loop()
+        if not hasattr(loop, "create_pipe_connection"):
+            raise ConnectionError("Named pipes require the Windows proactor event loop")
+        transport, protocol = await loop.create_pipe_connection(_PipeProtocol, r'\\.\pipe\{}'.format(pipe_name))
+        return cls(transport, protocol)
+
+    def write(self, data):
+        self._transport.write(data)
+
+    async def read(self):
+        """Returns the next whole response message, or None when the pipe is closed."""
+        return await self._protocol.messages.get()
+
+    def close(self):
+        self._transport.close()
+
+
+class AsyncSoundpadClient:
+    """asyncio variant of SoundpadClient.
+
+    Requests are pipelined on a single connection: they are written back to back (up to
+    max_in_flight outstanding) and matched to responses in FIFO order by one reader task,
+    so many triggers can be serviced concurrently without a thread per command. Only
+    channels with framed = True (one read, one reply) are pipelined; others get one
+    request in flight.
+    Every call accepts a timeout. A timed out request closes the connection (its reply
+    may come late or never, so later ones could not be matched any more) and fails the
+    requests still in flight; connect() opens a new one.
+    """
+
+    def __init__(self, channel_factory=None, max_in_flight=8, timeout=2.0):
+        self.logger = logging.getLogger(__name__)
+        self.channel_factory = channel_factory or PipeChannel.open
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.connected = False
+        self.current_sound_index = 1
+        self.max_sound_index = 0
+
+        self._channel = None
+        self._reader_task = None
+        self._waiters = collections.deque() # Futures in request order
+        self._slots = None
+
+    async def connect(self):
+        """Opens the connection and checks that Soundpad responds."""
+        await self.close()
+        try:
+            self._channel = await self.channel_factory()
+        except Exception as e:
+            self.logger.warning(f"Soundpad is not running or not reachable: {e}")
+            return False
+
+        in_flight = self.max_in_flight if getattr(self._channel, "framed", False) else 1
+        self._slots = asyncio.Semaphore(in_flight)
+        self._reader_task = asyncio.ensure_future(self._read_loop(self._channel))
+        self.connected = True
+        try:
+            alive = await self.is_alive()
+        except Exception as e:
+            self.logger.error(f"Error connecting to Soundpad: {e}")
+            alive = False
+        if not alive:
+            await self.close()
+            self.logger.warning("Soundpad is not running or not reachable.")
+            return False
+        self.logger.info("Connected to Soundpad (async).")
+        return True
+
+    async def close(self):
+        self.connected = False
+        if self._channel:
+            self._channel.close()
+            self._channel = None
+        if self._reader_task:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._reader_task = None
+        self._fail_pending(ConnectionError("Soundpad connection closed"))
+
+    async def _read_loop(self, channel):
+        try:
+            while True:
+                message = await channel.read()
+                if message is None:
+                    break
+                if not self._waiters:
+                    self.logger.warning("Dropping unexpected Soundpad response")
+                    continue
+                waiter = self._waiters.popleft()
+                self._slots.release()
+                if not waiter.done():
+                    waiter.set_result(message.decode("utf-8", errors="replace"))
+        finally:
+            self.connected = False
+            self._fail_pending(ConnectionError("Soundpad closed the connection"))
+
+    def _fail_pending(self, exc):
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if self._slots:
+                self._slots.release()
+            if not waiter.done():
+                waiter.set_exception(exc)
+
+    async def request(self, command, timeout=None):
+        """Sends a raw remote-control command and returns the raw response text."""
+        if not self.connected or self._channel is None:
+            raise ConnectionError("Not connected to Soundpad")
+        timeout = self.timeout if timeout is None else timeout
+
+        slots = self._slots
+        await asyncio.wait_for(slots.acquire(), timeout)
+        if not self.connected or slots is not self._slots:
+            slots.release() # Woken up by _fail_pending()
+            raise ConnectionError("Soundpad connection closed")
+        waiter = asyncio.get_running_loop().create_future()
+        # Append and write without awaiting in between to keep FIFO order
+        self._waiters.append(waiter)
+        self._channel.write(command.encode())
+        try:
+            return await asyncio.wait_for(asyncio.shield(waiter), timeout)
+        except asyncio.TimeoutError:
+            waiter.cancel()
+            if self.connected:
+                self.logger.warning(f"Soundpad did not answer {command} in {timeout}s, closing the connection")
+                await self.close()
+            raise
+
+    async def _do(self, command, timeout=None):
+        """Runs an action command. Returns True on R-200, False on any error."""
+        try:
+            response = await self.request(command, timeout)
+        except Exception as e:
+            self.logger.error(f"Soundpad command {command} failed: {e}")
+            return False
+        return response.startswith("R-200")
+
+    async def is_alive(self, timeout=None):
+        return (await self.request("IsAlive()", timeout)).startswith("R-200")
+
+    async def play_sound(self, index, speakers=True, mic=True, timeout=None):
+        """Plays a sound by its index."""
+        return await self._do(f"DoPlaySound({index},{speakers},{mic})", timeout)
+
+    async def select_sound(self, index, timeout=None):
+        """Selects a sound in the Soundpad UI by its index."""
+        return await self._do(f"DoSelectIndex({index})", timeout)
+
+    async def stop_playback(self, timeout=None):
+        return await self._do("DoStopSound()", timeout)
+
+    async def toggle_pause(self, timeout=None):
+        return await self._do("DoTogglePause()", timeout)
+
+    async def get_playback_status(self, timeout=None):
+        """Returns the current PlayStatus, or None on error."""
+        try:
+            response = await self.request("GetPlayStatus()", timeout)
+        except Exception as e:
+            self.logger.error(f"Error getting playback status: {e}")
+            return None
+        return STATUS_MAPPING.get(response.strip(), PlayStatus.STOPPED)
+
+    async def play_pause_selected(self, timeout=None):
+        """Smartly plays the selected sound if stopped, or toggles pause if playing."""
+        status = await self.get_playback_status(timeout)
+        if status is None:
+            return False
+        if status == PlayStatus.STOPPED:
+            return await self._do("DoPlaySelectedSound()", timeout)
+        return await self._do("DoTogglePause()", timeout)
+
+    async def select_next(self, timeout=None):
+        """Selects the next sound in the list without playing it using internal index."""
+        if self.max_sound_index == 0:
+            return False
+        if self.current_sound_index < self.max_sound_index:
+            self.current_sound_index += 1
+        return await self._do(f"DoSelectIndex({self.current_sound_index})", timeout)
+
+    async def select_previous(self, timeout=None):
+        """Selects the previous sound in the list without playing it using internal index."""
+        if self.max_sound_index == 0:
+            return False
+        if self.current_sound_index > 1:
+            self.current_sound_index -= 1
+        return await self._do(f"DoSelectIndex({self.current_sound_index})", timeout)
+
+    async def select_next_category(self, timeout=None):
+        return await self._do("DoSelectNextCategory()", timeout)
+
+    async def select_previous_category(self, timeout=None):
+        return await self._do("DoSelectPreviousCategory()", timeout)
+
+    async def get_sound_list(self, timeout=None):
+        """Retrieves and parses the sound list from Soundpad."""
+        try:
+            response = await self.request("GetSoundlist()", timeout)
+        except Exception as e:
+            self.logger.error(f"Error getting sound list: {e}")
+            return []
+        if not response or response.startswith("R"):
+            return []
+        try:
+            sounds = parse_sound_list(response)
+        except ET.ParseError as e:
+            self.logger.error(f"Failed to parse Soundpad XML: {e}")
+            return []
+        self.max_sound_index = len(sounds)
+        return sounds
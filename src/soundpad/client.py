@@ -1,14 +1,65 @@
-
 import logging
 import xml.etree.ElementTree as ET
 from soundpad_control import SoundpadRemoteControl
 from soundpad_control.remote_control import PlayStatus
 
-class SoundpadClient:
+# Soundpad's pipe is message based: a read returns a whole reply only if it fits in the
+# buffer (small reads truncated big responses), so keep it large enough for any reply
+RESPONSE_CHUNK_SIZE = 1024 * 1024 * 10 # 10MB
+# The sound list is fed to the parser in pieces of this size
+SOUND_LIST_CHUNK_SIZE = 256 * 1024
+# Windows error of a message-mode pipe read with a buffer smaller than the message
+ERROR_MORE_DATA = 234
+
+class SoundListStreamParser:
+    """Incremental parser for the GetSoundlist() response.
+
+    Feed raw chunks as they arrive and get compact {'index', 'title'} records back.
+    Each <Sound> element is dropped right after it is read, so peak memory doesn't
+    grow with the size of the library.
+    """
+
     def __init__(self):
-        self.remote = SoundpadRemoteControl()
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._stack = []
+        self.done = False # True once the root element is closed
+
+    def feed(self, data):
+        self._parser.feed(data)
+        sounds = []
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                self._stack.append(elem)
+                continue
+
+            self._stack.pop()
+            if not self._stack:
+                self.done = True
+            elif len(self._stack) == 1 and elem.tag == 'Sound':
+                # Attributes might vary, usually 'index' and 'title'
+                idx = elem.get('index')
+                title = elem.get('title')
+                if idx and title:
+                    sounds.append({'index': int(idx), 'title': title})
+                self._stack[0].remove(elem)
+        return sounds
+
+    def close(self):
+        self._parser.close()
+
+def parse_sound_list(xml_text):
+    """Parses a whole GetSoundlist() response into [{'index': int, 'title': str}, ...]."""
+    parser = SoundListStreamParser()
+    sounds = parser.feed(xml_text)
+    parser.close()
+    return sounds
+
+class SoundpadClient:
+    def __init__(self, remote=None):
+        # remote can be swapped, e.g. SocketRemoteControl for the fake server
+        self.remote = remote or SoundpadRemoteControl()
         # FIX: Increase chunk size to handle large XML responses (default 1024 is too small)
-        self.remote.chuck_size = 1024 * 1024 * 10 # 10MB
+        self.remote.chuck_size = RESPONSE_CHUNK_SIZE
         self.connected = False
         self.current_sound_index = 1
         self.max_sound_index = 0
@@ -31,6 +82,71 @@ class SoundpadClient:
             self.connected = False
             return False
 
+    def is_alive(self):
+        """Heartbeat: True if Soundpad answers right now. Keeps `connected` up to date."""
+        try:
+            alive = self.remote.is_alive()
+        except Exception as e:
+            self.logger.debug(f"Heartbeat error: {e}")
+            alive = False
+        self.connected = alive
+        return alive
+
+    def pipe_open(self):
+        """False after a failed request: soundpad_control closes the pipe on any error."""
+        return self.remote.pipe is not None
+
+    def _iter_response_chunks(self, request, chunk_size):
+        """Sends a raw request and yields its response in pieces."""
+        if hasattr(self.remote, 'iter_response_chunks'):
+            yield from self.remote.iter_response_chunks(request, chunk_size)
+            return
+
+        # Same steps as SoundpadRemoteControl._send_request. Each read takes one whole
+        # message (chuck_size), only parsing is done in chunk_size pieces; a reply that
+        # fills the buffer continues in the next read
+        self.remote._init_connection()
+        pipe = self.remote.pipe
+        pipe.write(request.encode())
+        pipe.seek(0)
+        while True:
+            try:
+                data = pipe.read(self.remote.chuck_size)
+            except OSError as e:
+                if getattr(e, 'winerror', None) != ERROR_MORE_DATA:
+                    raise
+                # The rest of the message is still in the pipe, it can't be read as a reply
+                self.remote._close_connection()
+                raise ConnectionError(f"Soundpad response larger than {self.remote.chuck_size} bytes") from e
+            pipe.seek(0)
+            if not data:
+                raise ConnectionError("Soundpad closed the pipe")
+            for start in range(0, len(data), chunk_size):
+                yield data[start:start + chunk_size]
+
+    def iter_sound_list(self, chunk_size=SOUND_LIST_CHUNK_SIZE):
+        """Streams the sound list, yielding {'index', 'title'} records as soon as they are parsed.
+        Raises on pipe or XML errors; the connection must be reset afterwards (see get_sound_list)."""
+        # Expected format: <Soundlist><Sound index="1" title="Sound1" ... /></Soundlist>
+        parser = SoundListStreamParser()
+        count = 0
+        first = True
+        for chunk in self._iter_response_chunks("GetSoundlist()", chunk_size):
+            if first:
+                first = False
+                head = chunk.lstrip()
+                if not head.startswith(b"<"):
+                    # R-xxx error or empty list
+                    if head.startswith(b"R") and not head.startswith(b"R-200"):
+                        self.logger.warning(f"Soundpad refused the sound list: {head[:100]}")
+                    break
+            for sound in parser.feed(chunk):
+                count += 1
+                yield sound
+            if parser.done:
+                break
+        self.max_sound_index = count
+
     def get_sound_list(self):
         """Retrieves and parses the sound list from Soundpad."""
         if not self.connected:
@@ -38,46 +154,14 @@ class SoundpadClient:
                 return []
 
         try:
-            # Based on API, get_sound_list likely returns XML string or response object
-            response = self.remote.get_sound_list()
-            
-            # If response is None or empty
-            if not response:
-                return []
-
-            # If it's bytes, decode
-            if isinstance(response, bytes):
-                response = response.decode('utf-8')
-
-            # Parse XML
-            # Expected format: <Soundlist><Sound index="1" title="Sound1" ... /></Soundlist>
-            # OR <Soundlist><Sound id="1" title="..." .../></Soundlist>
-            
-            # Check if response is already a list (if lib parses it)
-            if isinstance(response, list):
-                self.max_sound_index = len(response)
-                return response
-
-            root = ET.fromstring(response)
-            sounds = []
-            for sound in root.findall('Sound'):
-                # Attributes might vary, usually 'index' and 'title'
-                idx = sound.get('index')
-                title = sound.get('title')
-                if idx and title:
-                    sounds.append({'index': int(idx), 'title': title})
-            
-            self.max_sound_index = len(sounds)
-            return sounds
-
+            return list(self.iter_sound_list())
         except ET.ParseError as e:
             self.logger.error(f"Failed to parse Soundpad XML: {e}")
-            # Try to log raw response for debug
-            self.logger.debug(f"Raw response: {response}")
-            return []
         except Exception as e:
             self.logger.error(f"Error getting sound list: {e}")
-            return []
+        # Unread data would be taken as the answer to the next command
+        self.remote._close_connection()
+        return []
 
     def play_sound(self, index, speakers=True, mic=True):
         """Plays a sound by its index."""
@@ -101,11 +185,8 @@ class SoundpadClient:
             return
             
         try:
-            if hasattr(self.remote, 'select_sound'):
-                self.remote.select_sound(index)
-            else:
-                 # Fallback if library differs
-                 self.remote.DoSelectSound(index)
+            # soundpad_control names it select_row (DoSelectIndex)
+            self.remote.select_row(index)
         except Exception as e:
             self.logger.error(f"Error selecting sound {index}: {e}")
 
@@ -146,6 +227,25 @@ class SoundpadClient:
         except Exception as e:
             self.logger.error(f"Error toggling pause: {e}")
 
+    def play_selected_sound(self):
+        """Plays the sound currently selected in Soundpad."""
+        if not self.connected:
+            return
+        try:
+            self.remote.play_selected_sound()
+        except Exception as e:
+            self.logger.error(f"Error playing selected sound: {e}")
+
+    def get_play_status(self):
+        """Returns the PlayStatus enum, or None if Soundpad can't be asked."""
+        if not self.connected:
+            return None
+        try:
+            return self.remote.get_play_status()
+        except Exception as e:
+            self.logger.error(f"Error getting play status: {e}")
+            return None
+
     def play_pause_selected(self):
         """Smartly plays the selected sound if stopped, or toggles pause if playing."""
         if not self.connected:
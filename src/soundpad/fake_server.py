@@ -0,0 +1,208 @@
+import logging
+import random
+import re
+import socket
+import socketserver
+import threading
+import time
+from xml.sax.saxutils import quoteattr
+from src.soundpad.socket_transport import DEFAULT_HOST, send_frame, recv_frame
+
+_COMMAND_RE = re.compile(r"^\s*(\w+)\((.*)\)\s*$", re.S)
+
+
+class FakeSoundpadServer:
+    """Local stand-in for Soundpad's remote control, for benchmarks on any OS.
+
+    Speaks the same request/response protocol as the sp_remote_control pipe
+    (DoPlaySound(...) -> R-200, GetSoundlist() -> XML, ...) over a local socket
+    with length-prefixed frames (see socket_transport). Options:
+        sound_count  -- size of the generated sound list
+        latency_ms   -- delay before every response (plus up to jitter_ms)
+        fail_rate    -- probability of answering with an R-500 error
+        drop_rate    -- probability of closing the connection without answering
+    """
+
+    def __init__(self, port=0, host=DEFAULT_HOST, sound_count=100, latency_ms=0.0, jitter_ms=0.0,
+                 fail_rate=0.0, drop_rate=0.0, seed=None):
+        self.logger = logging.getLogger(__name__)
+        self.sound_count = sound_count
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.fail_rate = fail_rate
+        self.drop_rate = drop_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        # Emulated player state
+        self.play_status = "STOPPED"
+        self.selected_index = 1
+        self.category_index = 0
+        self.playing_index = None
+        self.request_log = [] # (time.perf_counter(), command) for every received request
+        self._sound_list_xml = None
+        self._connections = set()
+
+        server = self
+
+        class _Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                server._serve_connection(self.request)
+
+        self._server = socketserver.ThreadingTCPServer((host, port), _Handler, bind_and_activate=False)
+        self._server.daemon_threads = True
+        self._server.allow_reuse_address = True
+        self._server.server_bind()
+        self._server.server_activate()
+        self._thread = None
+
+    @property
+    def address(self):
+        return self._server.server_address
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="FakeSoundpad", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Fake Soundpad listening on {self.address[0]}:{self.port} ({self.sound_count} sounds)")
+        return self
+
+    def stop(self):
+        """Stops listening and drops open connections, like Soundpad being closed."""
+        self._server.shutdown()
+        self._server.server_close()
+        with self._lock:
+            connections = list(self._connections)
+        for sock in connections:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def set_sound_count(self, count):
+        with self._lock:
+            self.sound_count = count
+            self._sound_list_xml = None
+
+    def _serve_connection(self, sock):
+        with self._lock:
+            self._connections.add(sock)
+        try:
+            self._serve_requests(sock)
+        finally:
+            with self._lock:
+                self._connections.discard(sock)
+
+    def _serve_requests(self, sock):
+        while True:
+            try:
+                request = recv_frame(sock).decode()
+            except (ConnectionError, OSError):
+                return
+            with self._lock:
+                self.request_log.append((time.perf_counter(), request))
+
+            delay = self.latency_ms + (self._random.uniform(0, self.jitter_ms) if self.jitter_ms else 0)
+            if delay > 0:
+                time.sleep(delay / 1000)
+
+            if self.drop_rate and self._random.random() < self.drop_rate:
+                return # Connection closes without a response, like a crashed Soundpad
+            if self.fail_rate and self._random.random() < self.fail_rate:
+                response = "R-500 Injected failure"
+            else:
+                response = self.handle_request(request)
+
+            try:
+                send_frame(sock, response.encode())
+            except OSError:
+                return
+
+    def handle_request(self, request):
+        """Returns the response text for one remote-control request."""
+        match = _COMMAND_RE.match(request)
+        if not match:
+            return "R-400 Bad request"
+        name, raw_args = match.groups()
+        args = [a.strip() for a in raw_args.split(",")] if raw_args.strip() else []
+
+        with self._lock:
+            if name == "IsAlive":
+                return "R-200"
+            if name == "GetVersion":
+                return "fake"
+            if name == "GetSoundFileCount":
+                return str(self.sound_count)
+            if name == "GetSoundlist":
+                return self._get_sound_list_xml(args)
+            if name == "GetPlayStatus":
+                return self.play_status
+            if name == "DoPlaySound":
+                index = self._int_arg(args, 0)
+                if index is None or not 1 <= index <= self.sound_count:
+                    return "R-404 Sound not found"
+                self.playing_index = index
+                self.play_status = "PLAYING"
+                return "R-200"
+            if name == "DoPlaySelectedSound":
+                self.playing_index = self.selected_index
+                self.play_status = "PLAYING"
+                return "R-200"
+            if name == "DoStopSound":
+                self.playing_index = None
+                self.play_status = "STOPPED"
+                return "R-200"
+            if name == "DoTogglePause":
+                if self.play_status == "PLAYING":
+                    self.play_status = "PAUSED"
+                elif self.play_status == "PAUSED":
+                    self.play_status = "PLAYING"
+                return "R-200"
+            if name == "DoSelectIndex":
+                index = self._int_arg(args, 0)
+                if index is None or not 1 <= index <= self.sound_count:
+                    return "R-404 Sound not found"
+                self.selected_index = index
+                return "R-200"
+            if name == "DoSelectNextCategory":
+                self.category_index += 1
+                return "R-200"
+            if name == "DoSelectPreviousCategory":
+                self.category_index = max(0, self.category_index - 1)
+                return "R-200"
+        return "R-501 Not implemented"
+
+    @staticmethod
+    def _int_arg(args, pos):
+        try:
+            return int(args[pos])
+        except (IndexError, ValueError):
+            return None
+
+    def _get_sound_list_xml(self, args):
+        first = self._int_arg(args, 0) or 1
+        last = self._int_arg(args, 1) or self.sound_count
+        if first == 1 and last == self.sound_count:
+            # Cache the full list, it is requested far more often than ranges
+            if self._sound_list_xml is None:
+                self._sound_list_xml = self._build_sound_list(1, self.sound_count)
+            return self._sound_list_xml
+        return self._build_sound_list(first, min(last, self.sound_count))
+
+    def _build_sound_list(self, first, last):
+        parts = ['<?xml version="1.0" encoding="UTF-8"?>', "<Soundlist>"]
+        for i in range(first, last + 1):
+            title = quoteattr(f"Sound {i}")
+            url = quoteattr(f"C:\\Sounds\\sound_{i}.mp3")
+            parts.append(f'<Sound index="{i}" url={url} artist="" title={title} duration="0:03" addedOn="2024-01-01" lastPlayedOn="" playCount="0"/>')
+        parts.append("</Soundlist>")
+        return "".join(parts)
@@ -0,0 +1,78 @@
+import logging
+import os
+import pickle
+from src.soundpad.parser import SoundRecord, make_category
+
+# Bump whenever the parsed structure or the layout below changes
+CACHE_VERSION = 2
+
+CACHE_FILE_NAME = "library_cache.bin"
+
+
+class LibraryCache:
+    """Parsed soundlist cache, so an unchanged .spl is loaded without XML parsing.
+
+    The file holds two pickles: a small header (format version + source path, size and
+    mtime) checked before anything else is read, then the library itself as columns of
+    sound fields and a tree of categories with their integer references.
+    """
+
+    def __init__(self, cache_file):
+        self.logger = logging.getLogger(__name__)
+        self.cache_file = cache_file
+
+    @staticmethod
+    def file_key(source_path):
+        """Identity of the source file as it is now, or None if it can't be read."""
+        try:
+            st = os.stat(source_path)
+        except OSError:
+            return None
+        return (os.path.normcase(os.path.abspath(source_path)), st.st_size, st.st_mtime_ns)
+
+    def load(self, key):
+        """Returns the cached categories for key, or None on a miss."""
+        if key is None or not os.path.exists(self.cache_file):
+            return None
+        try:
+            with open(self.cache_file, 'rb') as f:
+                header = pickle.load(f)
+                if header != (CACHE_VERSION, key):
+                    return None
+                titles, urls, api_indexes, indexes, tree = pickle.load(f)
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable library cache {self.cache_file}: {e}")
+            return None
+
+        records = [SoundRecord(*fields) for fields in zip(titles, urls, api_indexes, indexes)]
+
+        def _build(nodes):
+            return [make_category(name, path, records, refs, _build(children))
+                    for name, path, refs, children in nodes]
+
+        return _build(tree)
+
+    def store(self, key, categories):
+        """Writes categories (as returned by SoundpadParser.parse_file) for key."""
+        if key is None or not categories:
+            return
+        records = categories[0]['records']
+
+        def _flatten(cats):
+            return [(c['name'], c['path'], c['sounds'], _flatten(c['subcategories'])) for c in cats]
+
+        body = (
+            [s.title for s in records],
+            [s.url for s in records],
+            [s.api_index for s in records],
+            [s.index for s in records],
+            _flatten(categories),
+        )
+        tmp_file = self.cache_file + ".tmp"
+        try:
+            with open(tmp_file, 'wb') as f:
+                pickle.dump((CACHE_VERSION, key), f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(body, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, self.cache_file)
+        except Exception as e:
+            self.logger.warning(f"Could not write library cache {self.cache_file}: {e}")
@@ -0,0 +1,93 @@
+import logging
+import os
+import threading
+from src.soundpad.library_cache import LibraryCache
+from src.soundpad.parser import walk_categories
+
+
+def _content(category):
+    records = category['records']
+    return [(s.title, s.url, s.api_index) for s in (records[i] for i in category['sounds'])]
+
+
+def diff_library(old, new):
+    """Compares two parsed category trees.
+
+    Returns (changed_paths, same_shape): the paths whose sounds differ (including
+    added/removed categories) and whether both trees have the same categories in the
+    same order, i.e. whether the rendered category tree can stay as it is.
+    """
+    old_cats = list(walk_categories(old))
+    new_cats = list(walk_categories(new))
+    same_shape = [(c['path'], c['name']) for c in old_cats] == [(c['path'], c['name']) for c in new_cats]
+
+    old_by_path = {c['path']: c for c in old_cats}
+    new_by_path = {c['path']: c for c in new_cats}
+    changed = set(old_by_path.keys() ^ new_by_path.keys())
+    for path, cat in new_by_path.items():
+        prev = old_by_path.get(path)
+        if prev is not None and _content(prev) != _content(cat):
+            changed.add(path)
+    return changed, same_shape
+
+
+class SoundlistWatcher:
+    """Polls the stat of the library file and reports when it changed.
+
+    A change is reported once the file has stayed the same for one more poll, so a
+    save in progress is not picked up half-written. on_change(path, key) is called from
+    the watcher thread; key is LibraryCache.file_key(path).
+    """
+
+    def __init__(self, on_change, poll_interval=1.0):
+        self.logger = logging.getLogger(__name__)
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.path = None
+        self.key = None # Last key reported (or given to watch())
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._running = False
+        self._thread = None
+
+    def watch(self, path, key=None):
+        """Starts watching path. key is its state as already loaded, if known."""
+        with self._lock:
+            self.path = os.path.abspath(path) if path else None
+            self.key = key if key is not None else LibraryCache.file_key(path) if path else None
+        if not self._running:
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="SoundlistWatcher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._wakeup.set()
+
+    def _run(self):
+        pending = None # Key seen changed on the previous poll
+        while self._running:
+            self._wakeup.wait(self.poll_interval)
+            if not self._running:
+                break
+            with self._lock:
+                path, known = self.path, self.key
+            if path is None:
+                continue
+            key = LibraryCache.file_key(path)
+            if key is None or key == known:
+                pending = None
+                continue
+            if key != pending:
+                pending = key # Wait for it to settle
+                continue
+            pending = None
+            with self._lock:
+                if path != self.path: # watch() switched files meanwhile
+                    continue
+                self.key = key
+            self.logger.info(f"Library file changed: {path}")
+            try:
+                self.on_change(path, key)
+            except Exception as e:
+                self.logger.error(f"Error handling library change: {e}")
@@ -1,160 +1,225 @@
-
 import xml.etree.ElementTree as ET
+from array import array
 import logging
 import os
+import sys
+
+# Roles of the open elements while stream-parsing
+_ROOT = 0
+_WRAPPER = 1     # <Soundlist> inside a wrapper root
+_CATEGORIES = 2  # the <Categories> tag whose categories we use
+_CATEGORY = 3
+_OTHER = 4
+
+
+class SoundRecord:
+    """One library sound. Stored once, categories refer to it by position."""
+    __slots__ = ("title", "url", "api_index", "index")
+
+    def __init__(self, title, url=None, api_index=0, index=None):
+        self.title = title
+        self.url = url
+        self.api_index = api_index # 1-based Soundpad index
+        self.index = index         # explicit 'index' attribute of exported XMLs / API lists
+
+    def __repr__(self):
+        return f"SoundRecord({self.api_index}, {self.title!r})"
+
+
+def make_category(name, path, records, refs=None, subcategories=None):
+    """Category dict: 'sounds' are integer positions into the shared 'records' list."""
+    return {
+        'name': name,
+        'path': sys.intern(path),
+        'records': records,
+        'sounds': refs if refs is not None else range(len(records)),
+        'subcategories': subcategories if subcategories is not None else [],
+    }
+
+
+def category_sounds(category):
+    """The SoundRecords of a category, in order."""
+    records = category['records']
+    return [records[i] for i in category['sounds']]
+
+
+def walk_categories(categories):
+    """Categories in display (pre)order."""
+    pending = list(reversed(categories))
+    while pending:
+        cat = pending.pop()
+        yield cat
+        pending.extend(reversed(cat['subcategories']))
+
+
+def _position(key, count):
+    """0-based position a category reference points at, or -1."""
+    try:
+        pos = int(key)
+    except (TypeError, ValueError):
+        return -1
+    return pos if 0 <= pos < count and str(pos) == key else -1
+
 
 class SoundpadParser:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
 
-    def parse_file(self, file_path):
+    def parse_file(self, file_path, on_category=None):
         """
         Parses a Soundpad XML/SPL file.
         Returns a structure:
         [
-            {'name': 'Category Name', 'sounds': [{'title': 'Sound Title', 'url': 'Path', ...}, ...]},
+            {'name': 'Category Name', 'path': 'Parent / Category Name', 'sounds': <positions>,
+             'records': [SoundRecord, ...], 'subcategories': [...]},
             ...
         ]
+        All categories share one records list (see category_sounds). The file is read with
+        iterparse, so it is never loaded as a whole tree.
+
+        on_category(category) is called with each top level category as soon as its
+        element has been read: its name, path and subcategories are final, but its
+        'records' and 'sounds' are only filled in before parse_file returns.
         """
         if not os.path.exists(file_path):
             self.logger.error(f"File not found: {file_path}")
             return []
 
         try:
-            # .spl files are XML but with a different extension. 
-            # They might have encoding issues or binary headers?
-            # Usually strict XML parsers work if it's pure XML.
-            # If fail, try to read as text and clean up?
-            
-            tree = ET.parse(file_path)
-            root = tree.getroot()
-            
-            # Check root tag to determine format
-            # Standard soundlist.xml usually has <Soundlist> root and flat <Sound> list? 
-            # Or <Categories>? Let's try to handle both or generic probing.
-            
-            # Based on previous debug, get_sound_list returned <Soundlist><Sound .../></Soundlist> (flat).
-            # If exported file preserves categories, it might look different.
-            # If soundlist.xml is being read, it might have <Database> or similar.
-            
-            # Hypothesis from similar apps:
-            # <Soundpad>
-            #   <Soundlist>...</Soundlist>
-            #   <Categories>
-            #       <Category id="..." name="...">
-            #           <Sound idRef="..."/>
-            #       </Category>
-            #   </Categories>
-            # </Soundpad>
-            
-            categories = []
-            
-            # 1. Parse all "Sound" elements directly under root (Soundlist)
-            # They don't have IDs usually, they are referenced by position (index).
-            # API uses 1-based index. SPL 'id' attribute in categories uses 0-based index.
-            
-            all_sounds = {} # Map by 0-based index (int) -> Sound Data
-            
-            # Find direct Sound children of root
-            # root.findall("Sound") might work if root is Soundlist
-            sound_elements = root.findall("Sound")
-            
-            if not sound_elements:
-                 # Try finding Soundlist tag if root is NOT Soundlist (e.g. wrapper)
-                 sl = root.find("Soundlist")
-                 if sl:
-                     sound_elements = sl.findall("Sound")
-            
-            for idx, sound_elem in enumerate(sound_elements):
-                sound_data = sound_elem.attrib
-                # Ensure title exists
-                if 'title' not in sound_data or not sound_data['title']:
-                    # Fallback to basename of url
-                    url = sound_data.get('url', '')
-                    if url:
-                         sound_data['title'] = os.path.basename(url)
-                    else:
-                         sound_data['title'] = "Unknown Sound"
-                
-                # Assign 1-based index for API usage
-                sound_data['api_index'] = idx + 1
-                
-                # Store by 0-based index for Category linking
-                all_sounds[str(idx)] = sound_data
-                
-                # Also store by explicit 'index' or 'id' if present (for exported XMLs)
-                if 'index' in sound_data:
-                     all_sounds[sound_data['index']] = sound_data
-                if 'id' in sound_data:
-                     all_sounds[sound_data['id']] = sound_data
-
-
-            # 2. Look for Categories
-            # Categories are usually under <Categories> tag, which is a child of <Soundlist> (root)
-            categories_tag = root.find("Categories")
-            if categories_tag is None and root.tag != "Soundlist":
-                 # Maybe root is wrapper
-                 sl = root.find("Soundlist")
-                 if sl:
-                     categories_tag = sl.find("Categories")
-
-            def _parse_category(cat_elem, path=""):
-                cat_name = cat_elem.get('name', 'Unnamed Category')
-                current_path = f"{path} / {cat_name}" if path else cat_name
-                
-                cat_sounds = []
-                # Sounds in category define 'id' which maps to index
-                for sound_ref in cat_elem.findall("Sound"):
-                    ref_id = sound_ref.get('id')
-                    sound_obj = None
-                    if ref_id in all_sounds:
-                        sound_obj = all_sounds[ref_id]
-                    else:
-                        try:
-                            if str(int(ref_id)) in all_sounds:
-                                 sound_obj = all_sounds[str(int(ref_id))]
-                        except:
-                            pass
-                    
-                    if sound_obj:
-                        # Add category path to the sound object for "Show in Folder" feature later
-                        # Make a shallow copy so the same sound in "All Sounds" doesn't get a specific path overridden
-                        sound_copy = sound_obj.copy()
-                        sound_copy['category_path'] = current_path
-                        cat_sounds.append(sound_copy)
-
-                subcategories = []
-                for sub_elem in cat_elem.findall("Category"):
-                    if sub_elem.get('name', 'Unnamed Category') == 'Unnamed Category':
-                        continue
-                    subcategories.append(_parse_category(sub_elem, current_path))
-
-                return {
-                    'name': cat_name,
-                    'path': current_path,
-                    'sounds': cat_sounds,
-                    'subcategories': subcategories
-                }
-
-            if categories_tag is not None:
-                for cat_elem in categories_tag.findall("Category"):
-                    # Игнорируем техническую папку Soundpad
-                    if cat_elem.get('name', 'Unnamed Category') == 'Unnamed Category':
-                        continue
-                    categories.append(_parse_category(cat_elem))
-            
-            # Add "All Sounds" category at the end or beginning
-            all_sounds_list = [all_sounds[str(i)] for i in range(len(sound_elements)) if str(i) in all_sounds]
-            if not categories or (len(categories) == 0):
-                # If no categories found (e.g. export file), try existing logic or just ALL
-                categories.append({'name': 'All Sounds', 'path': 'All Sounds', 'sounds': all_sounds_list, 'subcategories': []})
-            
-            # Always add All Sounds? User might want it.
-            # User request: "Убери из папок all sounds"
-            # categories.append({'name': 'All Sounds', 'path': 'All Sounds', 'sounds': all_sounds_list, 'subcategories': []})
-            
-            return categories
-
+            return self._parse_streaming(file_path, on_category)
         except Exception as e:
             self.logger.error(f"Error parsing {file_path}: {e}")
             return []
+
+    @staticmethod
+    def _make_sound(attrib, idx):
+        url = attrib.get('url') or None
+        title = attrib.get('title')
+        if not title:
+            # Fallback to basename of url
+            title = os.path.basename(url) if url else "Unknown Sound"
+        # API uses 1-based index, SPL 'id' attribute in categories uses 0-based index
+        return SoundRecord(title, url, idx + 1, attrib.get('index'))
+
+    def _parse_streaming(self, file_path, on_category=None):
+        """Reads the sounds and categories with iterparse.
+
+        Every element is cleared and detached from its parent as soon as it ends, so only
+        the sound records and the category skeleton stay in memory. Category sound
+        references are kept as raw ids and resolved once the whole file has been read.
+
+        Layouts handled: <Soundlist> root with <Sound> and <Categories> children, or a
+        wrapper root with a <Soundlist> (and <Categories>) inside.
+        """
+        # 'root': <Sound> children of the root, 'wrapped': of <Root><Soundlist>
+        sound_lists = {'root': ([], {}), 'wrapped': ([], {})} # -> (records, explicit index/id -> position)
+        top_categories = {} # same keys -> top level categories of the first <Categories> there
+        category_refs = {}  # id(category) -> raw <Sound id="..."> values
+        stack = [] # (element, role, payload) of the open elements
+        wrapper_seen = False
+
+        for event, elem in ET.iterparse(file_path, events=("start", "end")):
+            if event == "end":
+                _, role, payload = stack.pop()
+                elem.clear()
+                if stack:
+                    stack[-1][0].remove(elem)
+                    if on_category and role == _CATEGORY and payload is not None and stack[-1][1] == _CATEGORIES:
+                        on_category(payload)
+                continue
+
+            tag = elem.tag
+            role, payload = _OTHER, None
+            if not stack:
+                role = _ROOT
+            else:
+                _, parent_role, parent = stack[-1]
+                if tag == "Sound":
+                    if parent_role == _CATEGORY:
+                        if parent is not None:
+                            category_refs[id(parent)].append(elem.get('id'))
+                    elif parent_role in (_ROOT, _WRAPPER):
+                        records, aliases = sound_lists['root' if parent_role == _ROOT else 'wrapped']
+                        # Also findable by explicit 'index' or 'id' (exported XMLs)
+                        for key in ('index', 'id'):
+                            if key in elem.attrib:
+                                aliases[elem.attrib[key]] = len(records)
+                        records.append(self._make_sound(elem.attrib, len(records)))
+                elif tag == "Category" and parent_role in (_CATEGORIES, _CATEGORY):
+                    role = _CATEGORY
+                    cat_name = elem.get('name', 'Unnamed Category')
+                    # Игнорируем техническую папку Soundpad (and everything below a skipped one)
+                    if cat_name != 'Unnamed Category' and not (parent_role == _CATEGORY and parent is None):
+                        if parent_role == _CATEGORY:
+                            current_path = f"{parent['path']} / {cat_name}"
+                            siblings = parent['subcategories']
+                        else:
+                            current_path = cat_name
+                            siblings = parent
+                        payload = make_category(cat_name, current_path, None, refs=array('I'))
+                        category_refs[id(payload)] = []
+                        siblings.append(payload)
+                elif tag == "Categories" and parent_role in (_ROOT, _WRAPPER):
+                    key = 'root' if parent_role == _ROOT else 'wrapped'
+                    if key not in top_categories and (key == 'root' or stack[0][0].tag != "Soundlist"):
+                        role, payload = _CATEGORIES, top_categories.setdefault(key, [])
+                elif tag == "Soundlist" and parent_role == _ROOT and not wrapper_seen:
+                    role, wrapper_seen = _WRAPPER, True # first one only
+            stack.append((elem, role, payload))
+
+        records, aliases = sound_lists['root'] if sound_lists['root'][0] else sound_lists['wrapped']
+        categories = top_categories['root'] if 'root' in top_categories else top_categories.get('wrapped', [])
+
+        def _lookup(ref_id):
+            return max(_position(ref_id, len(records)), aliases.get(ref_id, -1))
+
+        pending = list(categories)
+        while pending:
+            cat = pending.pop()
+            cat['records'] = records
+            for ref_id in category_refs.pop(id(cat)):
+                pos = _lookup(ref_id)
+                if pos < 0:
+                    try:
+                        pos = _lookup(str(int(ref_id)))
+                    except (TypeError, ValueError):
+                        pass
+                if pos >= 0:
+                    cat['sounds'].append(pos)
+            pending.extend(cat['subcategories'])
+
+        if not categories:
+            # If no categories found (e.g. export file), show everything. Like any reference,
+            # a position can be shadowed by a later sound's 'index' or 'id'
+            refs = array('I', [_lookup(str(pos)) for pos in range(len(records))])
+            all_sounds = make_category('All Sounds', 'All Sounds', records, refs=refs)
+            if list(refs) == list(range(len(records))):
+                all_sounds['sounds'] = range(len(records))
+            categories.append(all_sounds)
+        self._drop_unreferenced(categories, records)
+        return categories
+
+    @staticmethod
+    def _drop_unreferenced(categories, records):
+        """Shrinks the shared records list to the sounds some category uses, in place."""
+        all_cats = []
+        pending = list(categories)
+        while pending:
+            cat = pending.pop()
+            all_cats.append(cat)
+            pending.extend(cat['subcategories'])
+
+        used = set()
+        for cat in all_cats:
+            used.update(cat['sounds'])
+        if len(used) == len(records):
+            return
+
+        remap = {}
+        kept = []
+        for pos in sorted(used):
+            remap[pos] = len(kept)
+            kept.append(records[pos])
+        records[:] = kept
+        for cat in all_cats:
+            cat['sounds'] = array('I', [remap[pos] for pos in cat['sounds']])
@@ -0,0 +1,154 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+# Lower value runs first
+PRIORITY_STOP = 0
+PRIORITY_PLAY = 1
+PRIORITY_SELECT = 2
+PRIORITY_DEFAULT = 3
+
+# Coalescing rules
+COALESCE_NONE = None
+COALESCE_SAME_ARGS = "same_args"   # identical pending command -> reuse it
+COALESCE_LATEST = "latest"         # only the newest pending command of this kind matters
+COALESCE_STOP = "stop"             # drops pending playback queued before it, and duplicate stops
+
+# Commands cancelled by a newer stop (they would otherwise start a sound right after it)
+PLAYBACK_COMMANDS = ("play_sound", "play_selected_sound", "play_pause_selected", "toggle_pause")
+
+# command -> (priority, deadline in ms or None, coalescing rule)
+DEFAULT_POLICIES = {
+    "stop_playback": (PRIORITY_STOP, None, COALESCE_STOP),
+    "play_sound": (PRIORITY_PLAY, 250, COALESCE_SAME_ARGS),
+    "play_selected_sound": (PRIORITY_PLAY, 250, COALESCE_NONE),
+    "play_pause_selected": (PRIORITY_PLAY, 250, COALESCE_NONE),
+    "toggle_pause": (PRIORITY_PLAY, 250, COALESCE_NONE),
+    "select_sound": (PRIORITY_SELECT, 1000, COALESCE_LATEST),
+    "select_next_category": (PRIORITY_SELECT, 1000, COALESCE_NONE),
+    "select_previous_category": (PRIORITY_SELECT, 1000, COALESCE_NONE),
+    "get_play_status": (PRIORITY_DEFAULT, 1000, COALESCE_SAME_ARGS),
+    "is_alive": (PRIORITY_DEFAULT, None, COALESCE_SAME_ARGS), # One pending heartbeat is enough
+}
+DEFAULT_POLICY = (PRIORITY_DEFAULT, None, COALESCE_NONE)
+
+
+class ScheduledCommand:
+    __slots__ = ("command", "args", "kwargs", "future", "enqueued_at", "deadline", "cancelled")
+
+    def __init__(self, command, args, kwargs, future, enqueued_at, deadline):
+        self.command = command
+        self.args = args
+        self.kwargs = kwargs
+        self.future = future
+        self.enqueued_at = enqueued_at
+        self.deadline = deadline
+        self.cancelled = False
+
+
+class CommandScheduler:
+    """Priority queue for Soundpad commands with coalescing and deadlines.
+
+    Stop outranks play, repeated plays of the same sound and superseded selects collapse
+    into one command, and fire-and-forget commands that waited longer than their deadline
+    are dropped, so a burst of pads never leaves a backlog that plays seconds late.
+    Commands without a deadline (connect, get_sound_list, ...) are never dropped.
+    """
+
+    def __init__(self, policies=None):
+        self.logger = logging.getLogger(__name__)
+        self.policies = dict(DEFAULT_POLICIES)
+        if policies:
+            self.policies.update(policies)
+
+        self._heap = []
+        self._seq = itertools.count()
+        self._pending = {} # command -> [ScheduledCommand] still waiting in the heap
+        self._live = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        self.coalesced_count = 0
+        self.cancelled_count = 0
+        self.stale_count = 0
+
+    def put(self, command, args, kwargs, future):
+        """Schedules a command. Returns the Future that will carry its result,
+        which is an already pending one if the command was coalesced."""
+        priority, deadline_ms, rule = self.policies.get(command, DEFAULT_POLICY)
+        now = time.perf_counter()
+
+        with self._cond:
+            pending = self._pending.get(command, [])
+
+            if rule == COALESCE_SAME_ARGS or rule == COALESCE_STOP:
+                for entry in pending:
+                    if entry.args == args and entry.kwargs == kwargs:
+                        self.coalesced_count += 1
+                        return entry.future
+
+            if rule == COALESCE_LATEST:
+                for entry in list(pending):
+                    self._cancel(entry)
+
+            if rule == COALESCE_STOP:
+                for playback_command in PLAYBACK_COMMANDS:
+                    for entry in list(self._pending.get(playback_command, [])):
+                        self._cancel(entry)
+
+            deadline = now + deadline_ms / 1000 if deadline_ms is not None else None
+            entry = ScheduledCommand(command, args, kwargs, future, now, deadline)
+            self._pending.setdefault(command, []).append(entry)
+            self._live += 1
+            heapq.heappush(self._heap, (priority, next(self._seq), entry))
+            self._cond.notify()
+            return future
+
+    def get(self):
+        """Blocks until the next runnable command is available.
+        Returns None once the scheduler is closed and drained."""
+        with self._cond:
+            while True:
+                while not self._heap and not self._closed:
+                    self._cond.wait()
+                if not self._heap:
+                    return None
+
+                _, _, entry = heapq.heappop(self._heap)
+                if entry.cancelled:
+                    continue
+                self._forget(entry)
+
+                if entry.deadline is not None and time.perf_counter() > entry.deadline:
+                    self.stale_count += 1
+                    entry.future.cancel()
+                    self.logger.debug(f"Dropped stale Soundpad command {entry.command}{entry.args}")
+                    continue
+                return entry
+
+    def close(self):
+        """Wakes up get(); remaining commands are still handed out before it returns None."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def qsize(self):
+        return self._live
+
+    def empty(self):
+        return self._live == 0
+
+    def _cancel(self, entry):
+        # The heap slot is skipped lazily in get()
+        entry.cancelled = True
+        entry.future.cancel()
+        self._forget(entry)
+        self.cancelled_count += 1
+
+    def _forget(self, entry):
+        pending = self._pending.get(entry.command)
+        if pending and entry in pending:
+            pending.remove(entry)
+            self._live -= 1
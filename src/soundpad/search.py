@@ -0,0 +1,281 @@
+import bisect
+import heapq
+import logging
+import os
+import re
+import threading
+from src.soundpad.sync import normalize_title
+
+_WORD_RE = re.compile(r"[^\W_]+") # "air_horn-2" -> air, horn, 2
+_PATH_SEP_RE = re.compile(r"[\\/]")
+_MAX_CHAR = chr(0x10FFFF)
+
+# How a word matched a query word; file name words count half as much as title words
+SCORE_EXACT = 6
+SCORE_PREFIX = 4
+SCORE_INFIX = 2
+SCORE_PHRASE = 4 # bonus when a multi-word query appears in the title as typed
+
+INFIX_MIN_LENGTH = 3 # shorter query words find infixes in the titles, not the vocabulary
+INFIX_CACHE_SIZE = 16
+# A query word matching more vocabulary words than this ("1", "s") is checked against
+# the titles directly: of the items left by the other words, or in rank order until
+# the limit is filled when it is the only word
+BROAD_WORD_MATCHES = 1000
+
+
+def file_stem(url):
+    """File name without extension, for Windows and POSIX paths alike."""
+    if not url:
+        return ""
+    return os.path.splitext(_PATH_SEP_RE.split(url)[-1])[0]
+
+
+class SearchIndex:
+    """Word index over sound titles (and file names) for search-as-you-type.
+
+    Every query word has to match some word of an item: exactly, as a prefix, or
+    anywhere inside it ("oo" still finds "Boom" like the old substring filter did).
+    Query words are matched against the sorted vocabulary, not the items, so a query
+    costs a bisect, a vocabulary scan for infixes (narrowed from the previous query while
+    the user keeps typing), and the postings of the words it hits. Words shorter than
+    INFIX_MIN_LENGTH would hit most of the vocabulary as infixes; their infix matches
+    come from the titles instead, of the items left by the other words if there are any.
+
+    Results are ranked by score, then shorter title, then original order. Items are
+    stored in that tie-break order, so ranking inside a score is a plain integer sort.
+    """
+
+    def __init__(self, items, title_of, url_of=None):
+        titles = [normalize_title(title_of(item)) for item in items]
+        order = sorted(range(len(items)), key=lambda pos: len(titles[pos])) # stable: original order on ties
+        self.items = [items[pos] for pos in order]
+        self._titles = [titles[pos] for pos in order]
+
+        postings = {}      # word -> ascending positions of items with it in the title
+        file_postings = {} # word -> the same for words found only in the file name
+        for pos, item in enumerate(self.items):
+            words = set(_WORD_RE.findall(self._titles[pos]))
+            for word in words:
+                postings.setdefault(word, []).append(pos)
+            if url_of is not None:
+                for word in set(_WORD_RE.findall(normalize_title(file_stem(url_of(item))))) - words:
+                    file_postings.setdefault(word, []).append(pos)
+        self._postings = postings
+        self._file_postings = file_postings
+        self._vocabulary = sorted(postings.keys() | file_postings.keys())
+        self._infix_cache = {} # recent query word -> vocabulary words containing it
+
+    def __len__(self):
+        return len(self.items)
+
+    def _prefix_range(self, word):
+        lo = bisect.bisect_left(self._vocabulary, word)
+        return lo, bisect.bisect_right(self._vocabulary, word + _MAX_CHAR, lo)
+
+    def _word_groups(self, word):
+        """(score, positions) groups of the items matching one query word."""
+        vocabulary = self._vocabulary
+        lo, hi = self._prefix_range(word)
+        matches = [(vocabulary[i], SCORE_EXACT if vocabulary[i] == word else SCORE_PREFIX) for i in range(lo, hi)]
+        if len(word) >= INFIX_MIN_LENGTH:
+            containing = self._infix_cache.get(word)
+            if containing is None:
+                # Words containing `word` also contain any part of it seen before
+                containing = vocabulary
+                for cached, cached_words in list(self._infix_cache.items()):
+                    if cached in word and len(cached_words) < len(containing):
+                        containing = cached_words
+                containing = [w for w in containing if word in w]
+                if len(self._infix_cache) >= INFIX_CACHE_SIZE:
+                    self._infix_cache.pop(next(iter(self._infix_cache)))
+                self._infix_cache[word] = containing
+            matches.extend((w, SCORE_INFIX) for w in containing if not w.startswith(word))
+
+        groups = []
+        for matched, score in matches:
+            if matched in self._postings:
+                groups.append((score, self._postings[matched]))
+            if matched in self._file_postings:
+                groups.append((score // 2, self._file_postings[matched]))
+        return groups
+
+    def _title_scores(self, word, positions, limit=None):
+        """Item position -> score for one query word, checked against the titles only.
+        Stops after limit matches (positions in rank order then give the best ones)."""
+        scores = {}
+        if limit is not None and limit <= 0:
+            return scores
+        escaped = re.escape(word)
+        exact = re.compile(rf"(?<![^\W_]){escaped}(?![^\W_])")
+        prefix = re.compile(rf"(?<![^\W_]){escaped}")
+        titles = self._titles
+        for pos in positions:
+            title = titles[pos]
+            if word not in title:
+                continue
+            if exact.search(title):
+                scores[pos] = SCORE_EXACT
+            elif prefix.search(title):
+                scores[pos] = SCORE_PREFIX
+            else:
+                scores[pos] = SCORE_INFIX
+            if limit is not None and len(scores) >= limit:
+                break
+        return scores
+
+    def _short_word_scores(self, word, positions):
+        """Item position -> score for a word shorter than INFIX_MIN_LENGTH: the index
+        (file names included) for exact and prefix matches, the titles of positions for
+        infixes."""
+        scores = self._word_scores(self._word_groups(word))
+        for pos, score in self._title_scores(word, positions).items():
+            if score > scores.get(pos, 0):
+                scores[pos] = score
+        return scores
+
+    @staticmethod
+    def _word_scores(groups):
+        """Item position -> best score, from _word_groups()."""
+        scores = {}
+        for points, positions in sorted(groups, key=lambda group: group[0]): # Best score written last
+            scores.update(dict.fromkeys(positions, points))
+        return scores
+
+    def search(self, query, limit=None, cancelled=None):
+        """Items matching every word of query, best first.
+
+        cancelled() is polled between the expensive steps; once it returns True the
+        search gives up and returns [].
+        """
+        query = normalize_title(query)
+        words = _WORD_RE.findall(query)
+        if not words:
+            return []
+        if limit is None:
+            limit = len(self.items)
+
+        # Most selective word first, the ones checked against titles last
+        ranges = {word: self._prefix_range(word) for word in set(words)}
+        broad = {word for word, (lo, hi) in ranges.items() if hi - lo > BROAD_WORD_MATCHES}
+        short = {word for word in ranges if len(word) < INFIX_MIN_LENGTH} - broad
+        words = sorted(ranges, key=lambda word: (word in broad, word in short, ranges[word][1] - ranges[word][0], -len(word)))
+
+        if len(words) == 1 and words[0] in broad:
+            # Exact title matches first, then the best ranked of the rest
+            word = words[0]
+            ranked = self._postings.get(word, [])[:limit]
+            exact = set(ranked)
+            rest = self._title_scores(word, (pos for pos in range(len(self.items)) if pos not in exact),
+                                      limit - len(ranked))
+            ranked.extend(rest)
+            return [self.items[pos] for pos in ranked]
+
+        if len(words) == 1:
+            # An item's score is its best group: take whole score levels, best first,
+            # and stop as soon as the limit is filled
+            levels = {}
+            for points, positions in self._word_groups(words[0]):
+                levels.setdefault(points, []).append(positions)
+            ranked, seen = [], set()
+            for points in sorted(levels, reverse=True):
+                if cancelled is not None and cancelled():
+                    return []
+                level = set().union(*levels[points]) - seen
+                seen |= level
+                ranked.extend(heapq.nsmallest(limit - len(ranked), level))
+                if len(ranked) >= limit:
+                    break
+            if words[0] in short and len(ranked) < limit:
+                # Infixes last, best ranked first
+                if cancelled is not None and cancelled():
+                    return []
+                rest = (pos for pos in range(len(self.items)) if pos not in seen)
+                ranked.extend(self._title_scores(words[0], rest, limit - len(ranked)))
+            return [self.items[pos] for pos in ranked]
+
+        scores = None
+        for word in words:
+            if cancelled is not None and cancelled():
+                return []
+            if scores is not None:
+                if word in broad:
+                    word_scores = self._title_scores(word, scores)
+                    scores = {pos: scores[pos] + word_scores[pos] for pos in word_scores}
+                    if not scores:
+                        return []
+                    continue
+            if word in short:
+                word_scores = self._short_word_scores(word, scores if scores is not None else range(len(self.items)))
+            else:
+                word_scores = self._word_scores(self._word_groups(word))
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = {pos: scores[pos] + word_scores[pos] for pos in scores.keys() & word_scores.keys()}
+            if not scores:
+                return []
+
+        titles = self._titles
+        buckets = {}
+        for pos, score in scores.items():
+            if query in titles[pos]:
+                score += SCORE_PHRASE
+            buckets.setdefault(score, []).append(pos)
+        ranked = []
+        for score in sorted(buckets, reverse=True):
+            ranked.extend(heapq.nsmallest(limit - len(ranked), buckets[score]))
+            if len(ranked) >= limit:
+                break
+        return [self.items[pos] for pos in ranked]
+
+
+class SearchWorker:
+    """Runs searches on one background thread, newest query only.
+
+    submit() replaces whatever query is still waiting, and the one already running is
+    told to stop through its cancelled() argument, so fast typing never queues up stale
+    searches. on_done(results) is called from the worker thread, and only if nothing
+    was submitted (or cancel()ed) meanwhile.
+    """
+
+    def __init__(self, name="SearchWorker"):
+        self.logger = logging.getLogger(__name__)
+        self.name = name
+        self._cond = threading.Condition()
+        self._generation = 0
+        self._pending = None # (generation, search, on_done) not started yet
+        self._thread = None
+
+    def submit(self, search, on_done):
+        """Runs search(cancelled) in the background, then on_done(results)."""
+        with self._cond:
+            self._generation += 1
+            self._pending = (self._generation, search, on_done)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def cancel(self):
+        """Drops the waiting search and stops the running one."""
+        with self._cond:
+            self._generation += 1
+            self._pending = None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    self._cond.wait()
+                generation, search, on_done = self._pending
+                self._pending = None
+
+            cancelled = lambda: generation != self._generation
+            try:
+                results = search(cancelled)
+            except Exception as e:
+                self.logger.error(f"Search failed: {e}")
+                continue
+            if not cancelled():
+                on_done(results)
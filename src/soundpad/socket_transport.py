@@ -0,0 +1,107 @@
+import asyncio
+import socket
+import struct
+from soundpad_control import SoundpadRemoteControl
+from soundpad_control.errors import SoundpadNotLaunchedError
+
+# Soundpad's named pipe is message based. Over a stream socket every message is
+# sent as a 4-byte big-endian length followed by the payload.
+_HEADER = struct.Struct(">I")
+
+DEFAULT_HOST = "127.0.0.1"
+
+
+def send_frame(sock, data):
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def _recv_exactly(sock, size):
+    buf = bytearray()
+    while len(buf) < size:
+        chunk = sock.recv(size - len(buf))
+        if not chunk:
+            raise ConnectionError("Socket closed")
+        buf += chunk
+    return bytes(buf)
+
+
+def recv_frame(sock):
+    (size,) = _HEADER.unpack(_recv_exactly(sock, _HEADER.size))
+    return _recv_exactly(sock, size)
+
+
+class SocketRemoteControl(SoundpadRemoteControl):
+    """SoundpadRemoteControl that talks to a local socket instead of the Windows pipe,
+    e.g. to FakeSoundpadServer. Drop-in for SoundpadClient(remote=...)."""
+
+    def __init__(self, port, host=DEFAULT_HOST, timeout=5.0):
+        super().__init__()
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
+    def _init_connection(self):
+        if self.pipe is None:
+            try:
+                self.pipe = socket.create_connection((self.host, self.port), timeout=self.timeout)
+                self.pipe.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            except OSError:
+                raise SoundpadNotLaunchedError
+
+    def _send_request(self, request):
+        self._init_connection()
+        send_frame(self.pipe, self._format_request(request))
+        return recv_frame(self.pipe).decode()
+
+    def iter_response_chunks(self, request, chunk_size):
+        """Like _send_request, but yields the response in pieces of up to chunk_size bytes."""
+        self._init_connection()
+        sock = self.pipe
+        send_frame(sock, self._format_request(request))
+        (remaining,) = _HEADER.unpack(_recv_exactly(sock, _HEADER.size))
+        try:
+            while remaining:
+                chunk = sock.recv(min(chunk_size, remaining))
+                if not chunk:
+                    raise ConnectionError("Socket closed")
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            # Consume the rest of the frame if the caller stopped early
+            while remaining:
+                chunk = sock.recv(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+
+
+class SocketChannel:
+    """AsyncSoundpadClient channel over a local socket (see PipeChannel)."""
+
+    framed = True # Length-prefixed frames, safe to pipeline
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+
+    @classmethod
+    async def open(cls, port, host=DEFAULT_HOST):
+        reader, writer = await asyncio.open_connection(host, port)
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return cls(reader, writer)
+
+    def write(self, data):
+        self._writer.write(_HEADER.pack(len(data)) + data)
+
+    async def read(self):
+        try:
+            header = await self._reader.readexactly(_HEADER.size)
+            (size,) = _HEADER.unpack(header)
+            return await self._reader.readexactly(size)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return None
+
+    def close(self):
+        self._writer.close()
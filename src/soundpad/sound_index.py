@@ -0,0 +1,172 @@
+import logging
+import threading
+from src.soundpad.parser import walk_categories
+from src.soundpad.search import SearchIndex
+from src.soundpad.sync import normalize_title
+
+
+class SoundIndex:
+    """Lookup tables over the parsed library and the Soundpad API list, shared by the
+    App and the LibraryFrame.
+
+    Library side, rebuilt on every (re)load of the .spl:
+        titles      normalized title -> [SoundRecord]
+        api_indexes api_index -> SoundRecord
+        urls        url -> SoundRecord
+        categories  category path -> category dict
+        search      SearchIndex of (SoundRecord, path of its first category)
+    API side, updated from each sync's delta (see set_api_sounds):
+        api_titles  normalized title -> [API sound dict] in list order
+        api_sounds  index -> API sound dict
+        api_search  SearchIndex of API sound dicts, built on first use after a change
+
+    Tables are built aside and swapped in whole, so lookups from other threads never
+    see a half-built one. build_library() is the slow part and can run off the Tk thread,
+    apply_library() only swaps.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.titles = {}
+        self.api_indexes = {}
+        self.urls = {}
+        self.categories = {}
+        self.search = SearchIndex([], None)
+        self.api_titles = {}
+        self.api_sounds = {}
+        self._api_list = []
+        self._api_search = SearchIndex([], None)
+        self._api_search_lock = threading.Lock()
+
+    def set_library(self, categories):
+        self.apply_library(self.build_library(categories))
+
+    @staticmethod
+    def build_library(categories):
+        """Library tables for categories, to pass to apply_library()."""
+        titles, api_indexes, urls = {}, {}, {}
+        seen_lists = set()
+        entries = [] # (sound, path) in display order, each sound under its first category
+        seen_sounds = set()
+        for cat in walk_categories(categories):
+            records = cat['records']
+            if records is None:
+                continue
+            for i in cat['sounds']:
+                if id(records[i]) not in seen_sounds:
+                    seen_sounds.add(id(records[i]))
+                    entries.append((records[i], cat['path']))
+            if id(records) in seen_lists:
+                continue
+            # Categories share one records list, index each sound once
+            seen_lists.add(id(records))
+            for sound in records:
+                titles.setdefault(normalize_title(sound.title), []).append(sound)
+                api_indexes.setdefault(sound.api_index, sound)
+                if sound.url:
+                    urls.setdefault(sound.url, sound)
+        search = SearchIndex(entries, lambda entry: entry[0].title, lambda entry: entry[0].url)
+        return titles, api_indexes, urls, search, categories
+
+    def apply_library(self, tables, categories=None):
+        """Swaps in tables from build_library(). categories, if given, replaces the ones
+        they were built from (same content, e.g. after an in-place update)."""
+        titles, api_indexes, urls, search, built_from = tables
+        paths = {}
+        for cat in walk_categories(categories if categories is not None else built_from):
+            paths.setdefault(cat['path'], cat)
+        self.titles, self.api_indexes, self.urls, self.search, self.categories = titles, api_indexes, urls, search, paths
+        self.logger.debug(f"Library index: {len(api_indexes)} sounds, {len(paths)} categories")
+
+    def set_category(self, category):
+        """Adds (or replaces) one category by path, e.g. the API "new sounds" one."""
+        categories = dict(self.categories)
+        categories[category['path']] = category
+        self.categories = categories
+
+    def remove_category(self, path):
+        if path in self.categories:
+            categories = dict(self.categories)
+            del categories[path]
+            self.categories = categories
+
+    def set_api_sounds(self, sounds, delta=None):
+        """Replaces the API sound list. delta, SoundListSync.update()'s result for it, lets
+        an unchanged list skip all work and a small change patch the lookup tables."""
+        if delta is not None and not delta.initial:
+            if delta.is_empty():
+                return
+            self._apply_api_delta(delta)
+        else:
+            titles, indexes = {}, {}
+            for sound in sounds:
+                titles.setdefault(normalize_title(sound['title']), []).append(sound)
+                indexes.setdefault(sound.get('index'), sound)
+            self.api_titles, self.api_sounds = titles, indexes
+        with self._api_search_lock:
+            self._api_list = sounds
+            self._api_search = None # Rebuilt by the next search_api()
+
+    def _apply_api_delta(self, delta):
+        """Patches copies of api_titles / api_sounds for the titles and indexes in delta."""
+        titles, indexes = dict(self.api_titles), dict(self.api_sounds)
+        gone = delta.removed + [old for old, _ in delta.moved]
+        new = delta.added + [new for _, new in delta.moved]
+        # By value: the tables may hold equal records from an older list than delta's
+        gone_keys = {(sound.get('index'), sound['title']) for sound in gone}
+        for key in {normalize_title(sound['title']) for sound in gone + new}:
+            kept = [sound for sound in titles.get(key, ()) if (sound.get('index'), sound['title']) not in gone_keys]
+            if kept:
+                titles[key] = kept
+            else:
+                titles.pop(key, None)
+        for index, title in gone_keys:
+            if index in indexes and indexes[index]['title'] == title:
+                del indexes[index]
+        for sound in new:
+            titles.setdefault(normalize_title(sound['title']), []).append(sound)
+            indexes.setdefault(sound.get('index'), sound)
+        for key in {normalize_title(sound['title']) for sound in new}:
+            titles[key].sort(key=lambda sound: sound.get('index') or 0) # List order
+        self.api_titles, self.api_sounds = titles, indexes
+
+    @property
+    def api_search(self):
+        with self._api_search_lock:
+            if self._api_search is None:
+                self._api_search = SearchIndex(self._api_list, lambda sound: sound['title'])
+            return self._api_search
+
+    def has_library_title(self, title):
+        return normalize_title(title) in self.titles
+
+    def find_category(self, path):
+        return self.categories.get(path)
+
+    def find_library_sound(self, api_index=None, url=None, title=None):
+        """First library sound matching api_index, then url, then title."""
+        sound = None
+        if api_index is not None:
+            sound = self.api_indexes.get(api_index)
+        if sound is None and url:
+            sound = self.urls.get(url)
+        if sound is None and title is not None:
+            matches = self.titles.get(normalize_title(title))
+            sound = matches[0] if matches else None
+        return sound
+
+    def find_api_sound(self, title):
+        """First API sound with this (normalized) title."""
+        matches = self.api_titles.get(normalize_title(title))
+        return matches[0] if matches else None
+
+    def search_library(self, query, limit=None, cancelled=None):
+        """Ranked (SoundRecord, category path) pairs for a search box query."""
+        return self.search.search(query, limit, cancelled)
+
+    def search_api(self, query, limit=None):
+        """Ranked API sound dicts for a search box query."""
+        return self.api_search.search(query, limit)
+
+    def find_api_sound_by_index(self, index):
+        return self.api_sounds.get(index)
@@ -0,0 +1,127 @@
+import logging
+import threading
+import time
+from soundpad_control.remote_control import PlayStatus
+
+
+class PlaybackStatusTracker:
+    """Local cache of Soundpad's play state.
+
+    The state is inferred from our own commands as they are submitted to the worker
+    (play -> PLAYING, stop -> STOPPED, toggle_pause flips PLAYING/PAUSED) and corrected
+    by a background GetPlayStatus poll, which runs often while something plays (sounds
+    end on their own) and rarely when idle. play_pause() decides between play and
+    toggle_pause from the cache, with no pipe round trip on the key press: only
+    PLAYING -> STOPPED happens without one of our commands, and a wrong guess costs one
+    harmless toggle. Soundpad is only asked first when the cache says playing but
+    hasn't been confirmed for max_age seconds (two playing polls by default), i.e. the
+    polls are failing.
+    """
+
+    def __init__(self, worker, poll_playing=0.5, poll_idle=5.0, max_age=None):
+        self.logger = logging.getLogger(__name__)
+        self.worker = worker
+        self.poll_playing = poll_playing
+        self.poll_idle = poll_idle
+        self.max_age = max_age if max_age is not None else 2 * poll_playing
+
+        self.status = PlayStatus.STOPPED
+        self.playing_index = None # API index of the sound we last started, if known
+        self._generation = 0 # Bumped by every local change so stale polls are ignored
+        self._checked_at = 0.0 # time.monotonic() the cache was last set or confirmed
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._running = False
+        self._thread = None
+        self._listeners = []
+
+    def add_listener(self, callback):
+        """callback(status, playing_index) on every change, called from a background thread."""
+        self._listeners.append(callback)
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self.worker.add_submit_listener(self._on_command)
+        self._thread = threading.Thread(target=self._run, name="SoundpadStatus", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self.worker.remove_submit_listener(self._on_command)
+        self._wakeup.set()
+
+    def is_playing(self):
+        return self.status in (PlayStatus.PLAYING, PlayStatus.SEEKING)
+
+    def play_pause(self):
+        """Plays the selected sound if stopped, or toggles pause if playing/paused."""
+        if self.status == PlayStatus.STOPPED:
+            return self.worker.submit("play_selected_sound")
+        if time.monotonic() - self._checked_at > self.max_age:
+            # Not polled lately, the sound may have ended: let the worker check first
+            return self.worker.submit("play_pause_selected")
+        return self.worker.submit("toggle_pause")
+
+    def _set(self, status, playing_index, generation=None):
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return # A local command changed the state after this poll was sent
+            if generation is None:
+                self._generation += 1
+            self._checked_at = time.monotonic()
+            if status == PlayStatus.STOPPED:
+                playing_index = None
+            changed = (status, playing_index) != (self.status, self.playing_index)
+            self.status = status
+            self.playing_index = playing_index
+        if changed:
+            if status != PlayStatus.STOPPED:
+                self._wakeup.set() # Start polling at the faster rate
+            for callback in list(self._listeners):
+                try:
+                    callback(status, playing_index)
+                except Exception as e:
+                    self.logger.error(f"Error in playback status listener: {e}")
+
+    def _on_command(self, command, args):
+        """Worker submit listener: infers the new state from our own commands."""
+        if command == "play_sound":
+            self._set(PlayStatus.PLAYING, args[0] if args else None)
+        elif command == "play_selected_sound":
+            self._set(PlayStatus.PLAYING, None)
+        elif command == "stop_playback":
+            self._set(PlayStatus.STOPPED, None)
+        elif command == "toggle_pause":
+            if self.status == PlayStatus.PAUSED:
+                self._set(PlayStatus.PLAYING, self.playing_index)
+            elif self.status != PlayStatus.STOPPED:
+                self._set(PlayStatus.PAUSED, self.playing_index)
+        elif command == "play_pause_selected":
+            # Soundpad picks play or pause, poll right after it to see which
+            with self._lock:
+                self._generation += 1
+            self._wakeup.set()
+
+    def _run(self):
+        while self._running:
+            self._wakeup.wait(self.poll_playing if self.status != PlayStatus.STOPPED else self.poll_idle)
+            self._wakeup.clear()
+            if not self._running:
+                break
+            if self.worker.client.connected:
+                self._poll()
+
+    def _poll(self):
+        generation = self._generation
+        try:
+            status = self.worker.call("get_play_status", timeout=2.0)
+        except Exception as e:
+            # Dropped while Soundpad is down, or timed out
+            self.logger.debug(f"Playback status poll skipped: {e}")
+            return
+        if status is None:
+            return
+        # Keep the index we know about while the same sound is still going
+        self._set(status, self.playing_index, generation)
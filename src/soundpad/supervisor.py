@@ -0,0 +1,229 @@
+import collections
+import concurrent.futures
+import logging
+import random
+import threading
+import time
+
+STATE_CONNECTED = "connected"
+STATE_DISCONNECTED = "disconnected" # circuit open: commands fail fast
+STATE_RECONNECTING = "reconnecting" # half-open: one connect attempt in flight
+
+# What to do with a command submitted while Soundpad is down
+POLICY_DROP = "drop"     # cancel right away (a sound seconds late is worse than none)
+POLICY_REPLAY = "replay" # hold it and run it once Soundpad is back
+POLICY_PASS = "pass"     # let it through (connection management itself)
+
+DEFAULT_POLICIES = {
+    "play_sound": POLICY_DROP,
+    "stop_playback": POLICY_DROP,
+    "toggle_pause": POLICY_DROP,
+    "play_selected_sound": POLICY_DROP,
+    "play_pause_selected": POLICY_DROP,
+    "get_play_status": POLICY_DROP,
+    "select_sound": POLICY_REPLAY,
+    "select_next_category": POLICY_REPLAY,
+    "select_previous_category": POLICY_REPLAY,
+    "connect": POLICY_PASS,
+    "is_alive": POLICY_PASS,
+    "get_sound_list": POLICY_PASS,
+}
+
+
+class ConnectionSupervisor:
+    """Keeps the Soundpad connection alive on behalf of a SoundpadCommandWorker.
+
+    Sends an is_alive heartbeat through the worker while connected and idle; recent
+    traffic counts as a heartbeat, and a busy worker is only a failure once a command has
+    been stuck for stall_timeout. When it fails the circuit opens: commands are dropped or
+    held (per policy) at submit time instead of hitting a dead pipe, and reconnects are
+    retried with exponential backoff plus jitter. Held commands younger than
+    replay_max_age are replayed once the connection is back.
+    """
+
+    def __init__(self, worker, heartbeat_interval=2.0, heartbeat_timeout=2.0, stall_timeout=10.0,
+                 backoff_initial=0.5, backoff_max=30.0, replay_max_age=5.0, replay_limit=32, policies=None):
+        self.logger = logging.getLogger(__name__)
+        self.worker = worker
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.stall_timeout = stall_timeout
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.replay_max_age = replay_max_age
+        self.policies = dict(DEFAULT_POLICIES)
+        if policies:
+            self.policies.update(policies)
+
+        self.state = STATE_CONNECTED if worker.client.connected else STATE_DISCONNECTED
+        self._backoff = backoff_initial
+        self._held = collections.deque(maxlen=replay_limit) # (command, args, kwargs, future, held_at)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._running = False
+        self._thread = None
+        self._listeners = []
+
+        self.dropped_count = 0
+        self.replayed_count = 0
+        self.reconnect_attempts = 0
+
+    def add_listener(self, callback):
+        """callback(new_state, old_state) is called from the supervisor thread on every state change."""
+        self._listeners.append(callback)
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self.worker.gate = self._gate
+        self._thread = threading.Thread(target=self._run, name="SoundpadSupervisor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self.worker.gate == self._gate:
+            self.worker.gate = None
+        self._wakeup.set()
+
+    def request_reconnect(self):
+        """Skips the current backoff wait, e.g. right after launching Soundpad."""
+        self._backoff = 0.0
+        self._wakeup.set()
+
+    def mark_connected(self):
+        """Tells the supervisor a connection was established outside of it."""
+        self._backoff = 0.0
+        self._replay_held()
+        self._set_state(STATE_CONNECTED)
+
+    def _set_state(self, state):
+        with self._lock:
+            old = self.state
+            self.state = state
+        if old != state:
+            # Backoff retries flip between disconnected/reconnecting, keep those quiet
+            log = self.logger.info if STATE_CONNECTED in (old, state) else self.logger.debug
+            log(f"Soundpad connection: {old} -> {state}")
+            for callback in list(self._listeners):
+                try:
+                    callback(state, old)
+                except Exception as e:
+                    self.logger.error(f"Error in connection listener: {e}")
+
+    def _gate(self, command, args, kwargs, future):
+        """Worker submit hook. Returns True if the command was taken care of here."""
+        if self.state == STATE_CONNECTED:
+            return False
+        policy = self.policies.get(command, POLICY_DROP)
+        if policy == POLICY_PASS:
+            return False
+
+        with self._lock:
+            if self.state == STATE_CONNECTED: # Reconnected meanwhile
+                return False
+            if policy == POLICY_REPLAY:
+                if len(self._held) == self._held.maxlen:
+                    self._drop(self._held.popleft()[3], "replay buffer full")
+                self._held.append((command, args, kwargs, future, time.monotonic()))
+                self.logger.info(f"Soundpad is down, holding {command}{args} for replay")
+                return True
+        self._drop(future, f"{command}{args}: Soundpad is not connected")
+        return True
+
+    def _drop(self, future, reason):
+        self.dropped_count += 1
+        self.logger.warning(f"Dropped Soundpad command ({reason})")
+        future.cancel()
+
+    def _replay_held(self):
+        with self._lock:
+            held = list(self._held)
+            self._held.clear()
+
+        now = time.monotonic()
+        for command, args, kwargs, future, held_at in held:
+            if now - held_at > self.replay_max_age:
+                self._drop(future, f"{command}{args} expired while Soundpad was down")
+                continue
+            self.replayed_count += 1
+            self.worker.enqueue(command, args, kwargs, future)
+
+    def _wait(self, seconds):
+        """Sleeps unless woken up. Returns False when stopping."""
+        self._wakeup.wait(seconds)
+        self._wakeup.clear()
+        return self._running
+
+    def _answered_since(self, since):
+        """True if a command completed after since and the pipe is still open."""
+        return self.worker.last_completed > since and self.worker.client.pipe_open()
+
+    def _busy(self, now):
+        """True if the worker has other work that a heartbeat would wait behind, and
+        nothing has been running for stall_timeout yet."""
+        current = self.worker.current
+        if current is None:
+            return not self.worker.is_idle()
+        command, started = current
+        return command != "is_alive" and now - started < self.stall_timeout
+
+    def _heartbeat(self):
+        """True if Soundpad looks alive. Only an idle worker sends is_alive; a timeout
+        caused by other commands running meanwhile is not a failure."""
+        now = time.monotonic()
+        if self._answered_since(now - self.heartbeat_interval) or self._busy(now):
+            return True
+        try:
+            return bool(self.worker.call("is_alive", timeout=self.heartbeat_timeout))
+        except concurrent.futures.TimeoutError:
+            if self._answered_since(now) or self._busy(time.monotonic()):
+                self.logger.debug("Soundpad heartbeat waited behind other commands")
+                return True
+            self.logger.warning("Soundpad heartbeat timed out")
+            return False
+        except Exception as e:
+            self.logger.warning(f"Soundpad heartbeat failed: {e}")
+            return False
+
+    def _try_connect(self):
+        self.reconnect_attempts += 1
+        try:
+            return bool(self.worker.call("connect", timeout=self.heartbeat_timeout))
+        except Exception as e:
+            self.logger.warning(f"Soundpad reconnect failed: {e}")
+            return False
+
+    def _run(self):
+        while self._running:
+            if self.state == STATE_CONNECTED:
+                if not self._wait(self.heartbeat_interval):
+                    break
+                if not self._heartbeat():
+                    self._backoff = self.backoff_initial
+                    self._set_state(STATE_DISCONNECTED)
+                continue
+
+            if not self._wait(self._backoff):
+                break
+            if self.state == STATE_CONNECTED: # mark_connected() while waiting
+                continue
+            self._set_state(STATE_RECONNECTING)
+            if self._try_connect():
+                self._backoff = 0.0
+                self._replay_held()
+                self._set_state(STATE_CONNECTED)
+            else:
+                next_backoff = max(self._backoff * 2, self.backoff_initial)
+                self._backoff = min(next_backoff, self.backoff_max) * random.uniform(0.8, 1.2)
+                self._set_state(STATE_DISCONNECTED)
+
+    def get_stats(self):
+        return {
+            'state': self.state,
+            'held': len(self._held),
+            'dropped': self.dropped_count,
+            'replayed': self.replayed_count,
+            'reconnect_attempts': self.reconnect_attempts,
+            'backoff_s': self._backoff,
+        }
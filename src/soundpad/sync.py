@@ -0,0 +1,92 @@
+import hashlib
+import logging
+
+
+def normalize_title(title):
+    """Key used everywhere to match sounds by title."""
+    return (title or "").strip().lower()
+
+
+class SoundListDelta:
+    """Difference between two Soundpad API sound lists.
+
+    added / removed -- sound records ({'index', 'title'}) that appeared / disappeared
+    moved           -- (old_record, new_record) pairs of the same sound at a new index
+    initial         -- True for the first list seen (everything is 'added')
+    """
+    __slots__ = ("added", "removed", "moved", "initial")
+
+    def __init__(self, added=None, removed=None, moved=None, initial=False):
+        self.added = added or []
+        self.removed = removed or []
+        self.moved = moved or []
+        self.initial = initial
+
+    def is_empty(self):
+        return not (self.added or self.removed or self.moved or self.initial)
+
+    def __repr__(self):
+        return f"SoundListDelta(added={len(self.added)}, removed={len(self.removed)}, moved={len(self.moved)}, initial={self.initial})"
+
+
+class SoundListSync:
+    """Remembers the last API sound list and turns each new fetch into a delta.
+
+    An unchanged list is recognised by its fingerprint alone; otherwise sounds are
+    matched by normalized title (duplicates in order of appearance), so adding one file
+    to a 20k-sound library yields a one-item delta instead of a full rebuild.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.sounds = []
+        self.fingerprint = None
+        self._by_title = {} # normalized title -> [records] in list order
+
+    @staticmethod
+    def compute_fingerprint(sounds):
+        digest = hashlib.blake2b(digest_size=16)
+        for sound in sounds:
+            digest.update(f"{sound['index']}\0{sound['title']}\n".encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+
+    @staticmethod
+    def _group(sounds):
+        groups = {}
+        for sound in sounds:
+            groups.setdefault(normalize_title(sound['title']), []).append(sound)
+        return groups
+
+    def reset(self):
+        self.sounds = []
+        self.fingerprint = None
+        self._by_title = {}
+
+    def update(self, sounds):
+        """Stores the new list and returns what changed since the previous one."""
+        fingerprint = self.compute_fingerprint(sounds)
+        if fingerprint == self.fingerprint:
+            return SoundListDelta()
+
+        new_groups = self._group(sounds)
+        if self.fingerprint is None:
+            delta = SoundListDelta(added=list(sounds), initial=True)
+        else:
+            delta = SoundListDelta()
+            old_groups = self._by_title
+            for key, new_list in new_groups.items():
+                old_list = old_groups.get(key, ())
+                for old, new in zip(old_list, new_list):
+                    if old['index'] != new['index']:
+                        delta.moved.append((old, new))
+                delta.added.extend(new_list[len(old_list):])
+                delta.removed.extend(old_list[len(new_list):])
+            for key, old_list in old_groups.items():
+                if key not in new_groups:
+                    delta.removed.extend(old_list)
+
+        self.sounds = sounds
+        self.fingerprint = fingerprint
+        self._by_title = new_groups
+        self.logger.debug(f"Sound list sync: {delta}")
+        return delta
@@ -0,0 +1,150 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from src.soundpad.scheduler import CommandScheduler
+
+
+class SoundpadCommandWorker:
+    """Long-lived thread that owns all traffic to Soundpad.
+
+    Commands are SoundpadClient method names pushed onto a CommandScheduler and executed
+    one at a time on a single thread, so the named pipe is opened once and kept open instead
+    of spawning a new thread (and racing other threads on the pipe) for every action.
+    """
+
+    def __init__(self, client, scheduler=None):
+        self.client = client
+        self.logger = logging.getLogger(__name__)
+        self._queue = scheduler or CommandScheduler()
+        self._thread = None
+        self._running = False
+        # Optional submit hook gate(command, args, kwargs, future) -> True if it handled
+        # the command itself (see ConnectionSupervisor)
+        self.gate = None
+        self._submit_listeners = [] # callback(command, args) for every accepted command
+
+        # Stats: command -> {'count', 'total_ms', 'max_ms', 'last_ms', 'wait_ms'}
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+        self.max_queue_depth = 0
+        self.current = None # (command, time.monotonic() it started) while one runs
+        self.last_completed = 0.0 # time.monotonic() the last command returned without raising
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="SoundpadWorker", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """Stops the worker after the commands already queued."""
+        if not self._running:
+            return
+        self._running = False
+        self._queue.close() # Wake up the thread
+        if self._thread:
+            self._thread.join(timeout)
+
+    def submit(self, command, *args, **kwargs):
+        """Queues a SoundpadClient call by method name and returns a Future with its result.
+
+        The Future is cancelled if the command is dropped (superseded, stale or Soundpad down).
+        """
+        future = Future()
+        gate = self.gate
+        if gate is not None and gate(command, args, kwargs, future):
+            return future
+        for callback in self._submit_listeners:
+            try:
+                callback(command, args)
+            except Exception as e:
+                self.logger.error(f"Error in submit listener: {e}")
+        return self.enqueue(command, args, kwargs, future)
+
+    def add_submit_listener(self, callback):
+        self._submit_listeners.append(callback)
+
+    def remove_submit_listener(self, callback):
+        if callback in self._submit_listeners:
+            self._submit_listeners.remove(callback)
+
+    def enqueue(self, command, args, kwargs, future):
+        """Queues a command for an existing Future, bypassing the gate."""
+        future = self._queue.put(command, args, kwargs, future)
+        depth = self._queue.qsize()
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
+        return future
+
+    def call(self, command, *args, timeout=None, **kwargs):
+        """Blocking helper for background threads: submit and wait for the result."""
+        return self.submit(command, *args, **kwargs).result(timeout)
+
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def is_idle(self):
+        return self.current is None and self._queue.empty()
+
+    def _run(self):
+        while True:
+            entry = self._queue.get()
+            if entry is None:
+                break
+            self._execute(entry)
+
+    def _execute(self, entry):
+        future = entry.future
+        if not future.set_running_or_notify_cancel():
+            return
+
+        started = time.perf_counter()
+        self.current = (entry.command, time.monotonic())
+        try:
+            result = getattr(self.client, entry.command)(*entry.args, **entry.kwargs)
+        except Exception as e:
+            self.current = None
+            self.logger.error(f"Soundpad command {entry.command} failed: {e}")
+            future.set_exception(e)
+        else:
+            self.current = None
+            self.last_completed = time.monotonic()
+            future.set_result(result)
+        finished = time.perf_counter()
+
+        self._record(entry.command, (started - entry.enqueued_at) * 1000, (finished - started) * 1000)
+
+    def _record(self, command, wait_ms, run_ms):
+        with self._stats_lock:
+            stat = self._stats.setdefault(command, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'last_ms': 0.0, 'wait_ms': 0.0})
+            latency_ms = wait_ms + run_ms
+            stat['count'] += 1
+            stat['total_ms'] += latency_ms
+            stat['wait_ms'] += wait_ms
+            stat['last_ms'] = latency_ms
+            if latency_ms > stat['max_ms']:
+                stat['max_ms'] = latency_ms
+
+    def get_stats(self):
+        """Returns latency (queue wait + execution) per command and queue depth figures."""
+        with self._stats_lock:
+            commands = {}
+            for command, stat in self._stats.items():
+                count = stat['count']
+                commands[command] = {
+                    'count': count,
+                    'avg_ms': stat['total_ms'] / count,
+                    'avg_wait_ms': stat['wait_ms'] / count,
+                    'max_ms': stat['max_ms'],
+                    'last_ms': stat['last_ms'],
+                }
+        return {
+            'commands': commands,
+            'queue_depth': self.queue_depth(),
+            'max_queue_depth': self.max_queue_depth,
+            'coalesced': self._queue.coalesced_count,
+            'cancelled': self._queue.cancelled_count,
+            'stale_dropped': self._queue.stale_count,
+        }
@@ -0,0 +1,50 @@
+import threading
+import pytest
+
+
+class FakeWidget:
+    """Tk widget stand-in for after(): callbacks run when the test runs a frame.
+
+    The thread that creates it plays the Tk thread. As in Tkinter, after() from any
+    other thread waits until the Tk thread has taken the call (in run_frame()).
+    """
+
+    def __init__(self):
+        self.pending = []
+        self.waiting = threading.Event() # Set while another thread waits in after()
+        self._tk_thread = threading.get_ident()
+        self._lock = threading.Lock()
+        self._calls = [] # (callback, handled event) from other threads
+
+    def after(self, ms, callback):
+        if threading.get_ident() == self._tk_thread:
+            with self._lock:
+                self.pending.append(callback)
+            return
+        handled = threading.Event()
+        with self._lock:
+            self._calls.append((callback, handled))
+        self.waiting.set()
+        if not handled.wait(2.0):
+            with self._lock:
+                if not handled.is_set():
+                    self._calls.remove((callback, handled))
+                    raise RuntimeError("after() was never handled by the Tk thread")
+
+    def run_frame(self):
+        """Runs the callbacks due so far, returns how many."""
+        with self._lock:
+            for callback, handled in self._calls:
+                self.pending.append(callback)
+                handled.set()
+            self._calls = []
+            self.waiting.clear()
+            callbacks, self.pending = self.pending, []
+        for callback in callbacks:
+            callback()
+        return len(callbacks)
+
+
+@pytest.fixture
+def widget():
+    return FakeWidget()
@@ -0,0 +1,103 @@
+import asyncio
+import pytest
+from src.soundpad.async_client import AsyncSoundpadClient
+from src.soundpad.fake_server import FakeSoundpadServer
+from src.soundpad.socket_transport import SocketChannel
+
+
+class _UnframedChannel:
+    """Answers every request with R-200 and records how many were outstanding at once."""
+
+    framed = False
+
+    def __init__(self):
+        self.messages = asyncio.Queue()
+        self.outstanding = 0
+        self.max_outstanding = 0
+
+    def write(self, data):
+        self.outstanding += 1
+        self.max_outstanding = max(self.max_outstanding, self.outstanding)
+        asyncio.get_running_loop().call_later(0.001, self.messages.put_nowait, b"R-200")
+
+    async def read(self):
+        message = await self.messages.get()
+        self.outstanding -= 1
+        return message
+
+    def close(self):
+        self.messages.put_nowait(None)
+
+
+@pytest.fixture
+def server():
+    with FakeSoundpadServer(sound_count=50, seed=1) as server:
+        yield server
+
+
+def test_pipelined_requests_get_their_own_replies(server):
+    async def run():
+        client = AsyncSoundpadClient(lambda: SocketChannel.open(server.port), max_in_flight=8)
+        assert await client.connect()
+        results = await asyncio.gather(*[client.play_sound(i % 50 + 1) for i in range(100)],
+                                       client.get_sound_list())
+        await client.close()
+        return results
+
+    results = asyncio.run(run())
+    assert all(results[:-1])
+    assert len(results[-1]) == 50
+
+
+def test_unframed_channel_is_not_pipelined():
+    channel = _UnframedChannel()
+
+    async def run():
+        async def factory():
+            return channel
+        client = AsyncSoundpadClient(factory, max_in_flight=8)
+        assert await client.connect()
+        results = await asyncio.gather(*[client.play_sound(1) for _ in range(20)])
+        await client.close()
+        return results
+
+    assert all(asyncio.run(run()))
+    assert channel.max_outstanding == 1
+
+
+def test_dropped_replies_fail_fast_and_free_slots(server):
+    async def run():
+        client = AsyncSoundpadClient(lambda: SocketChannel.open(server.port), max_in_flight=2, timeout=1.0)
+        for _ in range(5):
+            assert await client.connect()
+            server.drop_rate = 1.0
+            with pytest.raises(ConnectionError):
+                await client.is_alive()
+            assert not client.connected
+            server.drop_rate = 0.0
+        assert await client.connect()
+        results = await asyncio.gather(*[client.play_sound(1) for _ in range(10)])
+        await client.close()
+        return results
+
+    assert all(asyncio.run(run()))
+
+
+def test_timeout_closes_connection_and_frees_slots(server):
+    async def run():
+        client = AsyncSoundpadClient(lambda: SocketChannel.open(server.port), max_in_flight=2, timeout=1.0)
+        assert await client.connect()
+        server.latency_ms = 300 # Longer than the timeouts below, replies come too late
+        outcomes = await asyncio.gather(*[client.request("DoPlaySound(1)", timeout=0.05) for _ in range(3)],
+                                        return_exceptions=True)
+        assert not client.connected
+        assert all(isinstance(o, (asyncio.TimeoutError, ConnectionError)) for o in outcomes)
+
+        server.latency_ms = 0
+        # More timeouts than slots would have left nothing to send with if they leaked
+        assert await client.connect()
+        results = await asyncio.gather(*[client.play_sound(1) for _ in range(10)])
+        await client.close()
+        return results
+
+    assert all(asyncio.run(run()))
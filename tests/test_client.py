@@ -0,0 +1,72 @@
+import pytest
+from soundpad_control import SoundpadRemoteControl
+from src.soundpad.client import SoundpadClient, ERROR_MORE_DATA
+from src.soundpad.fake_server import FakeSoundpadServer
+
+
+class _MessagePipe:
+    """Message-mode pipe as the Windows CRT sees it: a read gets one whole reply, or
+    fails with ERROR_MORE_DATA if the buffer is smaller (the rest stays in the pipe)."""
+
+    def __init__(self, server):
+        self.server = server
+        self.replies = []
+
+    def write(self, data):
+        self.replies.append(self.server.handle_request(data.decode()).encode())
+
+    def seek(self, pos):
+        pass
+
+    def read(self, size):
+        if not self.replies:
+            return b""
+        if len(self.replies[0]) > size:
+            error = OSError(22, "More data is available")
+            error.winerror = ERROR_MORE_DATA
+            raise error
+        return self.replies.pop(0)
+
+    def close(self):
+        pass
+
+
+class _PipeRemote(SoundpadRemoteControl):
+    def __init__(self, server):
+        super().__init__()
+        self.server = server
+        self.opened = 0
+
+    def _init_connection(self):
+        if self.pipe is None:
+            self.opened += 1
+            self.pipe = _MessagePipe(self.server)
+
+
+@pytest.fixture
+def server():
+    with FakeSoundpadServer(sound_count=5000) as server:
+        yield server
+
+
+def test_sound_list_over_message_pipe(server):
+    client = SoundpadClient(remote=_PipeRemote(server))
+    assert client.connect()
+    sounds = client.get_sound_list()
+    assert len(sounds) == 5000
+    assert sounds[-1] == {'index': 5000, 'title': 'Sound 5000'}
+    # Nothing left over that the next command would take as its answer
+    assert client.remote.pipe.replies == []
+    assert client.remote.is_alive()
+
+
+def test_sound_list_larger_than_buffer_resets_pipe(server):
+    remote = _PipeRemote(server)
+    client = SoundpadClient(remote=remote)
+    assert client.connect()
+    remote.chuck_size = 1024
+    assert client.get_sound_list() == []
+    # The partial message was dropped with the connection, the next command gets a fresh pipe
+    assert remote.pipe is None
+    assert remote.is_alive()
+    assert remote.opened == 2
@@ -0,0 +1,68 @@
+from src.gui.keyboard_model import KeyboardModel, mappings_by_octave, MAX_OCTAVE
+
+
+def _model(start_octave=4, visible_octaves=2):
+    model = KeyboardModel(start_octave, visible_octaves)
+    changes = []
+    model.add_listener(changes.append)
+    return model, changes
+
+
+def test_mappings_by_octave():
+    octaves = mappings_by_octave({
+        "60": {"sound_title": "Boom", "custom_color": "#ff0000"},
+        "61": {"sound_title": "Clap", "custom_label": "C!"},
+        "13": {},
+        "CC_7": {"sound_title": "Volume"},
+    })
+    assert octaves == {5: {60: ("Boom", "#ff0000"), 61: ("C!", None)}, 1: {13: ("", None)}}
+
+
+def test_set_mappings_reports_visible_changes_only():
+    model, changes = _model(start_octave=4) # Notes 48..71
+    model.set_mappings(mappings_by_octave({"60": {"sound_title": "Boom"}, "100": {"sound_title": "Far"}}))
+    assert changes == [{'labels': {60: "Boom"}}]
+    assert model.label(100) == "Far" # Kept, just not reported
+
+    changes.clear()
+    model.set_mappings(mappings_by_octave({"60": {"sound_title": "Boom"}, "100": {"sound_title": "Moved"}}))
+    assert changes == []
+
+    model.set_mappings(mappings_by_octave({"61": {"sound_title": "Boom", "custom_color": "red"}}))
+    assert changes == [{'labels': {60: "", 61: "Boom"}, 'colors': {61: "red"}}]
+
+
+def test_update_reports_what_differs():
+    model, changes = _model()
+    model.update(labels={60: "A"}, colors={60: None}, pressed={60: False})
+    assert changes == [{'labels': {60: "A"}}]
+    model.update(labels={60: "A"}, pressed={60: True, 61: True})
+    assert changes[-1] == {'pressed': {60: True, 61: True}}
+    model.update(colors={60: "blue"}, pressed={61: True})
+    assert changes[-1] == {'colors': {60: "blue"}}
+    assert model.label(60) == "A" and model.color(60) == "blue"
+    assert model.is_pressed(60) and model.is_pressed(61)
+    assert len(changes) == 3
+
+
+def test_start_octave_is_clamped_and_reported_once():
+    model, changes = _model(start_octave=4)
+    model.set_start_octave(4)
+    model.set_start_octave(MAX_OCTAVE + 5)
+    model.set_start_octave(MAX_OCTAVE)
+    assert changes == [{'start_octave': MAX_OCTAVE}]
+    assert list(model.visible_notes())[0] == MAX_OCTAVE * 12
+
+
+def test_failing_listener_does_not_stop_the_others():
+    model, changes = _model()
+
+    def broken(change):
+        raise RuntimeError("boom")
+
+    model.add_listener(broken)
+    model.add_listener(changes.append)
+    model.update(labels={60: "A"})
+    assert changes == [{'labels': {60: "A"}}, {'labels': {60: "A"}}]
+    model.remove_listener(broken)
+    model.remove_listener(broken)
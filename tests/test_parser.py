@@ -0,0 +1,142 @@
+import os
+import xml.etree.ElementTree as ET
+import pytest
+from src.soundpad.parser import SoundpadParser, category_sounds
+
+
+def _tree_walk(file_path):
+    """The tree-walk parse_file the streaming parser replaced (before user-011), as reference."""
+    root = ET.parse(file_path).getroot()
+    sound_elements = root.findall("Sound")
+    if not sound_elements:
+        sl = root.find("Soundlist")
+        if sl:
+            sound_elements = sl.findall("Sound")
+
+    all_sounds = {}
+    for idx, sound_elem in enumerate(sound_elements):
+        sound_data = dict(sound_elem.attrib)
+        if not sound_data.get('title'):
+            url = sound_data.get('url', '')
+            sound_data['title'] = os.path.basename(url) if url else "Unknown Sound"
+        sound_data['api_index'] = idx + 1
+        all_sounds[str(idx)] = sound_data
+        if 'index' in sound_data:
+            all_sounds[sound_data['index']] = sound_data
+        if 'id' in sound_data:
+            all_sounds[sound_data['id']] = sound_data
+
+    categories_tag = root.find("Categories")
+    if categories_tag is None and root.tag != "Soundlist":
+        sl = root.find("Soundlist")
+        if sl:
+            categories_tag = sl.find("Categories")
+
+    def _parse_category(cat_elem, path=""):
+        cat_name = cat_elem.get('name', 'Unnamed Category')
+        current_path = f"{path} / {cat_name}" if path else cat_name
+        cat_sounds = []
+        for sound_ref in cat_elem.findall("Sound"):
+            ref_id = sound_ref.get('id')
+            sound_obj = all_sounds.get(ref_id)
+            if sound_obj is None:
+                try:
+                    sound_obj = all_sounds.get(str(int(ref_id)))
+                except (TypeError, ValueError):
+                    pass
+            if sound_obj:
+                cat_sounds.append(sound_obj)
+        subcategories = [_parse_category(sub, current_path) for sub in cat_elem.findall("Category")
+                         if sub.get('name', 'Unnamed Category') != 'Unnamed Category']
+        return {'name': cat_name, 'path': current_path, 'sounds': cat_sounds, 'subcategories': subcategories}
+
+    categories = []
+    if categories_tag is not None:
+        categories = [_parse_category(cat) for cat in categories_tag.findall("Category")
+                      if cat.get('name', 'Unnamed Category') != 'Unnamed Category']
+    if not categories:
+        # 'All Sounds' lists whatever each position key resolves to, aliases included
+        sounds = [all_sounds[str(i)] for i in range(len(sound_elements)) if str(i) in all_sounds]
+        categories.append({'name': 'All Sounds', 'path': 'All Sounds', 'sounds': sounds, 'subcategories': []})
+    return categories
+
+
+def _shape_reference(categories):
+    return [(cat['name'], cat['path'],
+             [(s['title'], s.get('url') or None, s['api_index'], s.get('index')) for s in cat['sounds']],
+             _shape_reference(cat['subcategories'])) for cat in categories]
+
+
+def _shape(categories):
+    return [(cat['name'], cat['path'],
+             [(s.title, s.url, s.api_index, s.index) for s in category_sounds(cat)],
+             _shape(cat['subcategories'])) for cat in categories]
+
+
+SOUNDLIST_ROOT = """<?xml version="1.0" encoding="UTF-8"?>
+<Soundlist>
+  <Sound url="C:\\s\\boom.mp3" title="Boom"/>
+  <Sound url="C:\\s\\clap.wav" title=""/>
+  <Sound title="Horn" index="7"/>
+  <Sound url="C:\\s\\kick.mp3" title="Kick" id="k1"/>
+  <Sound/>
+  <Categories>
+    <Category name="Unnamed Category"><Sound id="0"/></Category>
+    <Category name="Memes">
+      <Sound id="0"/><Sound id="3"/><Sound id="7"/><Sound id="k1"/><Sound id="missing"/>
+      <Category name="Old"><Sound id="002"/><Sound id="1"/></Category>
+      <Category name="Unnamed Category"><Sound id="4"/></Category>
+    </Category>
+    <Category><Sound id="1"/></Category>
+    <Category name="Empty"/>
+  </Categories>
+</Soundlist>
+"""
+
+WRAPPED = """<Soundpad>
+  <Soundlist>
+    <Sound title="One"/><Sound title="Two"/><Sound title="Three"/>
+    <Categories>
+      <Category name="Fav"><Sound id="2"/><Sound id="0"/></Category>
+    </Categories>
+  </Soundlist>
+</Soundpad>
+"""
+
+# No categories: 'All Sounds'. index="3" on the sound at position 5 and id="1" at
+# position 0 shadow the position keys, exactly as the tree walk resolved them
+EXPORT_WITH_ALIASES = """<Soundlist>
+  <Sound title="A" id="1"/><Sound title="B"/><Sound title="C"/><Sound title="D"/>
+  <Sound title="E" index="2"/><Sound title="F" index="3"/>
+</Soundlist>
+"""
+
+EXPORT_ONE_BASED = """<Soundlist>
+  <Sound title="A" index="1"/><Sound title="B" index="2"/><Sound title="C" index="3"/>
+</Soundlist>
+"""
+
+
+@pytest.mark.parametrize("xml", [SOUNDLIST_ROOT, WRAPPED, EXPORT_WITH_ALIASES, EXPORT_ONE_BASED],
+                         ids=["soundlist", "wrapped", "export-aliases", "export-one-based"])
+def test_streaming_matches_tree_walk(tmp_path, xml):
+    path = tmp_path / "soundlist.spl"
+    path.write_text(xml, encoding="utf-8")
+    assert _shape(SoundpadParser().parse_file(str(path))) == _shape_reference(_tree_walk(str(path)))
+
+
+def test_categories_are_reported_as_they_are_read(tmp_path):
+    path = tmp_path / "soundlist.spl"
+    path.write_text(SOUNDLIST_ROOT, encoding="utf-8")
+    seen = []
+    categories = SoundpadParser().parse_file(str(path), on_category=lambda cat: seen.append(cat['path']))
+    # Unnamed categories (and the ones below them) are skipped
+    assert seen == [cat['path'] for cat in categories] == ["Memes", "Empty"]
+
+
+def test_missing_or_broken_file(tmp_path):
+    parser = SoundpadParser()
+    assert parser.parse_file(str(tmp_path / "nope.spl")) == []
+    path = tmp_path / "broken.spl"
+    path.write_text("<Soundlist><Sound", encoding="utf-8")
+    assert parser.parse_file(str(path)) == []
@@ -0,0 +1,90 @@
+import threading
+import time
+from concurrent.futures import Future
+from src.soundpad.scheduler import CommandScheduler
+
+
+def _put(scheduler, command, *args):
+    return scheduler.put(command, args, {}, Future())
+
+
+def _drain(scheduler):
+    scheduler.close()
+    entries = []
+    while True:
+        entry = scheduler.get()
+        if entry is None:
+            return entries
+        entries.append((entry.command,) + entry.args)
+
+
+def test_priority_order_and_fifo_within_a_priority():
+    scheduler = CommandScheduler()
+    _put(scheduler, "get_sound_list")
+    _put(scheduler, "select_sound", 4)
+    _put(scheduler, "stop_playback")
+    _put(scheduler, "play_sound", 1)
+    _put(scheduler, "play_sound", 2)
+    assert _drain(scheduler) == [("stop_playback",), ("play_sound", 1), ("play_sound", 2),
+                                 ("select_sound", 4), ("get_sound_list",)]
+
+
+def test_same_args_share_one_future():
+    scheduler = CommandScheduler()
+    first = _put(scheduler, "play_sound", 1)
+    assert _put(scheduler, "play_sound", 1) is first
+    assert _put(scheduler, "play_sound", 2) is not first
+    assert scheduler.qsize() == 2
+    assert scheduler.coalesced_count == 1
+
+
+def test_latest_select_wins():
+    scheduler = CommandScheduler()
+    old = _put(scheduler, "select_sound", 1)
+    _put(scheduler, "select_sound", 2)
+    assert old.cancelled()
+    assert _drain(scheduler) == [("select_sound", 2)]
+
+
+def test_stop_cancels_pending_playback():
+    scheduler = CommandScheduler()
+    play = _put(scheduler, "play_sound", 1)
+    toggle = _put(scheduler, "toggle_pause")
+    select = _put(scheduler, "select_sound", 3)
+    stop = _put(scheduler, "stop_playback")
+    assert _put(scheduler, "stop_playback") is stop
+    later = _put(scheduler, "play_sound", 2) # Queued after the stop, still runs
+    assert play.cancelled() and toggle.cancelled()
+    assert not select.cancelled() and not later.cancelled()
+    assert _drain(scheduler) == [("stop_playback",), ("play_sound", 2), ("select_sound", 3)]
+    assert scheduler.qsize() == 0
+
+
+def test_stale_commands_are_dropped_others_never():
+    scheduler = CommandScheduler(policies={"play_sound": (1, 10, None)})
+    stale = _put(scheduler, "play_sound", 1)
+    patient = _put(scheduler, "get_sound_list")
+    time.sleep(0.03)
+    fresh = _put(scheduler, "play_sound", 2)
+    assert _drain(scheduler) == [("play_sound", 2), ("get_sound_list",)]
+    assert stale.cancelled()
+    assert not fresh.cancelled() and not patient.cancelled()
+    assert scheduler.stale_count == 1
+
+
+def test_get_blocks_until_put_or_close():
+    scheduler = CommandScheduler()
+    got = []
+    thread = threading.Thread(target=lambda: got.append(scheduler.get()))
+    thread.start()
+    time.sleep(0.02)
+    assert got == []
+    _put(scheduler, "play_sound", 5)
+    thread.join(1.0)
+    assert got[0].args == (5,)
+
+    thread = threading.Thread(target=lambda: got.append(scheduler.get()))
+    thread.start()
+    scheduler.close()
+    thread.join(1.0)
+    assert got[1] is None
@@ -0,0 +1,91 @@
+import random
+import threading
+from src.soundpad.search import SearchIndex, SearchWorker, BROAD_WORD_MATCHES, file_stem
+
+
+def _index(titles, urls=None):
+    items = list(zip(titles, urls or [None] * len(titles)))
+    return SearchIndex(items, lambda item: item[0], (lambda item: item[1]) if urls else None)
+
+
+def _titles(results):
+    return [item[0] for item in results]
+
+
+def test_exact_then_prefix_then_infix_shorter_first():
+    index = _index(["Kaboom", "Boomerang", "Boom", "Boom box", "Big boom"])
+    assert _titles(index.search("boom")) == ["Boom", "Boom box", "Big boom", "Boomerang", "Kaboom"]
+
+
+def test_ties_keep_original_order():
+    index = _index(["Clap 2", "Clap 1", "Clap 3"])
+    assert _titles(index.search("clap")) == ["Clap 2", "Clap 1", "Clap 3"]
+
+
+def test_file_name_words_count_half():
+    index = _index(["Horn", "Airhorn", "Siren"], ["a.mp3", "b.mp3", "C:\\s\\horn.mp3"])
+    # Exact in the title (6) > exact in the file name (6 // 2) > infix in the title (2)
+    assert _titles(index.search("horn")) == ["Horn", "Siren", "Airhorn"]
+    assert file_stem("C:\\s\\air horn.final.mp3") == "air horn.final"
+
+
+def test_every_word_has_to_match():
+    index = _index(["Air horn loud", "Air raid", "Horn"])
+    assert _titles(index.search("horn air")) == ["Air horn loud"]
+    assert _titles(index.search("air horn")) == ["Air horn loud"] # Phrase bonus, same set
+    assert index.search("air xyz") == []
+
+
+def test_short_infixes_match_like_the_substring_filter():
+    rng = random.Random(3)
+    syllables = ["bo", "om", "ra", "ki", "ck", "la", "ugh", "oo", "x1"]
+    titles = [" ".join("".join(rng.choice(syllables) for _ in range(rng.randint(1, 3)))
+                       for _ in range(rng.randint(1, 3))) for _ in range(2000)]
+    index = _index(titles)
+    for query in ["o", "oo", "om", "x", "1", "ck", "ugh", "mra", "kio", "z"]:
+        expected = sorted(t for t in titles if query in t.lower())
+        assert sorted(_titles(index.search(query))) == expected, query
+
+
+def test_short_word_after_a_selective_one():
+    index = _index(["Boom box", "Kaboom", "Room", "Boom"])
+    assert _titles(index.search("box oo")) == ["Boom box"]
+    assert _titles(index.search("oo k")) == ["Kaboom"]
+
+
+def test_limit_and_broad_words():
+    titles = [f"s{i}" for i in range(BROAD_WORD_MATCHES * 2)] + [f"s {i}" for i in range(20)]
+    index = _index(titles)
+    for limit in (10, 20, 30):
+        results = index.search("s", limit=limit)
+        assert len(results) == limit
+        # Exact word matches first
+        assert _titles(results)[:min(limit, 20)] == [f"s {i}" for i in range(min(limit, 20))]
+    assert len(index.search("s", limit=len(titles) + 5)) == len(titles)
+
+
+def test_cancelled_search_returns_nothing():
+    index = _index(["Boom", "Boom box"])
+    assert index.search("boom box", cancelled=lambda: True) == []
+    assert index.search("", limit=5) == []
+
+
+def test_search_worker_runs_the_newest_query_only():
+    gate = threading.Event()
+    started = threading.Event()
+    done = threading.Event()
+    results = []
+
+    def slow(cancelled):
+        started.set()
+        gate.wait(2.0)
+        return "slow" if not cancelled() else "stale"
+
+    worker = SearchWorker()
+    worker.submit(slow, results.append)
+    assert started.wait(2.0)
+    worker.submit(lambda cancelled: "skipped", results.append)
+    worker.submit(lambda cancelled: "newest", lambda r: (results.append(r), done.set()))
+    gate.set()
+    assert done.wait(2.0)
+    assert results == ["newest"]
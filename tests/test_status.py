@@ -0,0 +1,113 @@
+import threading
+import time
+from soundpad_control.remote_control import PlayStatus
+from src.soundpad.status import PlaybackStatusTracker
+from src.soundpad.worker import SoundpadCommandWorker
+
+
+class _FakePlayer:
+    """SoundpadClient stand-in with a play state that tests can change behind our back."""
+
+    def __init__(self):
+        self.connected = True
+        self.status = PlayStatus.STOPPED
+        self.log = []
+        self.polls = 0
+
+    def get_play_status(self):
+        self.polls += 1
+        return self.status
+
+    def play_sound(self, index):
+        self.log.append(("play_sound", index))
+        self.status = PlayStatus.PLAYING
+
+    def play_selected_sound(self):
+        self.log.append(("play_selected_sound",))
+        self.status = PlayStatus.PLAYING
+
+    def toggle_pause(self):
+        self.log.append(("toggle_pause",))
+        self.status = PlayStatus.PAUSED if self.status == PlayStatus.PLAYING else PlayStatus.PLAYING
+
+    def play_pause_selected(self):
+        if self.status == PlayStatus.STOPPED:
+            self.play_selected_sound()
+        else:
+            self.toggle_pause()
+
+
+def _start(player, **kwargs):
+    worker = SoundpadCommandWorker(player)
+    worker.start()
+    tracker = PlaybackStatusTracker(worker, **kwargs)
+    tracker.start()
+    return worker, tracker
+
+
+def _pressed(worker):
+    """Commands submitted from this thread (the key press), not by the poller."""
+    commands = []
+    thread = threading.get_ident()
+    worker.add_submit_listener(lambda command, args: threading.get_ident() == thread and commands.append(command))
+    return commands
+
+
+def test_press_after_a_poll_decides_locally():
+    player = _FakePlayer()
+    worker, tracker = _start(player, poll_playing=0.3)
+    try:
+        worker.submit("play_sound", 3).result(1.0)
+        # The state change wakes the poller, which confirms PLAYING right away
+        deadline = time.monotonic() + 1.0
+        while player.polls == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert player.polls == 1
+        time.sleep(0.1) # A while after the poll, well within the poll interval
+        pressed = _pressed(worker)
+        tracker.play_pause().result(1.0)
+        assert pressed == ["toggle_pause"] # No play_pause_selected status query
+        assert player.log[-1] == ("toggle_pause",)
+        assert tracker.status == PlayStatus.PAUSED
+    finally:
+        tracker.stop()
+        worker.stop()
+
+
+def test_stopped_cache_plays_without_asking():
+    player = _FakePlayer()
+    worker, tracker = _start(player, poll_idle=5.0)
+    try:
+        pressed = _pressed(worker)
+        tracker.play_pause().result(1.0)
+        assert pressed == ["play_selected_sound"]
+        assert player.log == [("play_selected_sound",)]
+        assert tracker.status == PlayStatus.PLAYING
+    finally:
+        tracker.stop()
+        worker.stop()
+
+
+def test_asks_soundpad_when_polls_stopped():
+    player = _FakePlayer()
+    worker, tracker = _start(player, poll_playing=0.05)
+    try:
+        worker.submit("play_sound", 3).result(1.0)
+        player.connected = False # Polls are skipped from here on
+        player.status = PlayStatus.STOPPED # Ended on its own, the cache still says PLAYING
+        time.sleep(0.2)
+        assert tracker.status == PlayStatus.PLAYING
+        player.connected = True
+        polls = player.polls
+        pressed = _pressed(worker)
+        tracker.play_pause().result(1.0)
+        assert pressed == ["play_pause_selected"]
+        assert player.log[-1] == ("play_selected_sound",)
+        # The tracker asks Soundpad what it did right away, not at the next poll
+        deadline = time.monotonic() + 1.0
+        while player.polls == polls and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert player.polls > polls
+    finally:
+        tracker.stop()
+        worker.stop()
@@ -0,0 +1,146 @@
+import threading
+import time
+from src.soundpad.supervisor import ConnectionSupervisor, STATE_CONNECTED, STATE_DISCONNECTED
+from src.soundpad.worker import SoundpadCommandWorker
+
+
+class _FakeClient:
+    """SoundpadClient stand-in whose liveness and command durations tests control."""
+
+    def __init__(self):
+        self.connected = True
+        self.alive = True
+        self.played = []
+        self.selected = []
+        self.list_seconds = 0.0
+        self.release = threading.Event()
+        self.release.set()
+
+    def pipe_open(self):
+        return self.alive
+
+    def is_alive(self):
+        self.connected = self.alive
+        return self.alive
+
+    def connect(self):
+        return self.is_alive()
+
+    def get_sound_list(self):
+        time.sleep(self.list_seconds)
+        return []
+
+    def play_sound(self, index):
+        self.release.wait()
+        self.played.append(index)
+
+    def select_sound(self, index):
+        self.selected.append(index)
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def _start(client, **kwargs):
+    worker = SoundpadCommandWorker(client)
+    worker.start()
+    options = dict(heartbeat_interval=0.02, heartbeat_timeout=0.05, backoff_initial=0.01, backoff_max=0.05)
+    options.update(kwargs)
+    supervisor = ConnectionSupervisor(worker, **options)
+    supervisor.start()
+    return worker, supervisor
+
+
+def test_busy_worker_is_not_a_disconnect():
+    client = _FakeClient()
+    client.list_seconds = 0.5 # Far longer than the heartbeat timeout
+    worker, supervisor = _start(client)
+    states = []
+    supervisor.add_listener(lambda new, old: states.append(new))
+    try:
+        worker.submit("get_sound_list")
+        plays = [worker.submit("play_sound", i) for i in range(20)]
+        for future in plays:
+            future.result(2.0)
+        time.sleep(0.3)
+        assert supervisor.state == STATE_CONNECTED
+        assert states == []
+        assert client.played == list(range(20))
+    finally:
+        supervisor.stop()
+        worker.stop()
+
+
+def test_stuck_command_is_a_disconnect():
+    client = _FakeClient()
+    client.release.clear()
+    worker, supervisor = _start(client, stall_timeout=0.1)
+    try:
+        worker.submit("play_sound", 1)
+        assert _wait_for(lambda: supervisor.state != STATE_CONNECTED)
+    finally:
+        client.release.set()
+        supervisor.stop()
+        worker.stop()
+
+
+def test_dead_soundpad_drops_and_holds_then_replays():
+    client = _FakeClient()
+    worker, supervisor = _start(client)
+    try:
+        client.alive = False
+        assert _wait_for(lambda: supervisor.state != STATE_CONNECTED)
+        play = worker.submit("play_sound", 1)
+        select = worker.submit("select_sound", 7)
+        assert play.cancelled()
+        assert not select.done()
+
+        client.alive = True
+        assert _wait_for(lambda: supervisor.state == STATE_CONNECTED)
+        select.result(1.0)
+        assert client.selected == [7]
+        assert client.played == []
+        assert supervisor.replayed_count == 1
+    finally:
+        supervisor.stop()
+        worker.stop()
+
+
+def test_held_commands_expire():
+    client = _FakeClient()
+    worker, supervisor = _start(client, replay_max_age=0.05, backoff_initial=0.2, backoff_max=0.2)
+    try:
+        client.alive = False
+        assert _wait_for(lambda: supervisor.state != STATE_CONNECTED)
+        select = worker.submit("select_sound", 7)
+        time.sleep(0.1)
+        client.alive = True
+        assert _wait_for(lambda: supervisor.state == STATE_CONNECTED)
+        assert select.cancelled()
+        assert client.selected == []
+    finally:
+        supervisor.stop()
+        worker.stop()
+
+
+def test_backoff_grows_and_is_capped():
+    client = _FakeClient()
+    worker, supervisor = _start(client, backoff_initial=0.01, backoff_max=0.04)
+    backoffs = []
+    supervisor.add_listener(lambda new, old: new == STATE_DISCONNECTED and backoffs.append(supervisor._backoff))
+    try:
+        client.alive = False
+        assert _wait_for(lambda: supervisor.reconnect_attempts >= 6)
+        assert supervisor.state != STATE_CONNECTED
+        retries = backoffs[1:] # The first one is the heartbeat failure
+        assert retries[0] < retries[2]
+        assert all(0.01 * 0.8 <= b <= 0.04 * 1.2 for b in retries)
+    finally:
+        supervisor.stop()
+        worker.stop()
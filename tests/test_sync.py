@@ -0,0 +1,70 @@
+import random
+from src.soundpad.sound_index import SoundIndex
+from src.soundpad.sync import SoundListSync
+
+
+def _sounds(titles):
+    return [{'index': i, 'title': title} for i, title in enumerate(titles, 1)]
+
+
+def _titles_table(index):
+    return {key: [(s['index'], s['title']) for s in sounds] for key, sounds in index.api_titles.items()}
+
+
+def _index_table(index):
+    return {i: s['title'] for i, s in index.api_sounds.items()}
+
+
+def test_unchanged_list_gives_empty_delta():
+    sync = SoundListSync()
+    first = sync.update(_sounds(["Boom", "Clap"]))
+    assert first.initial and len(first.added) == 2
+    assert sync.update(_sounds(["Boom", "Clap"])).is_empty()
+
+
+def test_delta_added_removed_moved():
+    sync = SoundListSync()
+    sync.update(_sounds(["Boom", "Clap", "Horn", "Horn"]))
+    delta = sync.update(_sounds(["Airhorn", "Boom", "Horn", "Snare"]))
+    assert [s['title'] for s in delta.added] == ["Airhorn", "Snare"]
+    assert sorted((s['title'], s['index']) for s in delta.removed) == [("Clap", 2), ("Horn", 4)]
+    assert [(old['title'], old['index'], new['index']) for old, new in delta.moved] == [("Boom", 1, 2)]
+    assert not delta.initial
+
+
+def test_empty_delta_keeps_tables():
+    index, sync = SoundIndex(), SoundListSync()
+    sounds = _sounds(["Boom", "Clap"])
+    index.set_api_sounds(sounds, sync.update(sounds))
+    search = index.api_search
+    index.set_api_sounds(_sounds(["Boom", "Clap"]), sync.update(_sounds(["Boom", "Clap"])))
+    assert index.api_search is search
+
+
+def test_incremental_update_matches_full_rebuild():
+    rng = random.Random(7)
+    words = ["boom", "clap", "horn", "snare", "kick", "laugh", "bell"]
+    titles = [f"{rng.choice(words)} {rng.randint(1, 30)}" for _ in range(300)]
+    patched, sync = SoundIndex(), SoundListSync()
+    sounds = _sounds(titles)
+    patched.set_api_sounds(sounds, sync.update(sounds))
+
+    for _ in range(30):
+        titles = list(titles)
+        for _ in range(rng.randint(1, 5)):
+            action = rng.random()
+            if action < 0.4 and titles:
+                del titles[rng.randrange(len(titles))]
+            elif action < 0.8:
+                titles.insert(rng.randrange(len(titles) + 1), f"{rng.choice(words)} {rng.randint(1, 30)}")
+            elif titles:
+                titles[rng.randrange(len(titles))] = f"{rng.choice(words)} new"
+        sounds = _sounds(titles)
+        patched.set_api_sounds(sounds, sync.update(sounds))
+
+        rebuilt = SoundIndex()
+        rebuilt.set_api_sounds(sounds)
+        assert _titles_table(patched) == _titles_table(rebuilt)
+        assert _index_table(patched) == _index_table(rebuilt)
+        for query in ("boom", "kick 1", "new", "la"):
+            assert patched.search_api(query) == rebuilt.search_api(query)
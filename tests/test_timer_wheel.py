@@ -0,0 +1,103 @@
+import threading
+import pytest
+from src.gui.timer_wheel import TimerWheel
+
+
+class _ManualWheel(TimerWheel):
+    """TimerWheel on a tick counter the test advances."""
+
+    tick = 0
+
+    def _now(self):
+        return self.tick
+
+
+@pytest.fixture
+def fired():
+    return []
+
+
+@pytest.fixture
+def wheel(widget, fired):
+    return _ManualWheel(widget, fired.extend, tick_ms=10, size=8)
+
+
+def _advance(widget, wheel, ticks):
+    """Moves time on one tick at a time, running the wheel's callback like Tk would."""
+    for _ in range(ticks):
+        wheel.tick += 1
+        widget.run_frame()
+
+
+def test_fires_at_the_deadline_in_one_batch(widget, wheel, fired):
+    wheel.schedule("a", 30)
+    wheel.schedule("b", 25)
+    _advance(widget, wheel, 2)
+    assert fired == []
+    _advance(widget, wheel, 1)
+    assert sorted(fired) == ["a", "b"]
+    assert widget.pending == [] # Idle, no timer left
+
+
+def test_retrigger_extends_but_never_shortens(widget, wheel, fired):
+    wheel.schedule("a", 20)
+    _advance(widget, wheel, 1)
+    wheel.schedule("a", 40) # Due at tick 5 now
+    wheel.schedule("a", 10) # Earlier, ignored
+    _advance(widget, wheel, 3)
+    assert fired == []
+    _advance(widget, wheel, 1)
+    assert fired == ["a"]
+
+
+def test_cancel(widget, wheel, fired):
+    wheel.schedule("a", 20)
+    wheel.cancel("a")
+    _advance(widget, wheel, 5)
+    assert fired == []
+    assert widget.pending == []
+
+
+def test_delays_longer_than_a_turn(widget, wheel, fired):
+    wheel.schedule("far", 10 * 8 * 2 + 30) # Two turns and 3 ticks
+    wheel.schedule("near", 30) # Same slot, first turn
+    _advance(widget, wheel, 3)
+    assert fired == ["near"]
+    _advance(widget, wheel, 8 * 2 - 1)
+    assert fired == ["near"]
+    _advance(widget, wheel, 1)
+    assert fired == ["near", "far"]
+
+
+def test_catch_up_after_tk_was_blocked_for_a_turn(widget, wheel, fired):
+    wheel.schedule("due", 30)
+    wheel.schedule("later", 10 * 20)
+    # Tk doesn't run the callback for more than a whole turn
+    wheel.tick += 12
+    widget.run_frame()
+    assert fired == ["due"]
+    _advance(widget, wheel, 7)
+    assert fired == ["due"]
+    _advance(widget, wheel, 1)
+    assert fired == ["due", "later"]
+
+
+def test_late_callback_within_a_turn(widget, wheel, fired):
+    wheel.schedule("a", 20)
+    wheel.schedule("b", 50)
+    wheel.tick += 4 # Callback runs 4 ticks late
+    widget.pending.pop()()
+    assert fired == ["a"]
+    _advance(widget, wheel, 1)
+    assert fired == ["a", "b"]
+
+
+def test_schedule_from_another_thread_while_tk_needs_the_lock(widget, wheel, fired):
+    midi = threading.Thread(target=wheel.schedule, args=("a", 20))
+    midi.start()
+    assert widget.waiting.wait(1.0) # The MIDI thread waits for Tk in after()
+    wheel.cancel("b") # Tk thread, takes the lock
+    _advance(widget, wheel, 2)
+    midi.join(1.0)
+    assert not midi.is_alive()
+    assert fired == ["a"]
@@ -0,0 +1,101 @@
+import threading
+import pytest
+from src.gui.keyboard_model import KeyboardModel
+from src.gui.ui_pump import UiPump
+
+
+@pytest.fixture
+def model():
+    return KeyboardModel()
+
+
+@pytest.fixture
+def changes(model):
+    changes = []
+    model.add_listener(changes.append)
+    return changes
+
+
+@pytest.fixture
+def pump(widget, model):
+    return UiPump(widget, model)
+
+
+def test_posts_are_merged_into_one_flush_per_frame(widget, pump, changes):
+    for note in range(60, 72):
+        pump.highlight(note, True)
+        pump.set_mappings({5: {note: ("x", None)}})
+    pump.set_mappings({5: {60: ("final", "red")}})
+    assert len(widget.pending) == 1
+    widget.run_frame()
+    assert changes == [
+        {'labels': {60: "final"}, 'colors': {60: "red"}},
+        {'pressed': dict.fromkeys(range(60, 72), True)},
+    ]
+    assert widget.run_frame() == 0 # Nothing left, no idle callbacks
+
+
+def test_note_events_are_merged_per_note(widget, pump):
+    calls = []
+    pump.on_note = lambda *args: calls.append(args)
+    pump.post_note(60, True)
+    pump.post_note(60, False)
+    pump.post_note(62, False)
+    widget.run_frame()
+    assert sorted(calls) == [(60, True, False), (62, False, False)]
+
+
+def test_tap_within_one_frame_is_still_shown(widget, model, pump, changes):
+    pump.highlight(60, True)
+    pump.highlight(60, False)
+    widget.run_frame()
+    assert model.is_pressed(60)
+    widget.run_frame()
+    assert not model.is_pressed(60)
+    assert [c['pressed'] for c in changes] == [{60: True}, {60: False}]
+
+
+def test_tap_then_press_again_stays_lit(widget, model, pump, changes):
+    pump.highlight(60, True)
+    pump.highlight(60, False)
+    widget.run_frame()
+    pump.highlight(60, True) # Pressed again before the deferred release
+    widget.run_frame()
+    widget.run_frame()
+    assert model.is_pressed(60)
+
+
+def test_hold_released_in_a_later_frame(widget, model, pump, changes):
+    pump.highlight(60, True)
+    widget.run_frame()
+    pump.highlight(60, False)
+    widget.run_frame()
+    assert not model.is_pressed(60)
+    assert widget.run_frame() == 0
+
+
+def test_updates_posted_by_on_note_apply_in_the_same_frame(widget, model, pump):
+    def on_note(note, pressed, is_down):
+        pump.highlight(note, True)
+        if not is_down:
+            pump.highlight(note, False)
+
+    pump.on_note = on_note
+    pump.post_note(60, True)
+    pump.post_note(60, False)
+    widget.run_frame()
+    assert model.is_pressed(60)
+    widget.run_frame()
+    assert not model.is_pressed(60)
+
+
+def test_post_from_another_thread_while_tk_needs_the_lock(widget, model, pump):
+    midi = threading.Thread(target=pump.post_note, args=(60, True))
+    midi.start()
+    assert widget.waiting.wait(1.0) # The MIDI thread waits for Tk in after()
+    # Meanwhile the Tk thread flushes or releases a key, which takes the lock
+    pump.highlight(61, True)
+    widget.run_frame()
+    midi.join(1.0)
+    assert not midi.is_alive()
+    assert model.is_pressed(61)